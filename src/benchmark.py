@@ -0,0 +1,311 @@
+"""
+Route benchmark suite: builds a seeded database for each scale tier, drives
+the real routes through Flask's test client from concurrent workers and
+writes p50/p95/p99 latency and throughput per route, and the peak RSS
+reached by the end of each tier, as JSON.
+
+    python benchmark.py --tiers small,medium --concurrency 4 --output results.json
+    python benchmark.py --baseline baseline.json             # exits 1 on a regression
+    python benchmark.py --baseline baseline.json --save-baseline
+
+Workers are threads in one process, so Python code is serialised by the GIL
+while SQLite work runs in parallel, much as under a threaded WSGI server.
+"""
+import os
+import io
+import sys
+import json
+import sqlite3
+import time
+import zlib
+import struct
+import random
+import shutil
+import platform
+import tempfile
+import threading
+from math import ceil
+from datetime import datetime, timezone
+import click
+try:
+    import resource
+except ImportError:
+    resource = None
+
+import main
+from database import init_db, generate_synthetic_data, SYNTHETIC_TITLE_WORDS
+
+# generate_synthetic_data arguments for each tier
+TIERS = {
+    'small': {'faculties': 5, 'coordinators_per_faculty': 2, 'lecturers_per_faculty': 10,
+              'students_per_faculty': 50, 'papers': 2000, 'bookmarks_per_user': 5},
+    'medium': {'faculties': 10, 'coordinators_per_faculty': 4, 'lecturers_per_faculty': 40,
+               'students_per_faculty': 400, 'papers': 50000, 'bookmarks_per_user': 20},
+    'large': {'faculties': 20, 'coordinators_per_faculty': 5, 'lecturers_per_faculty': 60,
+              'students_per_faculty': 1000, 'papers': 500000, 'bookmarks_per_user': 50},
+}
+ACCOUNTS = {'admin': ('ADM-F01-01', 'admin123'), 'coordinator': ('COO-F01-01', 'coord123'),
+            'academic': ('LEC-F01-01', 'lec123')}
+PAPER_TYPES = ['Journal', 'Conference', 'Book', 'Thesis']
+PERCENTILES = [50, 95, 99]
+
+def tiny_png():
+    """A valid 1x1 PNG, so cover uploads work with or without Pillow."""
+    def chunk(kind, data):
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+    return (b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', struct.pack('>IIBBBBB', 1, 1, 8, 2, 0, 0, 0))
+            + chunk(b'IDAT', zlib.compress(b'\x00\xff\xff\xff')) + chunk(b'IEND', b''))
+
+COVER_PNG = tiny_png()
+
+def seed_tier(directory, seed, **sizes):
+    """Creates trackingsystem.db in `directory` filled by the synthetic data generator. Returns its path."""
+    cwd = os.getcwd()
+    os.makedirs(directory, exist_ok=True)
+    os.chdir(directory)
+    try:
+        init_db()
+        generate_synthetic_data(seed=seed, **sizes)
+    finally:
+        os.chdir(cwd)
+    return os.path.join(directory, 'trackingsystem.db')
+
+def wait_for_typeahead():
+    """Blocks until the background typeahead build that logins start has finished."""
+    while main.typeahead['building']:
+        time.sleep(0.05)
+
+def use_database(path, work_dir):
+    """Points the app at `path`, dropping pooled connections and every in-process cache."""
+    # A build still reading the previous tier would install its index after the reset
+    wait_for_typeahead()
+    while not main.db_pool.empty():
+        main.db_pool.get_nowait().close()
+    main.DB_NAME = path
+    main.count_cache.clear()
+    main.profile_cache.clear()
+    main.search_cache.clear()
+    main.bump_search_generation()
+    main.data_stamp['rows'] = None
+    with main.typeahead_lock:
+        main.typeahead.update(keys=None, entries=None, built=0.0, building=False, pending=None)
+    main.app.config['UPLOAD_FOLDER'] = os.path.join(work_dir, 'covers')
+    main.app.config['REPORT_CACHE_FOLDER'] = os.path.join(work_dir, 'report_cache')
+    main.app.config['SLOW_QUERY_LOG'] = os.path.join(work_dir, 'slow_queries.log')
+
+def logged_in_client(role):
+    client = main.app.test_client()
+    user_id, password = ACCOUNTS[role]
+    response = client.post('/login', data={'user_id': user_id, 'password': password})
+    if response.status_code != 302 or response.headers['Location'].endswith('/login'):
+        raise click.ClickException(f"Could not log in as {user_id}.")
+    return client
+
+def build_scenarios(db_path):
+    """
+    Returns (name, role, request) triples. Each request takes a logged-in
+    client and a Random and returns the response; None as the role means
+    the request brings its own client.
+    """
+    conn = sqlite3.connect(db_path)
+    paper_ids = [row[0] for row in conn.execute("SELECT PaperID FROM Paper WHERE Status = 'Approved' LIMIT 5000")]
+    accounts = []
+    for role, (_, pk) in main.USER_ROLES.items():
+        accounts.extend(conn.execute(f"SELECT {pk}, {pk.replace('ID', 'Password')} FROM {role}").fetchall())
+    lecturer_name = conn.execute("SELECT LecturerName FROM Lecturer WHERE LecturerID = ?",
+                                 (ACCOUNTS['academic'][0],)).fetchone()[0]
+    conn.close()
+
+    def search(prefix):
+        return lambda client, rng: client.get(f'/{prefix}/search_results', query_string={
+            'query': ' '.join(rng.sample(SYNTHETIC_TITLE_WORDS, rng.randint(1, 2))), 'page': rng.randint(1, 3)})
+
+    def status(prefix):
+        return lambda client, rng: client.get(f'/{prefix}/status', query_string={'page': rng.randint(1, 5)})
+
+    def get(url):
+        return lambda client, rng: client.get(url)
+
+    def login(client, rng):
+        user_id, password = rng.choice(accounts)
+        return main.app.test_client().post('/login', data={'user_id': user_id, 'password': password})
+
+    def submit(client, rng):
+        return client.post('/academic/requests', content_type='multipart/form-data', data={
+            'title': ' '.join(rng.sample(SYNTHETIC_TITLE_WORDS, 5)).title(), 'authors': lecturer_name,
+            'date_published': f"{rng.randint(2010, 2025)}-06-01", 'url': 'https://example.org/new',
+            'paper_type': rng.choice(PAPER_TYPES), 'doi': f"10.5555/new.{rng.getrandbits(32)}",
+            'cover_page': (io.BytesIO(COVER_PNG), 'cover.png')})
+
+    def bookmark(client, rng):
+        return client.post('/bookmark/toggle', data={'paper_id': rng.choice(paper_ids)},
+                           headers={'Referer': '/academic/home'})
+
+    return [
+        ('login', None, login),
+        ('admin_search_results', 'admin', search('admin')),
+        ('coordinator_search_results', 'coordinator', search('coordinator')),
+        ('lecturer_student_search_results', 'academic', search('academic')),
+        ('admin_status', 'admin', status('admin')),
+        ('coordinator_status', 'coordinator', status('coordinator')),
+        ('lecturer_student_status', 'academic', status('academic')),
+        ('admin_dashboard', 'admin', get('/admin/dashboard')),
+        ('coordinator_dashboard', 'coordinator', get('/coordinator/dashboard')),
+        ('lecturer_student_dashboard', 'academic', get('/academic/dashboard')),
+        ('get_report_data', 'admin', get('/admin/api/report-data')),
+        ('get_coordinator_report_data', 'coordinator', get('/coordinator/api/report-data?mode=faculty')),
+        ('get_academic_report_data', 'academic', get('/academic/api/report-data')),
+        ('process_publication_request', 'academic', submit),
+        ('toggle_bookmark', 'academic', bookmark),
+    ]
+
+def percentile(ordered, p):
+    """Nearest-rank percentile of an already sorted list."""
+    return ordered[max(0, ceil(p / 100 * len(ordered)) - 1)]
+
+def peak_rss_mb():
+    """The process's RSS high-water mark so far; it never goes down, so it is only read per tier."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+def run_scenario(request, role, requests, concurrency, seed):
+    """Sends `requests` requests split across `concurrency` threads, each with its own session."""
+    clients = [logged_in_client(role) if role else None for _ in range(concurrency)]
+    wait_for_typeahead()  # keeps the index build out of the measured requests
+    latencies = [[] for _ in range(concurrency)]
+    errors = [0] * concurrency
+    start = threading.Barrier(concurrency + 1)
+
+    def worker(index):
+        rng = random.Random(seed * 1000 + index)
+        start.wait()
+        for _ in range(index, requests, concurrency):
+            started = time.perf_counter()
+            response = request(clients[index], rng)
+            response.get_data()
+            response.close()  # ends the request's metrics as a WSGI server would
+            latencies[index].append(time.perf_counter() - started)
+            # Successful form posts redirect; a 200 re-renders the form with an error
+            if response.status_code >= 400 or (response.request.method == 'POST' and response.status_code != 302):
+                errors[index] += 1
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    start.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    ordered = sorted(latency for worker_latencies in latencies for latency in worker_latencies)
+    result = {f"p{p}_ms": round(percentile(ordered, p) * 1000, 3) for p in PERCENTILES}
+    result.update({'requests': len(ordered), 'errors': sum(errors),
+                   'throughput_rps': round(len(ordered) / elapsed, 1)})
+    return result
+
+def run_tier(tier, work_dir, requests, concurrency, seed):
+    tier_dir = os.path.join(work_dir, tier)
+    shutil.rmtree(tier_dir, ignore_errors=True)
+    started = time.perf_counter()
+    db_path = seed_tier(tier_dir, seed, **TIERS[tier])
+    click.echo(f"[{tier}] seeded {TIERS[tier]['papers']:,} papers in {time.perf_counter() - started:.1f}s")
+    use_database(db_path, tier_dir)
+
+    results = {}
+    for name, role, request in build_scenarios(db_path):
+        run_scenario(request, role, max(concurrency, requests // 10), concurrency, seed)  # warm caches and pool
+        results[name] = result = run_scenario(request, role, requests, concurrency, seed)
+        click.echo(f"[{tier}] {name:32} p50 {result['p50_ms']:8.2f}ms  p95 {result['p95_ms']:8.2f}ms  "
+                   f"p99 {result['p99_ms']:8.2f}ms  {result['throughput_rps']:8.1f} req/s"
+                   + (f"  {result['errors']} errors" if result['errors'] else ''))
+    return results
+
+def compare(results, baseline, threshold):
+    """
+    Lists (tier, route, metric, baseline, current) for every p95 that grew
+    or throughput that fell by more than `threshold` against the baseline.
+    Routes or tiers missing from either run are skipped.
+    """
+    regressions = []
+    for tier, routes in results['tiers'].items():
+        for route, current in routes.items():
+            before = baseline.get('tiers', {}).get(tier, {}).get(route)
+            if not before:
+                continue
+            if current['p95_ms'] > before['p95_ms'] * (1 + threshold):
+                regressions.append((tier, route, 'p95_ms', before['p95_ms'], current['p95_ms']))
+            if current['throughput_rps'] < before['throughput_rps'] * (1 - threshold):
+                regressions.append((tier, route, 'throughput_rps', before['throughput_rps'], current['throughput_rps']))
+            if current['errors'] > before['errors']:
+                regressions.append((tier, route, 'errors', before['errors'], current['errors']))
+    return regressions
+
+@click.command()
+@click.option('--tiers', default='small', show_default=True, help="Comma-separated scale tiers: " + ', '.join(TIERS))
+@click.option('--requests', default=200, show_default=True, help="Measured requests per route and tier.")
+@click.option('--concurrency', default=4, show_default=True, help="Concurrent client threads.")
+@click.option('--seed', default=0, show_default=True, help="Seed for the generated data and request mix.")
+@click.option('--output', '-o', default='benchmark_results.json', show_default=True, help="Where to write the results.")
+@click.option('--baseline', default=None, help="Results file to compare against.")
+@click.option('--threshold', default=0.25, show_default=True, help="Allowed relative change before flagging a regression.")
+@click.option('--save-baseline', is_flag=True, help="Also write these results to --baseline.")
+@click.option('--work-dir', default=None, help="Where tier databases are built (default: a temporary directory).")
+def benchmark(tiers, requests, concurrency, seed, output, baseline, threshold, save_baseline, work_dir):
+    """Benchmarks the main routes at each scale tier and checks them against a baseline."""
+    tiers = [tier.strip() for tier in tiers.split(',') if tier.strip()]
+    unknown = [tier for tier in tiers if tier not in TIERS]
+    if unknown:
+        raise click.BadParameter(f"Unknown tier(s): {', '.join(unknown)}", param_hint='--tiers')
+    if save_baseline and not baseline:
+        raise click.BadParameter("--save-baseline needs --baseline.", param_hint='--save-baseline')
+
+    main.app.config['TESTING'] = True
+    keep_work_dir = work_dir is not None
+    work_dir = os.path.abspath(work_dir) if keep_work_dir else tempfile.mkdtemp(prefix='tracking-bench-')
+    try:
+        results = {
+            'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'settings': {'requests': requests, 'concurrency': concurrency, 'seed': seed},
+            'environment': {'python': platform.python_version(), 'sqlite': sqlite3.sqlite_version,
+                            'platform': platform.platform()},
+            'tiers': {},
+            # Cumulative: each tier's figure also covers the tiers run before it
+            'peak_rss_mb': {},
+        }
+        for tier in tiers:
+            results['tiers'][tier] = run_tier(tier, work_dir, requests, concurrency, seed)
+            results['peak_rss_mb'][tier] = peak_rss_mb()
+            if results['peak_rss_mb'][tier] is not None:
+                click.echo(f"[{tier}] peak RSS so far {results['peak_rss_mb'][tier]:.1f} MB")
+    finally:
+        while not main.db_pool.empty():
+            main.db_pool.get_nowait().close()
+        if not keep_work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    click.echo(f"Results written to {output}")
+
+    if baseline and save_baseline:
+        with open(baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+        click.echo(f"Baseline written to {baseline}")
+    elif baseline:
+        with open(baseline) as f:
+            stored = json.load(f)
+        if stored.get('settings') != results['settings']:
+            click.echo(f"Warning: baseline was run with {stored.get('settings')}, this run with {results['settings']}")
+        regressions = compare(results, stored, threshold)
+        for tier, route, metric, before, current in regressions:
+            click.echo(f"REGRESSION [{tier}] {route} {metric}: {before} -> {current}")
+        if regressions:
+            sys.exit(1)
+        click.echo(f"No regressions beyond {threshold:.0%} against {baseline}")
+
+if __name__ == '__main__':
+    benchmark()
@@ -1,9 +1,55 @@
 import sqlite3
+import random
+from array import array
+from collections import Counter
+from datetime import datetime, timezone
+
+# Each user table with its primary key; the table name doubles as the user's role
+USER_TABLES = [
+    ('Admin', 'AdminID'),
+    ('ProgrammeCoordinator', 'CoordinatorID'),
+    ('Lecturer', 'LecturerID'),
+    ('Student', 'StudentID')
+]
+
+# Ordered schema changes on top of the tables init_db creates. PRAGMA user_version
+# records the last one applied; append new entries and never edit shipped ones.
+MIGRATIONS = [
+    (1, "Index the user links, faculties and lookups the listings, dashboards and writers filter on", [
+        # Paper.Status gets its index as the leading column of idx_paper_status_published (version 2)
+        "CREATE INDEX IF NOT EXISTS idx_paper_lecturer ON Paper (LecturerID)",
+        "CREATE INDEX IF NOT EXISTS idx_paper_student ON Paper (StudentID)",
+        "CREATE INDEX IF NOT EXISTS idx_paper_coordinator ON Paper (CoordinatorID)",
+        "CREATE INDEX IF NOT EXISTS idx_paper_doi ON Paper (lower(DOI))",
+        "CREATE INDEX IF NOT EXISTS idx_bookmarks_paper ON Bookmarks (PaperID)",
+        "CREATE INDEX IF NOT EXISTS idx_student_faculty ON Student (FacultyID)",
+        "CREATE INDEX IF NOT EXISTS idx_student_lecturer ON Student (LecturerID)",
+        "CREATE INDEX IF NOT EXISTS idx_lecturer_faculty ON Lecturer (FacultyID)",
+        "CREATE INDEX IF NOT EXISTS idx_lecturer_coordinator ON Lecturer (CoordinatorID)",
+        "CREATE INDEX IF NOT EXISTS idx_coordinator_faculty ON ProgrammeCoordinator (FacultyID)",
+    ]),
+    (2, "Index the listing filters, the export cursor and the keyset pagination sort keys", [
+        "CREATE INDEX IF NOT EXISTS idx_paper_status_year_type ON Paper (Status, PubYear, PaperType)",
+        "CREATE INDEX IF NOT EXISTS idx_paper_year ON Paper (PubYear)",
+        "CREATE INDEX IF NOT EXISTS idx_paper_modified ON Paper (ModifiedAt, PaperID)",
+        "CREATE INDEX IF NOT EXISTS idx_paper_published ON Paper (DatePublished, PaperID)",
+        "CREATE INDEX IF NOT EXISTS idx_paper_status_published ON Paper (Status, DatePublished, PaperID)",
+    ]),
+    (3, "Index author names and the papers each user is an author of", [
+        "CREATE INDEX IF NOT EXISTS idx_author_lookup_name ON AuthorLookup (NormalizedName, Role)",
+        "CREATE INDEX IF NOT EXISTS idx_paper_author_user ON PaperAuthor (UserID, PaperID)",
+        "CREATE INDEX IF NOT EXISTS idx_paper_author_name ON PaperAuthor (NormalizedName)",
+    ]),
+    (4, "Index the papers of each faculty", [
+        "CREATE INDEX IF NOT EXISTS idx_paper_faculty_faculty ON PaperFaculty (FacultyID, PaperID)",
+    ]),
+]
 
 def init_db():
     conn = sqlite3.connect('trackingsystem.db')
     cursor = conn.cursor()
     cursor.execute("PRAGMA foreign_keys = ON;")
+    cursor.execute("PRAGMA journal_mode = WAL;")
 
     cursor.execute('''
     CREATE TABLE IF NOT EXISTS Faculty (
@@ -71,6 +117,8 @@ def init_db():
         LinkToPaper TEXT NOT NULL,
         PaperType TEXT NOT NULL,
         CoverImage TEXT,
+        CoverThumb TEXT,
+        CoverPreview TEXT,
         Authors TEXT,
         Status TEXT DEFAULT 'Under Review',
         Feedback TEXT,
@@ -78,6 +126,8 @@ def init_db():
         StudentID TEXT,
         CoordinatorID TEXT,
         AdminID TEXT,
+        ModifiedAt TEXT,
+        PubYear INTEGER GENERATED ALWAYS AS (CAST(substr(DatePublished, 1, 4) AS INTEGER)) VIRTUAL,
         FOREIGN KEY (LecturerID) REFERENCES Lecturer(LecturerID),
         FOREIGN KEY (StudentID) REFERENCES Student(StudentID),
         FOREIGN KEY (CoordinatorID) REFERENCES ProgrammeCoordinator(CoordinatorID),
@@ -85,6 +135,72 @@ def init_db():
     )
     ''')
 
+    # Databases created before these columns existed get them added in place
+    paper_columns = [row[1] for row in cursor.execute("PRAGMA table_xinfo(Paper)").fetchall()]
+    for column in ['CoverThumb', 'CoverPreview', 'ModifiedAt']:
+        if column not in paper_columns:
+            cursor.execute(f"ALTER TABLE Paper ADD COLUMN {column} TEXT")
+    if 'ModifiedAt' not in paper_columns:
+        cursor.execute("UPDATE Paper SET ModifiedAt = datetime('now')")
+    if 'PubYear' not in paper_columns:
+        cursor.execute('''
+        ALTER TABLE Paper ADD COLUMN
+        PubYear INTEGER GENERATED ALWAYS AS (CAST(substr(DatePublished, 1, 4) AS INTEGER)) VIRTUAL
+        ''')
+
+    # ModifiedAt (UTC) is stamped on every insert and update, for incremental exports
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS Paper_modified_insert AFTER INSERT ON Paper WHEN new.ModifiedAt IS NULL BEGIN
+        UPDATE Paper SET ModifiedAt = datetime('now') WHERE PaperID = new.PaperID;
+    END
+    ''')
+
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS Paper_modified_update AFTER UPDATE ON Paper WHEN new.ModifiedAt IS old.ModifiedAt BEGIN
+        UPDATE Paper SET ModifiedAt = datetime('now') WHERE PaperID = new.PaperID;
+    END
+    ''')
+
+    # Full-text index over the searchable Paper columns, kept in sync by triggers
+    search_index_exists = cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'PaperSearch'"
+    ).fetchone()
+
+    cursor.execute('''
+    CREATE VIRTUAL TABLE IF NOT EXISTS PaperSearch USING fts5(
+        PaperID UNINDEXED,
+        PaperTitle,
+        Authors,
+        DOI,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )
+    ''')
+
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS Paper_search_insert AFTER INSERT ON Paper BEGIN
+        INSERT INTO PaperSearch (PaperID, PaperTitle, Authors, DOI)
+        VALUES (new.PaperID, new.PaperTitle, new.Authors, new.DOI);
+    END
+    ''')
+
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS Paper_search_delete AFTER DELETE ON Paper BEGIN
+        DELETE FROM PaperSearch WHERE PaperID = old.PaperID;
+    END
+    ''')
+
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS Paper_search_update AFTER UPDATE OF PaperID, PaperTitle, Authors, DOI ON Paper BEGIN
+        DELETE FROM PaperSearch WHERE PaperID = old.PaperID;
+        INSERT INTO PaperSearch (PaperID, PaperTitle, Authors, DOI)
+        VALUES (new.PaperID, new.PaperTitle, new.Authors, new.DOI);
+    END
+    ''')
+
+    # Existing databases created before the index get backfilled once
+    if not search_index_exists:
+        rebuild_search_index(cursor)
+
     cursor.execute('''
     CREATE TABLE IF NOT EXISTS Bookmarks (
         UserID TEXT NOT NULL,
@@ -94,9 +210,495 @@ def init_db():
     )
     ''')
 
+    # Normalized author names so submissions resolve authors with one indexed lookup
+    author_lookup_exists = cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'AuthorLookup'"
+    ).fetchone()
+
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS AuthorLookup (
+        UserID TEXT PRIMARY KEY,
+        Role TEXT NOT NULL,
+        NormalizedName TEXT NOT NULL
+    )
+    ''')
+
+    if not author_lookup_exists:
+        rebuild_author_lookup(cursor)
+
+    # One row per author position on each paper, linked to the user where the name resolves
+    paper_author_exists = cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'PaperAuthor'"
+    ).fetchone()
+
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS PaperAuthor (
+        PaperID TEXT NOT NULL,
+        Position INTEGER NOT NULL,
+        UserID TEXT,
+        AuthorName TEXT NOT NULL,
+        NormalizedName TEXT NOT NULL,
+        PRIMARY KEY (PaperID, Position),
+        FOREIGN KEY (PaperID) REFERENCES Paper(PaperID)
+    )
+    ''')
+
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS Paper_authors_delete AFTER DELETE ON Paper BEGIN
+        DELETE FROM PaperAuthor WHERE PaperID = old.PaperID;
+    END
+    ''')
+
+    if not paper_author_exists:
+        rebuild_paper_authors(cursor)
+
+    # Faculties each paper belongs to (those of its linked lecturer, student and coordinator), kept by triggers
+    paper_faculty_exists = cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'PaperFaculty'"
+    ).fetchone()
+
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS PaperFaculty (
+        PaperID TEXT NOT NULL,
+        FacultyID TEXT NOT NULL,
+        PRIMARY KEY (PaperID, FacultyID)
+    ) WITHOUT ROWID
+    ''')
+
+    cursor.execute(f'''
+    CREATE TRIGGER IF NOT EXISTS Paper_faculty_insert AFTER INSERT ON Paper BEGIN
+        INSERT OR IGNORE INTO PaperFaculty (PaperID, FacultyID) {paper_faculty_rows('p.PaperID = new.PaperID')};
+    END
+    ''')
+    cursor.execute(f'''
+    CREATE TRIGGER IF NOT EXISTS Paper_faculty_update AFTER UPDATE OF LecturerID, StudentID, CoordinatorID ON Paper BEGIN
+        DELETE FROM PaperFaculty WHERE PaperID = old.PaperID;
+        INSERT OR IGNORE INTO PaperFaculty (PaperID, FacultyID) {paper_faculty_rows('p.PaperID = new.PaperID')};
+    END
+    ''')
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS Paper_faculty_delete AFTER DELETE ON Paper BEGIN
+        DELETE FROM PaperFaculty WHERE PaperID = old.PaperID;
+    END
+    ''')
+
+    # A user moving faculty or being removed re-derives the faculties of the papers linked to them
+    for table, key in [('Lecturer', 'LecturerID'), ('Student', 'StudentID'), ('ProgrammeCoordinator', 'CoordinatorID')]:
+        refresh = f'''
+            DELETE FROM PaperFaculty WHERE PaperID IN (SELECT PaperID FROM Paper WHERE {key} = old.{key});
+            INSERT OR IGNORE INTO PaperFaculty (PaperID, FacultyID) {paper_faculty_rows(f'p.{key} = old.{key}')};
+        '''
+        cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS {table}_faculty_update AFTER UPDATE OF FacultyID ON {table}
+        WHEN old.FacultyID IS NOT new.FacultyID BEGIN {refresh} END
+        ''')
+        cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS {table}_faculty_delete AFTER DELETE ON {table} BEGIN {refresh} END
+        ''')
+
+    if not paper_faculty_exists:
+        rebuild_paper_faculty(cursor)
+
+    # Pre-aggregated dashboard counts. FacultyID '' holds the university-wide totals.
+    paper_stats_exists = cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'PaperStats'"
+    ).fetchone()
+
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS PaperStats (
+        FacultyID TEXT NOT NULL,
+        PubYear INTEGER NOT NULL,
+        PaperType TEXT NOT NULL,
+        Status TEXT NOT NULL,
+        PaperCount INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (FacultyID, PubYear, PaperType, Status)
+    )
+    ''')
+
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS AuthorStats (
+        FacultyID TEXT NOT NULL,
+        NormalizedName TEXT NOT NULL,
+        PubYear INTEGER NOT NULL,
+        AuthorName TEXT NOT NULL,
+        PaperCount INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (FacultyID, NormalizedName, PubYear)
+    )
+    ''')
+
+    if not paper_stats_exists:
+        rebuild_paper_stats(cursor)
+
+    # Content-addressed cover images, reference counted from Paper.CoverImage
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS CoverBlob (
+        Hash TEXT PRIMARY KEY,
+        CoverImage TEXT NOT NULL UNIQUE,
+        CoverThumb TEXT,
+        CoverPreview TEXT,
+        ByteSize INTEGER NOT NULL,
+        RefCount INTEGER NOT NULL DEFAULT 0
+    )
+    ''')
+
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS Paper_cover_ref_insert AFTER INSERT ON Paper BEGIN
+        UPDATE CoverBlob SET RefCount = RefCount + 1 WHERE CoverImage = new.CoverImage;
+    END
+    ''')
+
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS Paper_cover_ref_delete AFTER DELETE ON Paper BEGIN
+        UPDATE CoverBlob SET RefCount = RefCount - 1 WHERE CoverImage = old.CoverImage;
+    END
+    ''')
+
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS Paper_cover_ref_update AFTER UPDATE OF CoverImage ON Paper BEGIN
+        UPDATE CoverBlob SET RefCount = RefCount - 1 WHERE CoverImage = old.CoverImage;
+        UPDATE CoverBlob SET RefCount = RefCount + 1 WHERE CoverImage = new.CoverImage;
+    END
+    ''')
+
+    # Every user ID with the role table it lives in, so login and lookup need one probe instead of four
+    user_identity_exists = cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'UserIdentity'"
+    ).fetchone()
+
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS UserIdentity (
+        UserID TEXT PRIMARY KEY,
+        Role TEXT NOT NULL
+    ) WITHOUT ROWID
+    ''')
+
+    for table, pk in USER_TABLES:
+        cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS {table}_identity_insert AFTER INSERT ON {table} BEGIN
+            INSERT OR REPLACE INTO UserIdentity (UserID, Role) VALUES (new.{pk}, '{table}');
+        END
+        ''')
+        cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS {table}_identity_update AFTER UPDATE OF {pk} ON {table} BEGIN
+            UPDATE UserIdentity SET UserID = new.{pk} WHERE UserID = old.{pk} AND Role = '{table}';
+        END
+        ''')
+        cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS {table}_identity_delete AFTER DELETE ON {table} BEGIN
+            DELETE FROM UserIdentity WHERE UserID = old.{pk} AND Role = '{table}';
+        END
+        ''')
+
+    if not user_identity_exists:
+        rebuild_user_identity(cursor)
+
+    # Last number issued per role and faculty, so new user IDs come from one atomic increment
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS UserSequence (
+        Role TEXT NOT NULL,
+        FacultyID TEXT NOT NULL,
+        LastNumber INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (Role, FacultyID)
+    ) WITHOUT ROWID
+    ''')
+    seed_user_sequences(cursor)
+
+    # Change counters (and when they last moved) used to invalidate caches and derive ETags
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS DataVersion (
+        Name TEXT PRIMARY KEY,
+        Version INTEGER NOT NULL DEFAULT 0,
+        UpdatedAt INTEGER NOT NULL DEFAULT 0
+    )
+    ''')
+
+    version_columns = [row[1] for row in cursor.execute("PRAGMA table_info(DataVersion)").fetchall()]
+    if 'UpdatedAt' not in version_columns:
+        cursor.execute("ALTER TABLE DataVersion ADD COLUMN UpdatedAt INTEGER NOT NULL DEFAULT 0")
+
+    versioned_tables = {
+        'Paper': ['Paper'],
+        'Bookmarks': ['Bookmarks'],
+        'Users': ['Admin', 'ProgrammeCoordinator', 'Lecturer', 'Student']
+    }
+    for name, tables in versioned_tables.items():
+        cursor.execute("INSERT OR IGNORE INTO DataVersion (Name, Version, UpdatedAt) VALUES (?, 0, CAST(strftime('%s', 'now') AS INTEGER))", (name,))
+        for table in tables:
+            for event in ['INSERT', 'UPDATE', 'DELETE']:
+                # Recreated every time so older trigger bodies pick up UpdatedAt
+                cursor.execute(f"DROP TRIGGER IF EXISTS {table}_version_{event.lower()}")
+                cursor.execute(f'''
+                CREATE TRIGGER {table}_version_{event.lower()} AFTER {event} ON {table} BEGIN
+                    UPDATE DataVersion SET Version = Version + 1, UpdatedAt = CAST(strftime('%s', 'now') AS INTEGER)
+                    WHERE Name = '{name}';
+                END
+                ''')
+
     conn.commit()
+    run_migrations(conn)
     conn.close()
 
+def run_migrations(conn):
+    """
+    Applies the MIGRATIONS newer than the database's PRAGMA user_version in
+    order, each in its own transaction together with the version bump, so a
+    failed step leaves the database at the last good version. Refreshes the
+    planner statistics afterwards. Returns the versions applied.
+    """
+    current = conn.execute("PRAGMA user_version").fetchone()[0]
+    applied = []
+    for version, description, statements in MIGRATIONS:
+        if version <= current:
+            continue
+        try:
+            conn.execute("BEGIN")
+            for statement in statements:
+                conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {int(version)}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        applied.append(version)
+
+    # Full statistics after a schema change; otherwise only what SQLite thinks is stale
+    conn.execute("ANALYZE" if applied else "PRAGMA optimize")
+    conn.commit()
+    return applied
+
+def rebuild_search_index(cursor=None):
+    """Rebuilds the PaperSearch full-text index from the Paper table."""
+    conn = None
+    if cursor is None:
+        conn = sqlite3.connect('trackingsystem.db')
+        cursor = conn.cursor()
+
+    cursor.execute("DELETE FROM PaperSearch")
+    cursor.execute('''
+        INSERT INTO PaperSearch (PaperID, PaperTitle, Authors, DOI)
+        SELECT PaperID, PaperTitle, Authors, DOI FROM Paper
+    ''')
+    cursor.execute("INSERT INTO PaperSearch (PaperSearch) VALUES ('optimize')")
+    indexed = cursor.execute("SELECT COUNT(*) FROM PaperSearch").fetchone()[0]
+
+    if conn is not None:
+        conn.commit()
+        conn.close()
+    return indexed
+
+def normalize_author_name(name):
+    return name.lower().replace(" ", "").strip()
+
+def rebuild_author_lookup(cursor=None):
+    """Rebuilds the AuthorLookup table from the Lecturer, Coordinator and Student tables."""
+    conn = None
+    if cursor is None:
+        conn = sqlite3.connect('trackingsystem.db')
+        cursor = conn.cursor()
+
+    sources = [
+        ('Lecturer', 'LecturerID', 'LecturerName', 'Lecturer'),
+        ('ProgrammeCoordinator', 'CoordinatorID', 'CoordinatorName', 'ProgrammeCoordinator'),
+        ('Student', 'StudentID', 'StudentName', 'Student')
+    ]
+
+    cursor.execute("DELETE FROM AuthorLookup")
+    for table, pk, name_col, role in sources:
+        rows = cursor.execute(f"SELECT {pk}, {name_col} FROM {table}").fetchall()
+        cursor.executemany("INSERT OR REPLACE INTO AuthorLookup (UserID, Role, NormalizedName) VALUES (?, ?, ?)",
+                           [(user_id, role, normalize_author_name(name)) for user_id, name in rows])
+    indexed = cursor.execute("SELECT COUNT(*) FROM AuthorLookup").fetchone()[0]
+
+    if conn is not None:
+        conn.commit()
+        conn.close()
+    return indexed
+
+def split_author_names(authors_text):
+    if not authors_text:
+        return []
+    return [a.strip() for a in authors_text.split(',') if a.strip()]
+
+def choose_author_id(candidates, preferred_ids=()):
+    """
+    Picks the user credited for one author name. candidates is a list of
+    (Role, UserID) pairs sharing that name; users already tied to the paper
+    win, otherwise lecturers, then coordinators, then students.
+    """
+    for role, user_id in candidates:
+        if user_id in preferred_ids:
+            return user_id
+    for wanted in ['Lecturer', 'ProgrammeCoordinator', 'Student']:
+        for role, user_id in candidates:
+            if role == wanted:
+                return user_id
+    return None
+
+def rebuild_paper_authors(cursor=None):
+    """Rebuilds PaperAuthor by splitting every Paper.Authors list against AuthorLookup."""
+    conn = None
+    if cursor is None:
+        conn = sqlite3.connect('trackingsystem.db')
+        cursor = conn.cursor()
+
+    lookup = {}
+    # Shorter IDs first so STU-FCI-99 still ranks before STU-FCI-100
+    for user_id, role, name in cursor.execute("SELECT UserID, Role, NormalizedName FROM AuthorLookup ORDER BY length(UserID), UserID"):
+        lookup.setdefault(name, []).append((role, user_id))
+
+    cursor.execute("DELETE FROM PaperAuthor")
+    # Stream papers on a second cursor while inserting on the first
+    papers = cursor.connection.execute(
+        "SELECT PaperID, Authors, LecturerID, StudentID, CoordinatorID FROM Paper"
+    )
+    batch = []
+    for paper_id, authors, lec_id, stu_id, coord_id in papers:
+        preferred = {lec_id, stu_id, coord_id}
+        for position, author in enumerate(split_author_names(authors), start=1):
+            normalized = normalize_author_name(author)
+            user_id = choose_author_id(lookup.get(normalized, []), preferred)
+            batch.append((paper_id, position, user_id, author, normalized))
+        if len(batch) >= 5000:
+            cursor.executemany("INSERT INTO PaperAuthor (PaperID, Position, UserID, AuthorName, NormalizedName) VALUES (?, ?, ?, ?, ?)", batch)
+            batch = []
+    cursor.executemany("INSERT INTO PaperAuthor (PaperID, Position, UserID, AuthorName, NormalizedName) VALUES (?, ?, ?, ?, ?)", batch)
+    linked = cursor.execute("SELECT COUNT(*) FROM PaperAuthor").fetchone()[0]
+
+    if conn is not None:
+        conn.commit()
+        conn.close()
+    return linked
+
+def rebuild_user_identity(cursor=None):
+    """Rebuilds the UserIdentity index from the four user tables."""
+    conn = None
+    if cursor is None:
+        conn = sqlite3.connect('trackingsystem.db')
+        cursor = conn.cursor()
+
+    cursor.execute("DELETE FROM UserIdentity")
+    for table, pk in USER_TABLES:
+        cursor.execute(f"INSERT OR REPLACE INTO UserIdentity (UserID, Role) SELECT {pk}, '{table}' FROM {table}")
+    indexed = cursor.execute("SELECT COUNT(*) FROM UserIdentity").fetchone()[0]
+
+    if conn is not None:
+        conn.commit()
+        conn.close()
+    return indexed
+
+def seed_user_sequences(cursor=None):
+    """
+    Raises every UserSequence row to at least the highest number already
+    issued under its role and faculty. Sequences never move backwards, so
+    this is safe to run on every start.
+    """
+    conn = None
+    if cursor is None:
+        conn = sqlite3.connect('trackingsystem.db')
+        cursor = conn.cursor()
+
+    highest = {}
+    for role, pk in USER_TABLES:
+        # IDs look like STU-FCI-07; the faculty is read from the ID since admins have no FacultyID
+        for (user_id,) in cursor.execute(f"SELECT {pk} FROM {role}").fetchall():
+            parts = user_id.split('-')
+            if len(parts) == 3 and parts[2].isdigit():
+                key = (role, parts[1])
+                highest[key] = max(highest.get(key, 0), int(parts[2]))
+
+    cursor.executemany('''
+        INSERT INTO UserSequence (Role, FacultyID, LastNumber) VALUES (?, ?, ?)
+        ON CONFLICT (Role, FacultyID) DO UPDATE SET LastNumber = MAX(LastNumber, excluded.LastNumber)
+    ''', [(role, faculty_id, number) for (role, faculty_id), number in highest.items()])
+
+    if conn is not None:
+        conn.commit()
+        conn.close()
+    return len(highest)
+
+def paper_faculty_rows(condition):
+    # (PaperID, FacultyID) for the linked lecturer, student and coordinator of the papers matching condition
+    return f'''
+        SELECT p.PaperID, l.FacultyID FROM Paper p JOIN Lecturer l ON l.LecturerID = p.LecturerID WHERE {condition}
+        UNION SELECT p.PaperID, s.FacultyID FROM Paper p JOIN Student s ON s.StudentID = p.StudentID WHERE {condition}
+        UNION SELECT p.PaperID, c.FacultyID FROM Paper p JOIN ProgrammeCoordinator c ON c.CoordinatorID = p.CoordinatorID WHERE {condition}
+    '''
+
+# Every paper counts towards the university ('') and each faculty of its linked lecturer, student and coordinator
+PAPER_FACULTIES_SQL = "SELECT PaperID, '' AS FacultyID FROM Paper UNION" + paper_faculty_rows('1')
+
+def rebuild_paper_faculty(cursor=None):
+    """Rebuilds PaperFaculty from each paper's linked lecturer, student and coordinator."""
+    conn = None
+    if cursor is None:
+        conn = sqlite3.connect('trackingsystem.db')
+        cursor = conn.cursor()
+
+    cursor.execute("DELETE FROM PaperFaculty")
+    cursor.execute(f"INSERT OR IGNORE INTO PaperFaculty (PaperID, FacultyID) {paper_faculty_rows('1')}")
+    linked = cursor.execute("SELECT COUNT(*) FROM PaperFaculty").fetchone()[0]
+
+    if conn is not None:
+        conn.commit()
+        conn.close()
+    return linked
+
+def rebuild_paper_stats(cursor=None):
+    """
+    Recomputes PaperStats and AuthorStats from the raw tables. Returns the
+    list of summary rows whose stored count disagreed with the recomputed one.
+    """
+    conn = None
+    if cursor is None:
+        conn = sqlite3.connect('trackingsystem.db')
+        cursor = conn.cursor()
+
+    expected_papers = {}
+    for faculty_id, year, paper_type, status, count in cursor.execute(f'''
+        SELECT pf.FacultyID, p.PubYear, p.PaperType, p.Status, COUNT(*)
+        FROM ({PAPER_FACULTIES_SQL}) pf
+        JOIN Paper p ON p.PaperID = pf.PaperID
+        GROUP BY 1, 2, 3, 4
+    ''').fetchall():
+        expected_papers[(faculty_id, year, paper_type, status)] = count
+
+    expected_authors = {}
+    author_names = {}
+    for faculty_id, normalized, name, year, count in cursor.execute(f'''
+        SELECT pf.FacultyID, pa.NormalizedName, MIN(pa.AuthorName), p.PubYear, COUNT(*)
+        FROM ({PAPER_FACULTIES_SQL}) pf
+        JOIN Paper p ON p.PaperID = pf.PaperID
+        JOIN PaperAuthor pa ON pa.PaperID = p.PaperID
+        WHERE p.Status = 'Approved'
+        GROUP BY 1, 2, 4
+    ''').fetchall():
+        expected_authors[(faculty_id, normalized, year)] = count
+        author_names[(faculty_id, normalized, year)] = name
+
+    stored_papers = {tuple(row[:4]): row[4] for row in cursor.execute(
+        "SELECT FacultyID, PubYear, PaperType, Status, PaperCount FROM PaperStats WHERE PaperCount != 0")}
+    stored_authors = {tuple(row[:3]): row[3] for row in cursor.execute(
+        "SELECT FacultyID, NormalizedName, PubYear, PaperCount FROM AuthorStats WHERE PaperCount != 0")}
+
+    mismatches = []
+    for table, expected, stored in [('PaperStats', expected_papers, stored_papers),
+                                    ('AuthorStats', expected_authors, stored_authors)]:
+        for key in sorted(set(expected) | set(stored)):
+            if expected.get(key, 0) != stored.get(key, 0):
+                mismatches.append((table, key, stored.get(key, 0), expected.get(key, 0)))
+
+    cursor.execute("DELETE FROM PaperStats")
+    cursor.executemany("INSERT INTO PaperStats (FacultyID, PubYear, PaperType, Status, PaperCount) VALUES (?, ?, ?, ?, ?)",
+                       [key + (count,) for key, count in expected_papers.items()])
+    cursor.execute("DELETE FROM AuthorStats")
+    cursor.executemany("INSERT INTO AuthorStats (FacultyID, NormalizedName, PubYear, AuthorName, PaperCount) VALUES (?, ?, ?, ?, ?)",
+                       [key + (author_names[key], count) for key, count in expected_authors.items()])
+
+    if conn is not None:
+        conn.commit()
+        conn.close()
+    return mismatches
+
 def populate_db():
     conn = sqlite3.connect('trackingsystem.db')
     cursor = conn.cursor()
@@ -183,9 +785,285 @@ def populate_db():
                            (stu_id, "stu123", student_name, is_final, assigned_lecturer, admin_id, code))
             stu_idx += 1
 
+    rebuild_author_lookup(cursor)
+    seed_user_sequences(cursor)
     conn.commit()
     conn.close()
 
+SYNTHETIC_FIRST_NAMES = [
+    "Aisha", "Alice", "Amanda", "Arjun", "Benjamin", "Chen", "Daniel", "David", "Farah", "Farid", "Gopal", "Hana",
+    "Haziq", "Irfan", "Jason", "Kavitha", "Kenji", "Lina", "Mei", "Nadia", "Nurul", "Omar", "Priya", "Rajesh",
+    "Ravi", "Robert", "Sarah", "Siti", "Sofia", "Tan", "Wei", "Yusof", "Zara", "Zulaikha"
+]
+SYNTHETIC_LAST_NAMES = [
+    "Abdullah", "Bakar", "Chong", "Fernandez", "Goh", "Hassan", "Ibrahim", "Kaur", "Krishnan", "Kumar", "Lee",
+    "Lim", "Ling", "Maniam", "Ng", "Ong", "Rahman", "Razak", "Sato", "Singh", "Tan", "Teoh", "Wong", "Yap"
+]
+SYNTHETIC_SUBJECTS = [
+    "Computing", "Engineering", "Management", "Creative Multimedia", "Applied Communications", "Law", "Medicine",
+    "Science", "Business", "Education", "Architecture", "Economics"
+]
+SYNTHETIC_TITLE_WORDS = [
+    "adaptive", "analysis", "attention", "blockchain", "cloud", "clustering", "consumer", "cryptography", "data",
+    "deep", "design", "detection", "diffusion", "distributed", "edge", "efficient", "energy", "federated", "finance",
+    "forecasting", "framework", "graph", "health", "image", "language", "learning", "market", "media", "mobile",
+    "model", "network", "neural", "optimisation", "privacy", "quantum", "recommendation", "reinforcement", "retail",
+    "robust", "scalable", "secure", "sensor", "speech", "sustainable", "transformer", "urban", "vision", "wireless"
+]
+SYNTHETIC_PAPER_TYPES = ['Journal', 'Conference', 'Book', 'Thesis']
+
+def generate_synthetic_data(faculties=5, coordinators_per_faculty=2, lecturers_per_faculty=3, students_per_faculty=5,
+                            papers=0, coauthor_weights=(30, 40, 20, 10), years=(2010, 2025),
+                            status_mix=(('Approved', 70), ('Under Review', 20), ('Rejected', 10)),
+                            bookmarks_per_user=0, seed=0, batch_size=50000):
+    """
+    Fills trackingsystem.db (already created by init_db) with generated
+    faculties F01, F02, ..., one admin and the given number of users per
+    faculty, `papers` papers and `bookmarks_per_user` bookmarks of approved
+    papers for every user. Passwords match populate_db's (admin123,
+    coord123, lec123, stu123).
+
+    Each paper is led by a lecturer; coauthor_weights[n] is the relative
+    chance of n co-authors, drawn from the lead's students, colleagues and
+    coordinators. The same arguments and seed always produce the same data.
+    Paper IDs use a SYN- prefix so they never collide with the app's PAP- IDs.
+    Returns the number of rows inserted per table.
+
+    The load runs without a rollback journal, so a run that fails part way
+    leaves the database unusable: delete it and start again from init_db.
+
+    A million papers over 20 faculties takes about a minute to a minute and
+    a half on one vCPU. Generating the rows in Python is under a sixth of
+    that; the rest is SQLite inserting them, filling the full-text index
+    and rebuilding the secondary indexes.
+    """
+    # Everything is checked before the load touches the database
+    if faculties < 0 or min(coordinators_per_faculty, lecturers_per_faculty, students_per_faculty,
+                            papers, bookmarks_per_user) < 0:
+        raise ValueError("Counts cannot be negative.")
+    if papers and not (faculties and lecturers_per_faculty):
+        raise ValueError("Papers need at least one lecturer to lead them.")
+    if not coauthor_weights or min(coauthor_weights) < 0 or not sum(coauthor_weights):
+        raise ValueError("Co-author weights need at least one positive weight.")
+    if not status_mix or min(weight for _, weight in status_mix) < 0 or not sum(weight for _, weight in status_mix):
+        raise ValueError("The status mix needs at least one positive weight.")
+    if len(years) != 2 or years[0] > years[1]:
+        raise ValueError("The year range must be (first, last) with first <= last.")
+    if batch_size < 1:
+        raise ValueError("The batch size must be at least 1.")
+
+    rng = random.Random(seed)
+    conn = sqlite3.connect('trackingsystem.db', isolation_level=None)
+    cursor = conn.cursor()
+
+    width = max(2, len(str(faculties)))
+    faculty_ids = [f"F{number:0{width}d}" for number in range(1, faculties + 1)]
+    if cursor.execute(f"SELECT 1 FROM Faculty WHERE FacultyID IN ({', '.join('?' * len(faculty_ids))})",
+                      faculty_ids).fetchone():
+        conn.close()
+        raise ValueError("The database already has generated faculties; start from an empty one.")
+
+    # A crash mid-load leaves a database to throw away anyway, so skip the rollback journal and fsyncs
+    cursor.execute("PRAGMA journal_mode = OFF")
+    cursor.execute("PRAGMA synchronous = OFF")
+    cursor.execute("PRAGMA cache_size = -512000")
+    cursor.execute("PRAGMA temp_store = MEMORY")
+    cursor.execute("PRAGMA threads = 4")  # lets the index rebuilds sort in parallel
+    cursor.execute("BEGIN")
+
+    # Row-at-a-time triggers and index maintenance dominate a bulk load. They are dropped inside the
+    # transaction, recreated from their stored SQL afterwards and what they maintain is filled in bulk.
+    first_new_rowid = cursor.execute("SELECT COALESCE(MAX(rowid), 0) + 1 FROM Paper").fetchone()[0]
+    deferred = cursor.execute('''
+        SELECT type, name, sql FROM sqlite_master
+        WHERE type IN ('index', 'trigger') AND sql IS NOT NULL
+        AND tbl_name IN ('Paper', 'PaperAuthor', 'PaperFaculty', 'Bookmarks')
+    ''').fetchall()
+    for kind, name, _ in deferred:
+        cursor.execute(f"DROP {kind.upper()} {name}")
+
+    def person(number):
+        first = SYNTHETIC_FIRST_NAMES[number % len(SYNTHETIC_FIRST_NAMES)]
+        last = SYNTHETIC_LAST_NAMES[number // len(SYNTHETIC_FIRST_NAMES) % len(SYNTHETIC_LAST_NAMES)]
+        # Suffixed once the combinations run out, so every generated name resolves to one user
+        cycle = number // (len(SYNTHETIC_FIRST_NAMES) * len(SYNTHETIC_LAST_NAMES))
+        return f"{first} {last}" + (f" {cycle + 1}" if cycle else '')
+
+    def author(user_id, name):
+        return (user_id, name, normalize_author_name(name))
+
+    names = iter(range(10 ** 9))
+    admins, coordinators, lecturers, students = [], [], [], []
+    leads = []
+    all_authors = []
+    for number, faculty_id in enumerate(faculty_ids):
+        subject = SYNTHETIC_SUBJECTS[number % len(SYNTHETIC_SUBJECTS)]
+        suffix = f" {number // len(SYNTHETIC_SUBJECTS) + 1}" if number >= len(SYNTHETIC_SUBJECTS) else ''
+        cursor.execute("INSERT INTO Faculty (FacultyID, FacultyName) VALUES (?, ?)",
+                       (faculty_id, f"Faculty of {subject}{suffix}"))
+        admin_id = f"ADM-{faculty_id}-01"
+        admins.append((admin_id, "admin123", f"Admin {person(next(names))}"))
+
+        faculty_coordinators = [author(f"COO-{faculty_id}-{n:02d}", f"Prof. {person(next(names))}")
+                                for n in range(1, coordinators_per_faculty + 1)]
+        coordinators.extend((coord[0], "coord123", coord[1], faculty_id, admin_id) for coord in faculty_coordinators)
+
+        faculty_lecturers = [author(f"LEC-{faculty_id}-{n:02d}", f"Dr. {person(next(names))}")
+                             for n in range(1, lecturers_per_faculty + 1)]
+        for n, lecturer in enumerate(faculty_lecturers):
+            coord_id = faculty_coordinators[n % len(faculty_coordinators)][0] if faculty_coordinators else None
+            lecturers.append((lecturer[0], "lec123", lecturer[1], coord_id, admin_id, faculty_id))
+
+        supervised = {lecturer[0]: [] for lecturer in faculty_lecturers}
+        supervised_students = []
+        for n in range(1, students_per_faculty + 1):
+            student = author(f"STU-{faculty_id}-{n:02d}", person(next(names)))
+            lec_id = faculty_lecturers[n % len(faculty_lecturers)][0] if faculty_lecturers else None
+            # Every fifth student is not in their final year and so cannot be credited on papers
+            is_final = 0 if n % 5 == 0 else 1
+            students.append((student[0], "stu123", student[1], is_final, lec_id, admin_id, faculty_id))
+            if is_final and lec_id:
+                supervised[lec_id].append(student)
+                supervised_students.append(student)
+        all_authors.extend(faculty_coordinators + faculty_lecturers + supervised_students)
+        for lecturer in faculty_lecturers:
+            # Co-author pools by role: own students, colleagues, coordinators
+            leads.append((lecturer, faculty_id, (supervised[lecturer[0]], faculty_lecturers, faculty_coordinators)))
+
+    cursor.executemany("INSERT INTO Admin (AdminID, AdminPassword, AdminName) VALUES (?, ?, ?)", admins)
+    cursor.executemany("INSERT INTO ProgrammeCoordinator (CoordinatorID, CoordinatorPassword, CoordinatorName, FacultyID, AdminID) VALUES (?, ?, ?, ?, ?)", coordinators)
+    cursor.executemany("INSERT INTO Lecturer (LecturerID, LecturerPassword, LecturerName, CoordinatorID, AdminID, FacultyID) VALUES (?, ?, ?, ?, ?, ?)", lecturers)
+    cursor.executemany("INSERT INTO Student (StudentID, StudentPassword, StudentName, IsFinalYear, LecturerID, AdminID, FacultyID) VALUES (?, ?, ?, ?, ?, ?, ?)", students)
+    counts = {'Faculty': faculties, 'Admin': len(admins), 'ProgrammeCoordinator': len(coordinators),
+              'Lecturer': len(lecturers), 'Student': len(students)}
+
+    # Per-row random.choice/sample/randint calls cost more than the inserts, so titles and dates are
+    # picked from precomputed pools (about four million distinct titles) with one random() each
+    heads = [' '.join(rng.sample(SYNTHETIC_TITLE_WORDS, rng.randint(2, 3))).capitalize() for _ in range(2048)]
+    tails = [f"{rng.choice(['for', 'in', 'with', 'using', 'on'])} {' '.join(rng.sample(SYNTHETIC_TITLE_WORDS, rng.randint(1, 3)))}"
+             for _ in range(2048)]
+    dates = [(f"{year}-{month:02d}-{day:02d}", year) for year in range(years[0], years[1] + 1)
+             for month in range(1, 13) for day in range(1, 29)]
+    statuses, status_weights = zip(*status_mix)
+    modified_at = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+    random_float = rng.random
+    approved = array('I')
+    # Generated papers belong to their lead's faculty only, so the summaries are counted as we go
+    paper_stats = Counter()
+    author_stats = Counter()
+
+    def paper_batch(start, size, batch_authors):
+        """Yields the Paper rows of one batch, collecting each paper's authors for the PaperAuthor rows."""
+        batch_leads = rng.choices(leads, k=size)
+        batch_statuses = rng.choices(statuses, status_weights, k=size)
+        batch_coauthors = rng.choices(range(len(coauthor_weights)), coauthor_weights, k=size)
+        batch_types = rng.choices(SYNTHETIC_PAPER_TYPES, (50, 35, 10, 5), k=size)
+        for offset in range(size):
+            number = start + offset
+            paper_id = f"SYN-{number:08X}"
+            lead, faculty_id, (own_students, colleagues, faculty_coordinators) = batch_leads[offset]
+            authors = [lead]
+            student_id = coord_id = None
+            for _ in range(batch_coauthors[offset]):
+                roll = random_float()
+                pool = own_students if roll < 0.5 else colleagues if roll < 0.85 else faculty_coordinators
+                if not pool:
+                    continue
+                coauthor = pool[int(random_float() * len(pool))]
+                if coauthor in authors:
+                    continue
+                authors.append(coauthor)
+                if pool is own_students:
+                    student_id = student_id or coauthor[0]
+                elif pool is faculty_coordinators:
+                    coord_id = coord_id or coauthor[0]
+
+            published, year = dates[int(random_float() * len(dates))]
+            doi = f"10.{5000 + number % 4000}/synthetic.{number}"
+            status = batch_statuses[offset]
+            paper_type = batch_types[offset]
+            batch_authors.append((paper_id, authors))
+            paper_stats[(faculty_id, year, paper_type, status)] += 1
+            if status == 'Approved':
+                approved.append(number)
+                for author_row in authors:
+                    author_stats[(faculty_id, author_row[2], year)] += 1
+            yield (paper_id, f"{heads[int(random_float() * 2048)]} {tails[int(random_float() * 2048)]}",
+                   doi, published, published, f"https://doi.org/{doi}", paper_type,
+                   ', '.join([a[1] for a in authors]), status, lead[0], student_id, coord_id, modified_at)
+
+    paper_authors = 0
+    for start in range(0, papers, batch_size):
+        batch_authors = []
+        # Rows stream from the generators into executemany instead of being built up as lists first
+        cursor.executemany('''
+            INSERT INTO Paper (PaperID, PaperTitle, DOI, DatePublished, DateRequest, LinkToPaper, PaperType,
+                               Authors, Status, LecturerID, StudentID, CoordinatorID, ModifiedAt)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', paper_batch(start, min(batch_size, papers - start), batch_authors))
+        cursor.executemany("INSERT INTO PaperAuthor (PaperID, Position, UserID, AuthorName, NormalizedName) VALUES (?, ?, ?, ?, ?)",
+                           # Author tuples are already the (UserID, AuthorName, NormalizedName) columns
+                           ((paper_id, position) + author
+                            for paper_id, authors in batch_authors
+                            for position, author in enumerate(authors, start=1)))
+        paper_authors += cursor.rowcount
+    counts.update(Paper=papers, PaperAuthor=paper_authors)
+
+    bookmarks = 0
+    if bookmarks_per_user and approved:
+        rows = []
+        for user in admins + coordinators + lecturers + students:
+            for number in rng.sample(approved, min(bookmarks_per_user, len(approved))):
+                rows.append((user[0], f"SYN-{number:08X}"))
+            if len(rows) >= batch_size:
+                cursor.executemany("INSERT INTO Bookmarks (UserID, PaperID) VALUES (?, ?)", rows)
+                bookmarks += len(rows)
+                rows = []
+        cursor.executemany("INSERT INTO Bookmarks (UserID, PaperID) VALUES (?, ?)", rows)
+        bookmarks += len(rows)
+    counts['Bookmarks'] = bookmarks
+
+    cursor.execute('''
+        INSERT INTO PaperSearch (PaperID, PaperTitle, Authors, DOI)
+        SELECT PaperID, PaperTitle, Authors, DOI FROM Paper WHERE rowid >= ?
+    ''', (first_new_rowid,))
+    cursor.execute(f"INSERT OR IGNORE INTO PaperFaculty (PaperID, FacultyID) {paper_faculty_rows(f'p.rowid >= {int(first_new_rowid)}')}")
+
+    # Same upserts as the app's adjust_paper_stats; every paper also counts towards the university ('')
+    for (faculty_id, year, paper_type, status), count in list(paper_stats.items()):
+        paper_stats[('', year, paper_type, status)] += count
+    for (faculty_id, normalized, year), count in list(author_stats.items()):
+        author_stats[('', normalized, year)] += count
+    # Generated names are unique, so each normalized name has exactly one spelling
+    author_names = {row[2]: row[1] for row in all_authors}
+    cursor.executemany('''
+        INSERT INTO PaperStats (FacultyID, PubYear, PaperType, Status, PaperCount) VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT (FacultyID, PubYear, PaperType, Status) DO UPDATE SET PaperCount = PaperCount + excluded.PaperCount
+    ''', [key + (count,) for key, count in paper_stats.items()])
+    cursor.executemany('''
+        INSERT INTO AuthorStats (FacultyID, NormalizedName, PubYear, AuthorName, PaperCount) VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT (FacultyID, NormalizedName, PubYear) DO UPDATE SET PaperCount = PaperCount + excluded.PaperCount
+    ''', [(faculty_id, normalized, year, author_names[normalized], count)
+          for (faculty_id, normalized, year), count in author_stats.items()])
+
+    for _, _, sql in deferred:
+        cursor.execute(sql)
+    rebuild_author_lookup(cursor)
+    seed_user_sequences(cursor)
+    # The skipped version triggers would have moved these; running servers must drop their caches
+    cursor.execute('''
+        UPDATE DataVersion SET Version = Version + 1, UpdatedAt = CAST(strftime('%s', 'now') AS INTEGER)
+        WHERE Name IN ('Paper', 'Bookmarks')
+    ''')
+    cursor.execute("COMMIT")
+
+    cursor.execute("PRAGMA journal_mode = WAL")
+    # Sampled statistics are plenty for the planner here and a full ANALYZE rereads every index
+    cursor.execute("PRAGMA analysis_limit = 1000")
+    cursor.execute("ANALYZE")
+    conn.close()
+    return counts
+
 if __name__ == "__main__":
     init_db()
     populate_db()
\ No newline at end of file
@@ -1,13 +1,36 @@
-from flask import Flask, render_template, request, redirect, url_for, session, flash, jsonify
+from flask import (Flask, render_template, request, redirect, url_for, session, flash, jsonify, g, has_app_context, has_request_context, make_response,
+                   Response, send_file, stream_with_context)
 import sqlite3
 import os
+import queue
 import uuid
-from werkzeug.utils import secure_filename
-from database import init_db, populate_db
+import hashlib
+import tempfile
+import shutil
+import re
+import csv
+import io
+import zipfile
+import time
+import random
+import logging
+import threading
+import bisect
+import click
+from functools import wraps
+try:
+    from PIL import Image, ImageOps, features
+except ImportError:
+    Image = None
+from database import (init_db, populate_db, run_migrations, rebuild_search_index, rebuild_author_lookup, rebuild_paper_authors,
+                      rebuild_paper_stats, rebuild_paper_faculty, rebuild_user_identity, seed_user_sequences, generate_synthetic_data,
+                      normalize_author_name, split_author_names, choose_author_id)
+from reports import render_pdf, render_csv, render_rows_csv, render_ndjson, render_bibtex, parse_bibtex
 from math import ceil
-from datetime import datetime
+from datetime import datetime, timezone
 import json
-from collections import Counter
+import base64
+from collections import Counter, OrderedDict
 
 app = Flask(__name__)
 app.secret_key = '2002200520092005'
@@ -18,97 +41,899 @@ app.secret_key = '2002200520092005'
 DB_NAME = 'trackingsystem.db'
 UPLOAD_FOLDER = os.path.join(STATIC_DIR, 'uploads', 'covers')
 ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg'}
+COUNT_CACHE_SIZE = 1024
+PROFILE_CACHE_SIZE = 4096
+SEARCH_CACHE_SIZE = 1024
+TYPEAHEAD_LIMIT = 8
+REPORT_FORMATS = {'pdf': 'application/pdf', 'csv': 'text/csv'}
+EXPORT_FORMATS = {'csv': ('text/csv', 'csv'), 'ndjson': ('application/x-ndjson', 'ndjson'), 'bibtex': ('application/x-bibtex', 'bib')}
+BIBTEX_TYPES = {'Journal': 'article', 'Conference': 'inproceedings', 'Book': 'book', 'Thesis': 'phdthesis'}
+PAPER_TYPES = ['Journal', 'Conference', 'Book', 'Thesis']
+IMPORT_STATUSES = ['Approved', 'Under Review']
+IMPORT_BIBTEX_TYPES = {'article': 'Journal', 'inproceedings': 'Conference', 'conference': 'Conference',
+                       'proceedings': 'Conference', 'book': 'Book', 'inbook': 'Book', 'incollection': 'Book',
+                       'phdthesis': 'Thesis', 'mastersthesis': 'Thesis', 'thesis': 'Thesis'}
+IMPORT_CSV_ALIASES = {'date': 'date_published', 'type': 'paper_type', 'link': 'url', 'link_to_paper': 'url',
+                      'cover_page': 'cover'}
+BIBTEX_MONTHS = {name: number for number, name in enumerate(
+    ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'], start=1)}
+IMPORT_FIELDS = ['title', 'authors', 'date_published', 'url', 'paper_type', 'doi', 'cover']
+IMPORT_PROGRESS_EVERY = 500
+USER_ROLES = {'Student': ('STU', 'StudentID'), 'Lecturer': ('LEC', 'LecturerID'),
+              'ProgrammeCoordinator': ('COO', 'CoordinatorID'), 'Admin': ('ADM', 'AdminID')}
+USER_ROLE_ALIASES = {'student': 'Student', 'lecturer': 'Lecturer', 'coordinator': 'ProgrammeCoordinator',
+                     'programme_coordinator': 'ProgrammeCoordinator', 'programmecoordinator': 'ProgrammeCoordinator',
+                     'admin': 'Admin'}
+PROVISION_FIELDS = ['role', 'faculty', 'name', 'password', 'is_final_year', 'assigned_lecturer', 'assigned_coordinator']
+PROVISION_CSV_ALIASES = {'user_type': 'role', 'faculty_id': 'faculty', 'final_year': 'is_final_year',
+                         'lecturer': 'assigned_lecturer', 'coordinator': 'assigned_coordinator',
+                         'assigned_coord': 'assigned_coordinator'}
+PROVISION_MAPPING_COLUMNS = ['line', 'name', 'role', 'faculty', 'user_id']
+# Session role and landing page for each user table
+LOGIN_HOMES = {'Admin': ('admin', 'admin_home'), 'ProgrammeCoordinator': ('coordinator', 'coordinator_home'),
+               'Lecturer': ('lecturer', 'lecturer_student_home'), 'Student': ('student', 'lecturer_student_home')}
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
+app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # largest accepted request, cover included
+app.config['IMPORT_MAX_CONTENT_LENGTH'] = 1024 * 1024 * 1024  # bulk imports with a covers zip; spooled to disk
+app.config['THUMBNAIL_WIDTH'] = 160   # list pages show covers at 80px, 2x for high-DPI screens
+app.config['PREVIEW_WIDTH'] = 600
+app.config['REPORT_CACHE_FOLDER'] = os.path.join(BASE_DIR, 'report_cache')
+app.config['DATA_STAMP_TTL'] = 1.0  # seconds before re-reading DataVersion for writes made by other processes
+app.config['SEARCH_CACHE_TTL'] = 30.0  # seconds a cached search page may lag papers approved or removed by other processes
+app.config['TYPEAHEAD_MAX_ENTRIES'] = 200000  # bounds the prefix index (roughly 150 bytes each); newest papers are kept
+app.config['TYPEAHEAD_MAX_AGE'] = 600.0      # seconds before the prefix index is rebuilt in the background
+app.config['DB_POOL_SIZE'] = 8
+app.config['DB_BUSY_TIMEOUT'] = 5000          # milliseconds
+app.config['DB_MMAP_SIZE'] = 256 * 1024 * 1024  # bytes
+app.config['DB_CACHE_SIZE'] = -64000          # negative = KiB, i.e. ~64 MB page cache
+app.config['SLOW_REQUEST_SECONDS'] = 0.5      # requests slower than this are written to the slow-query log
+app.config['SLOW_QUERY_LOG'] = os.path.join(BASE_DIR, 'slow_queries.log')
 if not os.path.exists(UPLOAD_FOLDER):
     os.makedirs(UPLOAD_FOLDER)
     print(f"Created New Directory: {UPLOAD_FOLDER}")
 else:
     print(f"Saving images to: {UPLOAD_FOLDER}")
 
-def get_db_connection():
-    conn = sqlite3.connect(DB_NAME)
+# Idle connections shared across requests
+db_pool = queue.LifoQueue(maxsize=app.config['DB_POOL_SIZE'])
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """
+    Cursor that records each statement it runs in the current request's
+    SQL log as [sql, seconds, rows]. Time spent fetching the rows is added
+    to the statement that produced them; iteration fetches in blocks, and
+    rows taken with a bare next() are not counted. Outside a request it is
+    a plain cursor.
+    """
+    record = None
+
+    def execute(self, sql, parameters=()):
+        return self._run(super().execute, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self._run(super().executemany, sql, seq_of_parameters)
+
+    def _run(self, run, sql, parameters):
+        log = g.get('sql_log') if has_request_context() else None
+        if log is None:
+            self.record = None
+            return run(sql, parameters)
+        started = time.perf_counter()
+        try:
+            return run(sql, parameters)
+        finally:
+            self.record = [sql, time.perf_counter() - started, max(self.rowcount, 0)]
+            log.append(self.record)
+
+    def _timed_fetch(self, fetch, *args):
+        started = time.perf_counter()
+        try:
+            return fetch(*args)
+        finally:
+            self.record[1] += time.perf_counter() - started
+
+    def fetchone(self):
+        if self.record is None:
+            return super().fetchone()
+        row = self._timed_fetch(super().fetchone)
+        if row is not None:
+            self.record[2] += 1
+        return row
+
+    def fetchmany(self, size=None):
+        if self.record is None:
+            return super().fetchmany(self.arraysize if size is None else size)
+        rows = self._timed_fetch(super().fetchmany, self.arraysize if size is None else size)
+        self.record[2] += len(rows)
+        return rows
+
+    def fetchall(self):
+        if self.record is None:
+            return super().fetchall()
+        rows = self._timed_fetch(super().fetchall)
+        self.record[2] += len(rows)
+        return rows
+
+    def __iter__(self):
+        if self.record is None:
+            return self
+        return self._iter_blocks()
+
+    def _iter_blocks(self):
+        # Timed and counted a block at a time, so large streamed results pay nothing extra per row
+        while True:
+            rows = self.fetchmany(256)
+            if not rows:
+                return
+            yield from rows
+
+class InstrumentedConnection(sqlite3.Connection):
+    # sqlite3's own shortcuts bypass cursor(), so route them through the instrumented cursor
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+def open_db_connection():
+    conn = sqlite3.connect(DB_NAME, timeout=app.config['DB_BUSY_TIMEOUT'] / 1000, check_same_thread=False,
+                           factory=InstrumentedConnection)
     conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute(f"PRAGMA busy_timeout = {int(app.config['DB_BUSY_TIMEOUT'])}")
+    conn.execute(f"PRAGMA mmap_size = {int(app.config['DB_MMAP_SIZE'])}")
+    conn.execute(f"PRAGMA cache_size = {int(app.config['DB_CACHE_SIZE'])}")
     return conn
 
+def get_db_connection():
+    """
+    Returns the connection for the current request, checking one out of the
+    pool on first use. It is handed back to the pool when the request ends,
+    so callers must not close it. Outside a request a standalone connection
+    is returned and the caller owns it.
+    """
+    if not has_app_context():
+        return open_db_connection()
+
+    if 'db' not in g:
+        try:
+            g.db = db_pool.get_nowait()
+        except queue.Empty:
+            g.db = open_db_connection()
+    return g.db
+
+@app.teardown_appcontext
+def release_db_connection(exception):
+    conn = g.pop('db', None)
+    if conn is None:
+        return
+
+    # Anything a request left uncommitted is discarded, never leaked to the next one
+    if conn.in_transaction:
+        conn.rollback()
+    try:
+        db_pool.put_nowait(conn)
+    except queue.Full:
+        conn.close()
+
+# Per-process request metrics, exported at /admin/metrics
+LATENCY_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+SQL_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+SQL_PAGE_NUMBERS = re.compile(r"\b(LIMIT|OFFSET)\s+\d+", re.IGNORECASE)
+metrics_lock = threading.Lock()
+route_metrics = {}
+cache_metrics = Counter()
+sql_templates = {}
+slow_log = logging.getLogger('tracking.slow_requests')
+
+def sql_template(sql):
+    # One label per statement shape: whitespace folded, IN lists and page sizes collapsed
+    template = sql_templates.get(sql)
+    if template is None:
+        template = SQL_IN_LIST.sub('(?, ...)', ' '.join(sql.split()))
+        template = SQL_PAGE_NUMBERS.sub(lambda m: f"{m.group(1).upper()} ?", template)
+        if len(sql_templates) < 4096:
+            sql_templates[sql] = template
+    return template
+
+def record_cache(cache, hit):
+    with metrics_lock:
+        cache_metrics[(cache, 'hit' if hit else 'miss')] += 1
+
+@app.before_request
+def start_request_metrics():
+    g.sql_log = []
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def schedule_request_metrics(response):
+    started = g.pop('request_started', None)
+    if started is None:
+        return response
+    # Streamed bodies keep appending to this log; the request is recorded once the server has sent it all
+    statements = g.sql_log
+    route = request.endpoint or 'unmatched'
+    method, path, status = request.method, request.full_path.rstrip('?'), response.status_code
+    response.call_on_close(lambda: record_request_metrics(route, method, path, status,
+                                                          time.perf_counter() - started, statements))
+    return response
+
+def record_request_metrics(route, method, path, status, elapsed, statements):
+    sql_seconds = sum(record[1] for record in statements)
+
+    with metrics_lock:
+        stats = route_metrics.get(route)
+        if stats is None:
+            stats = route_metrics[route] = {'buckets': [0] * len(LATENCY_BUCKETS), 'count': 0, 'sum': 0.0,
+                                            'queries': 0, 'sql_seconds': 0.0, 'statuses': Counter()}
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if elapsed <= bound:
+                stats['buckets'][i] += 1
+        stats['count'] += 1
+        stats['sum'] += elapsed
+        stats['queries'] += len(statements)
+        stats['sql_seconds'] += sql_seconds
+        stats['statuses'][status] += 1
+
+    if elapsed >= app.config['SLOW_REQUEST_SECONDS']:
+        slowest = sorted(statements, key=lambda record: record[1], reverse=True)[:10]
+        slow_log.warning(json.dumps({
+            'time': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'route': route, 'method': method, 'path': path, 'status': status,
+            'seconds': round(elapsed, 4), 'queries': len(statements), 'sql_seconds': round(sql_seconds, 4),
+            'slowest': [{'sql': sql_template(sql), 'ms': round(seconds * 1000, 2), 'rows': rows}
+                        for sql, seconds, rows in slowest],
+        }))
+
+def setup_slow_log():
+    if app.config.get('SLOW_QUERY_LOG') and not slow_log.handlers:
+        handler = logging.FileHandler(app.config['SLOW_QUERY_LOG'], delay=True)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        slow_log.addHandler(handler)
+        slow_log.setLevel(logging.WARNING)
+        slow_log.propagate = False
+
+setup_slow_log()
+
+def prometheus_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def render_metrics():
+    """Formats the request, SQL and cache metrics of this process in Prometheus text format."""
+    with metrics_lock:
+        routes = {route: dict(stats, buckets=list(stats['buckets']), statuses=Counter(stats['statuses']))
+                  for route, stats in route_metrics.items()}
+        caches = Counter(cache_metrics)
+
+    lines = ['# HELP tracking_request_duration_seconds Request latency by route, including streamed bodies.',
+             '# TYPE tracking_request_duration_seconds histogram']
+    for route, stats in sorted(routes.items()):
+        label = prometheus_label(route)
+        for bound, count in zip(LATENCY_BUCKETS, stats['buckets']):
+            lines.append(f'tracking_request_duration_seconds_bucket{{route="{label}",le="{bound}"}} {count}')
+        lines.append(f'tracking_request_duration_seconds_bucket{{route="{label}",le="+Inf"}} {stats["count"]}')
+        lines.append(f'tracking_request_duration_seconds_sum{{route="{label}"}} {stats["sum"]:.6f}')
+        lines.append(f'tracking_request_duration_seconds_count{{route="{label}"}} {stats["count"]}')
+
+    lines += ['# HELP tracking_requests_total Requests by route and response status.',
+              '# TYPE tracking_requests_total counter']
+    for route, stats in sorted(routes.items()):
+        for status, count in sorted(stats['statuses'].items()):
+            lines.append(f'tracking_requests_total{{route="{prometheus_label(route)}",status="{status}"}} {count}')
+
+    lines += ['# HELP tracking_sql_queries_total SQL statements issued, by route.',
+              '# TYPE tracking_sql_queries_total counter']
+    for route, stats in sorted(routes.items()):
+        lines.append(f'tracking_sql_queries_total{{route="{prometheus_label(route)}"}} {stats["queries"]}')
+
+    lines += ['# HELP tracking_sql_seconds_total Time spent executing SQL and fetching rows, by route.',
+              '# TYPE tracking_sql_seconds_total counter']
+    for route, stats in sorted(routes.items()):
+        lines.append(f'tracking_sql_seconds_total{{route="{prometheus_label(route)}"}} {stats["sql_seconds"]:.6f}')
+
+    lines += ['# HELP tracking_cache_requests_total Cache lookups by cache and result.',
+              '# TYPE tracking_cache_requests_total counter']
+    for (cache, result), count in sorted(caches.items()):
+        lines.append(f'tracking_cache_requests_total{{cache="{cache}",result="{result}"}} {count}')
+
+    lines += ['# HELP tracking_cache_hit_ratio Share of lookups answered from each cache.',
+              '# TYPE tracking_cache_hit_ratio gauge']
+    for cache in sorted({cache for cache, _ in caches}):
+        total = caches[(cache, 'hit')] + caches[(cache, 'miss')]
+        lines.append(f'tracking_cache_hit_ratio{{cache="{cache}"}} {caches[(cache, "hit")] / total:.4f}')
+
+    return '\n'.join(lines) + '\n'
+
+# Result-set totals keyed by filter signature, tagged with the DataVersion they were counted at
+count_cache = OrderedDict()
+
+def get_data_version(conn, tables):
+    placeholders = ', '.join('?' for _ in tables)
+    rows = conn.execute(f"SELECT Name, Version FROM DataVersion WHERE Name IN ({placeholders})", list(tables)).fetchall()
+    versions = {row['Name']: row['Version'] for row in rows}
+    return tuple(versions.get(t, 0) for t in tables)
+
+def get_cached_count(conn, sql, params, tables=('Paper',)):
+    version = get_data_version(conn, tables)
+    key = (sql, tuple(params))
+
+    cached = count_cache.get(key)
+    record_cache('count', bool(cached and cached[0] == version))
+    if cached and cached[0] == version:
+        count_cache.move_to_end(key)
+        return cached[1]
+
+    total_count = conn.execute(f"SELECT COUNT(*) FROM ({sql})", params).fetchone()[0]
+    count_cache[key] = (version, total_count)
+    count_cache.move_to_end(key)
+    while len(count_cache) > COUNT_CACHE_SIZE:
+        count_cache.popitem(last=False)
+    return total_count
+
+def encode_cursor(row, sort_keys):
+    values = [row[column] for _, column in sort_keys]
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+def decode_cursor(token, sort_keys):
+    if not token:
+        return None
+    try:
+        values = json.loads(base64.urlsafe_b64decode(token.encode()))
+    except (ValueError, TypeError):
+        return None
+    if not isinstance(values, list) or len(values) != len(sort_keys):
+        return None
+    return values
+
+def paginate(sql, params, sort_keys, descending, page=1, per_page=10, count_tables=('Paper',)):
+    """
+    Runs a listing query one page at a time.
+
+    sort_keys is a list of (sql_expression, row_column) pairs ending in a unique
+    column. Next/previous links carry a cursor of the boundary row's sort keys so
+    the page is found with an index seek rather than an OFFSET scan; plain page
+    numbers still fall back to OFFSET. Totals come from the count cache.
+    """
+    params = list(params)
+    conn = get_db_connection()
+
+    total_count = get_cached_count(conn, sql, params, count_tables)
+    total_pages = ceil(total_count / per_page)
+
+    after = decode_cursor(request.args.get('after'), sort_keys)
+    before = decode_cursor(request.args.get('before'), sort_keys) if after is None else None
+
+    columns = ', '.join(expr for expr, _ in sort_keys)
+    placeholders = ', '.join('?' for _ in sort_keys)
+    forward = before is None
+    # Walking backwards flips both the comparison and the sort direction
+    ascending = (not descending) if forward else descending
+    direction = 'ASC' if ascending else 'DESC'
+    order_by = ', '.join(f"{expr} {direction}" for expr, _ in sort_keys)
+
+    if after is not None or before is not None:
+        sql += f" AND ({columns}) {'>' if ascending else '<'} ({placeholders})"
+        params.extend(after if forward else before)
+        sql += f" ORDER BY {order_by} LIMIT {per_page}"
+    else:
+        offset = (page - 1) * per_page
+        sql += f" ORDER BY {order_by} LIMIT {per_page} OFFSET {offset}"
+
+    papers = conn.execute(sql, params).fetchall()
+
+    if not forward:
+        papers.reverse()
+
+    cursors = {'next': None, 'prev': None}
+    if papers:
+        if page < total_pages:
+            cursors['next'] = encode_cursor(papers[-1], sort_keys)
+        if page > 1:
+            cursors['prev'] = encode_cursor(papers[0], sort_keys)
+
+    return papers, total_count, total_pages, page, cursors
+
+# Last DataVersion rows seen by this process; ETag checks are answered from here
+data_stamp = {'rows': None, 'checked': 0.0}
+
+def get_data_stamp(tables):
+    """Returns (versions, last_modified) for the named DataVersion counters."""
+    now = time.monotonic()
+    rows = data_stamp['rows']
+    stale = rows is None or now - data_stamp['checked'] > app.config['DATA_STAMP_TTL']
+    record_cache('data_stamp', not stale)
+    if stale:
+        conn = get_db_connection()
+        rows = {row['Name']: (row['Version'], row['UpdatedAt'])
+                for row in conn.execute("SELECT Name, Version, UpdatedAt FROM DataVersion")}
+        data_stamp['rows'] = rows
+        data_stamp['checked'] = now
+
+    versions = tuple(rows.get(t, (0, 0))[0] for t in tables)
+    updated_at = max([rows.get(t, (0, 0))[1] for t in tables] + [0])
+    return versions, datetime.fromtimestamp(updated_at, tz=timezone.utc)
+
+@app.after_request
+def expire_data_stamp(response):
+    # Any write made through this process makes the next ETag check re-read the counters
+    if request.method != 'GET':
+        data_stamp['rows'] = None
+    return response
+
+# Per-user profiles keyed by UserID, tagged with the Users DataVersion they were read at
+profile_cache = OrderedDict()
+
+def load_user_profile(conn, user_id):
+    row = conn.execute('''
+        SELECT i.Role,
+               COALESCE(a.AdminName, c.CoordinatorName, l.LecturerName, s.StudentName) as Name,
+               COALESCE(c.FacultyID, l.FacultyID, s.FacultyID) as FacultyID,
+               s.LecturerID, COALESCE(l.CoordinatorID, sl.CoordinatorID) as CoordinatorID
+        FROM UserIdentity i
+        LEFT JOIN Admin a ON i.Role = 'Admin' AND a.AdminID = i.UserID
+        LEFT JOIN ProgrammeCoordinator c ON i.Role = 'ProgrammeCoordinator' AND c.CoordinatorID = i.UserID
+        LEFT JOIN Lecturer l ON i.Role = 'Lecturer' AND l.LecturerID = i.UserID
+        LEFT JOIN Student s ON i.Role = 'Student' AND s.StudentID = i.UserID
+        LEFT JOIN Lecturer sl ON sl.LecturerID = s.LecturerID
+        WHERE i.UserID = ?
+    ''', (user_id,)).fetchone()
+    if row is None:
+        return None
+    return {'user_id': user_id, 'role': row['Role'], 'name': row['Name'], 'faculty_id': row['FacultyID'],
+            'lecturer_id': row['LecturerID'], 'coordinator_id': row['CoordinatorID']}
+
+def get_user_profile(user_id=None):
+    """
+    Returns the profile of a user (the caller by default): role table,
+    name, faculty and linked lecturer and coordinator, or None if there is
+    no such user. Profiles are served from memory; save_user drops the
+    ones it changes, and any change to the Users counter retires the rest,
+    so other processes catch up within DATA_STAMP_TTL.
+    """
+    user_id = user_id or session.get('user_id')
+    if not user_id:
+        return None
+
+    version = get_data_stamp(('Users',))[0]
+    cached = profile_cache.get(user_id)
+    record_cache('profile', bool(cached and cached[0] == version))
+    if cached and cached[0] == version:
+        profile_cache.move_to_end(user_id)
+        return cached[1]
+
+    profile = load_user_profile(get_db_connection(), user_id)
+    profile_cache[user_id] = (version, profile)
+    profile_cache.move_to_end(user_id)
+    while len(profile_cache) > PROFILE_CACHE_SIZE:
+        profile_cache.popitem(last=False)
+    return profile
+
+def conditional_on_data(*tables):
+    """
+    Gives a GET view a strong ETag built from the caller, the query string
+    and the DataVersion counters of the tables it reads. A matching
+    If-None-Match is answered with 304 before the view (or the database)
+    is touched.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            # Pending flash messages change the page, so those requests always render
+            if session.get('_flashes'):
+                return view(*args, **kwargs)
+
+            versions, last_modified = get_data_stamp(tables)
+            signature = json.dumps([request.endpoint, session.get('user_id'), session.get('role'),
+                                    sorted(request.args.items(multi=True)), versions])
+            etag = hashlib.sha256(signature.encode()).hexdigest()[:32]
+
+            not_modified = request.if_none_match.contains(etag)
+            record_cache('etag', not_modified)
+            if not_modified:
+                response = make_response('', 304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag)
+            response.last_modified = last_modified
+            # Pages are per user, so only the browser may keep them, and it must revalidate
+            response.headers['Cache-Control'] = 'private, no-cache'
+            return response
+        return wrapper
+    return decorator
+
+def get_user_paper_ids(conn, user_id):
+    rows = conn.execute("SELECT PaperID FROM Paper WHERE LecturerID = ? OR StudentID = ? OR CoordinatorID = ?",
+                        (user_id, user_id, user_id)).fetchall()
+    return [row['PaperID'] for row in rows]
+
+def adjust_paper_stats(conn, paper_ids, delta):
+    """
+    Adds delta (+1 / -1) for each paper to the PaperStats and AuthorStats rows
+    it currently counts towards. Writers call it with -1 before changing a paper
+    (or the users it is attributed to) and +1 afterwards, inside the same
+    transaction, so the summaries never drift from the Paper table.
+    """
+    paper_stats = Counter()
+    author_stats = Counter()
+    author_names = {}
+
+    paper_ids = list(paper_ids)
+    for i in range(0, len(paper_ids), 500):
+        chunk = paper_ids[i:i + 500]
+        placeholders = ', '.join('?' for _ in chunk)
+
+        papers = {}
+        for row in conn.execute(f'''
+            SELECT p.PaperID, p.PubYear, p.PaperType, p.Status,
+                   (SELECT group_concat(pf.FacultyID, ',') FROM PaperFaculty pf WHERE pf.PaperID = p.PaperID) as Faculties
+            FROM Paper p
+            WHERE p.PaperID IN ({placeholders})
+        ''', chunk):
+            faculties = {''} | set(row['Faculties'].split(',') if row['Faculties'] else [])
+            papers[row['PaperID']] = (row, faculties)
+            for f in faculties:
+                paper_stats[(f, row['PubYear'], row['PaperType'], row['Status'])] += delta
+
+        for author in conn.execute(f"SELECT PaperID, AuthorName, NormalizedName FROM PaperAuthor WHERE PaperID IN ({placeholders})", chunk):
+            row, faculties = papers[author['PaperID']]
+            if row['Status'] != 'Approved':
+                continue
+            for f in faculties:
+                key = (f, author['NormalizedName'], row['PubYear'])
+                author_stats[key] += delta
+                author_names.setdefault(key, author['AuthorName'])
+
+    conn.executemany('''
+        INSERT INTO PaperStats (FacultyID, PubYear, PaperType, Status, PaperCount) VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT (FacultyID, PubYear, PaperType, Status) DO UPDATE SET PaperCount = PaperCount + excluded.PaperCount
+    ''', [key + (count,) for key, count in paper_stats.items() if count])
+    conn.executemany('''
+        INSERT INTO AuthorStats (FacultyID, NormalizedName, PubYear, AuthorName, PaperCount) VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT (FacultyID, NormalizedName, PubYear) DO UPDATE SET PaperCount = PaperCount + excluded.PaperCount
+    ''', [key + (author_names[key], count) for key, count in author_stats.items() if count])
+
+def generate_cover_derivatives(cover_image):
+    """
+    Writes a thumbnail and a medium preview of an uploaded cover next to it,
+    under derived/, as WebP (or JPEG where Pillow lacks WebP). Returns their
+    paths relative to the upload folder, or (None, None) if they could not be
+    made, in which case pages fall back to the original image.
+    """
+    if Image is None or not cover_image:
+        return None, None
+
+    upload_folder = app.config['UPLOAD_FOLDER']
+    derived_folder = os.path.join(upload_folder, 'derived')
+    os.makedirs(derived_folder, exist_ok=True)
+
+    fmt, ext = ('WEBP', 'webp') if features.check('webp') else ('JPEG', 'jpg')
+    stem = os.path.splitext(os.path.basename(cover_image))[0]
+
+    try:
+        with Image.open(os.path.join(upload_folder, cover_image)) as img:
+            img = ImageOps.exif_transpose(img).convert('RGB')
+            paths = []
+            for width in [app.config['THUMBNAIL_WIDTH'], app.config['PREVIEW_WIDTH']]:
+                derived = img.copy()
+                derived.thumbnail((width, width * 4))
+                name = f"derived/{stem}_w{width}.{ext}"
+                derived.save(os.path.join(upload_folder, name), fmt, quality=80)
+                paths.append(name)
+    except (OSError, ValueError):
+        return None, None
+
+    return paths[0], paths[1]
+
+def sniff_image_type(header):
+    # Trust the file's magic bytes, not its name
+    if header.startswith(b'\x89PNG\r\n\x1a\n'):
+        return 'png'
+    if header.startswith(b'\xff\xd8\xff'):
+        return 'jpg'
+    return None
+
+def register_cover_blob(conn, temp_path, digest, ext, size):
+    """
+    Moves a hashed upload into the blob store unless identical content is
+    already stored, and returns (CoverImage, CoverThumb, CoverPreview).
+    The temp file is consumed either way.
+    """
+    upload_folder = app.config['UPLOAD_FOLDER']
+    existing = conn.execute("SELECT CoverImage, CoverThumb, CoverPreview FROM CoverBlob WHERE Hash = ?", (digest,)).fetchone()
+    if existing and os.path.exists(os.path.join(upload_folder, existing['CoverImage'])):
+        os.remove(temp_path)
+        return existing['CoverImage'], existing['CoverThumb'], existing['CoverPreview']
+
+    cover_image = f"blobs/{digest[:2]}/{digest}.{ext}"
+    os.makedirs(os.path.join(upload_folder, 'blobs', digest[:2]), exist_ok=True)
+    os.replace(temp_path, os.path.join(upload_folder, cover_image))
+    cover_thumb, cover_preview = generate_cover_derivatives(cover_image)
+
+    conn.execute('''
+        INSERT INTO CoverBlob (Hash, CoverImage, CoverThumb, CoverPreview, ByteSize, RefCount)
+        VALUES (?, ?, ?, ?, ?, (SELECT COUNT(*) FROM Paper WHERE CoverImage = ?))
+        ON CONFLICT (Hash) DO UPDATE SET CoverImage = excluded.CoverImage, CoverThumb = excluded.CoverThumb,
+                                         CoverPreview = excluded.CoverPreview, ByteSize = excluded.ByteSize
+    ''', (digest, cover_image, cover_thumb, cover_preview, size, cover_image))
+    return cover_image, cover_thumb, cover_preview
+
+def store_cover_upload(conn, stream):
+    """
+    Streams an uploaded cover to a temp file in the blob store while hashing
+    it, then stores it under its SHA-256. Raises ValueError if the content is
+    not a PNG or JPEG.
+    """
+    blob_root = os.path.join(app.config['UPLOAD_FOLDER'], 'blobs')
+    os.makedirs(blob_root, exist_ok=True)
+
+    sha = hashlib.sha256()
+    header = b''
+    size = 0
+    fd, temp_path = tempfile.mkstemp(dir=blob_root, suffix='.part')
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            while True:
+                chunk = stream.read(64 * 1024)
+                if not chunk:
+                    break
+                if len(header) < 16:
+                    header += chunk[:16 - len(header)]
+                sha.update(chunk)
+                out.write(chunk)
+                size += len(chunk)
+
+        ext = sniff_image_type(header)
+        if ext is None:
+            raise ValueError("Cover Page must be a PNG or JPEG image.")
+        return register_cover_blob(conn, temp_path, sha.hexdigest(), ext, size)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+def discard_unregistered_covers(conn, covers):
+    """
+    Deletes the files of (CoverImage, CoverThumb, CoverPreview) triples
+    that have no CoverBlob row, e.g. blobs stored by a transaction that was
+    then rolled back. Call after the rollback.
+    """
+    upload_folder = app.config['UPLOAD_FOLDER']
+    for cover_image, cover_thumb, cover_preview in covers:
+        if not cover_image or conn.execute("SELECT 1 FROM CoverBlob WHERE CoverImage = ?", (cover_image,)).fetchone():
+            continue
+        for path in [cover_image, cover_thumb, cover_preview]:
+            if path and os.path.exists(os.path.join(upload_folder, path)):
+                os.remove(os.path.join(upload_folder, path))
+
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+def build_match_query(search_query):
+    # Turn free text into an FTS5 query: every word must match as a prefix
+    terms = []
+    for term in search_query.split():
+        if any(ch.isalnum() for ch in term):
+            terms.append('"' + term.replace('"', '""') + '"*')
+    return ' '.join(terms)
+
 def clean_name(name):
     name = name.lower()
     for title in ["dr.", "prof.", "mr.", "ms.", "ir.", "ts."]:
         name = name.replace(title, "")
     return name.strip()
 
+def parse_year(value):
+    try:
+        return int(str(value).strip())
+    except ValueError:
+        return None
+
+def get_summary_year_type_counts(conn, faculty_id, year_filter=None):
+    year_sql = ""
+    params = [faculty_id]
+    if parse_year(year_filter):
+        year_sql = " AND PubYear = ?"
+        params.append(parse_year(year_filter))
+
+    years = {}
+    types = {}
+    for row in conn.execute(f'''
+        SELECT PubYear, PaperType, SUM(PaperCount) as Count FROM PaperStats
+        WHERE FacultyID = ?{year_sql}
+        GROUP BY PubYear, PaperType HAVING Count > 0
+        ORDER BY PubYear
+    ''', params):
+        years[str(row['PubYear'])] = years.get(str(row['PubYear']), 0) + row['Count']
+        types[row['PaperType']] = types.get(row['PaperType'], 0) + row['Count']
+    return years, types
+
+def get_faculty_counts(conn, year_filter=None):
+    # Papers count towards the faculties of their linked lecturer, student and coordinator
+    year_sql = ""
+    params = []
+    if parse_year(year_filter):
+        year_sql = " WHERE ps.PubYear = ?"
+        params.append(parse_year(year_filter))
+
+    return conn.execute(f'''
+        SELECT f.FacultyName, SUM(ps.PaperCount) as Count
+        FROM PaperStats ps
+        JOIN Faculty f ON f.FacultyID = ps.FacultyID{year_sql}
+        GROUP BY f.FacultyName
+        HAVING Count > 0
+    ''', params).fetchall()
+
+def iter_author_counts(conn, faculty_id=None, year_filter=None):
+    """
+    Papers per linked student and lecturer of a faculty, highest first, as
+    (Name, Count) rows. University-wide (no faculty) coordinators are
+    counted as well.
+    """
+    roles = [("u.StudentName || ' (Student)'", 'Student', 'StudentID'),
+             ('u.LecturerName', 'Lecturer', 'LecturerID')]
+    if faculty_id is None:
+        roles.append(('u.CoordinatorName', 'ProgrammeCoordinator', 'CoordinatorID'))
+
+    selects = []
+    params = []
+    for name, table, key in roles:
+        conditions = []
+        if faculty_id is not None:
+            conditions.append("u.FacultyID = ?")
+            params.append(faculty_id)
+        if parse_year(year_filter):
+            conditions.append("p.PubYear = ?")
+            params.append(parse_year(year_filter))
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        selects.append(f'''
+            SELECT {name} as Name, COUNT(p.PaperID) as Count
+            FROM Paper p
+            JOIN {table} u ON p.{key} = u.{key}{where}
+            GROUP BY Name
+        ''')
+
+    return conn.execute(' UNION ALL '.join(selects) + " ORDER BY Count DESC, Name", params)
+
+def iter_personal_papers(conn, user_id, year_filter=None):
+    year_sql = ""
+    params = [user_id]
+    if parse_year(year_filter):
+        year_sql = " AND p.PubYear = ?"
+        params.append(parse_year(year_filter))
+
+    return conn.execute(f'''
+        SELECT p.PaperTitle, p.Authors, p.DatePublished, p.PaperType FROM Paper p
+        WHERE p.PaperID IN (SELECT PaperID FROM PaperAuthor WHERE UserID = ?){year_sql}
+        ORDER BY p.DatePublished DESC
+    ''', params)
+
+def collect_leaders(rows, leaders, limit=10):
+    # Passes rows through untouched, keeping the first few for a chart drawn after the table
+    for row in rows:
+        if len(leaders) < limit:
+            leaders.append(row)
+        yield row
+
+def report_title(title, year_filter):
+    return f"{title} ({parse_year(year_filter)})" if parse_year(year_filter) else title
+
+def build_university_report(conn, year_filter):
+    years, types = get_summary_year_type_counts(conn, '', year_filter)
+    faculties = get_faculty_counts(conn, year_filter)
+    leaders = []
+
+    yield ('heading', report_title("University Publication Report", year_filter))
+    yield ('table', "Publications per Year", [('Year', 0.5), ('Total Publications', 0.5)], years.items())
+    yield ('chart', "Annual Trend", list(years.keys()), list(years.values()), '#3b82f6')
+    yield ('table', "Publication Types", [('Type', 0.5), ('Total Publications', 0.5)], types.items())
+    yield ('page',)
+    yield ('heading', "Faculty Breakdown")
+    yield ('table', "Publications per Faculty", [('Faculty', 0.5), ('Total Publications', 0.5)], faculties)
+    yield ('chart', "Faculty Comparison", [row['FacultyName'] for row in faculties], [row['Count'] for row in faculties], '#10b981')
+    yield ('page',)
+    yield ('heading', "User Performance")
+    yield ('table', "Publications per User", [('User Name', 0.75), ('Publications', 0.25)],
+           collect_leaders(iter_author_counts(conn, None, year_filter), leaders))
+    yield ('chart', "Top 10 Authors", [row['Name'] for row in leaders], [row['Count'] for row in leaders], '#f59e0b')
+
+def build_faculty_report(conn, faculty_id, year_filter):
+    years, types = get_summary_year_type_counts(conn, faculty_id, year_filter)
+    leaders = []
+
+    yield ('heading', report_title(f"Faculty Report: {faculty_id}", year_filter))
+    yield ('table', "Publications per Year", [('Year', 0.5), ('Total Publications', 0.5)], years.items())
+    yield ('table', "Publication Types", [('Type', 0.5), ('Total Publications', 0.5)], types.items())
+    yield ('table', "Contributors", [('Author Name', 0.75), ('Papers', 0.25)],
+           collect_leaders(iter_author_counts(conn, faculty_id, year_filter), leaders))
+    yield ('page',)
+    yield ('heading', "Faculty Performance Charts")
+    yield ('chart', "Papers per Year", list(years.keys()), list(years.values()), '#3b82f6')
+    yield ('chart', "Top Authors", [row['Name'] for row in leaders], [row['Count'] for row in leaders], '#10b981')
+
+def build_personal_report(conn, name, user_id, year_filter):
+    papers = ((p['DatePublished'][:4], p['PaperTitle'], p['Authors'], p['PaperType'])
+              for p in iter_personal_papers(conn, user_id, year_filter))
+
+    yield ('heading', report_title(f"Publication Record: {name}", year_filter))
+    yield ('table', "Publications", [('Year', 0.1), ('Title', 0.4), ('Authors', 0.33), ('Type', 0.17)], papers)
+
+def remove_stale_reports(folder, stem, keep):
+    for name in os.listdir(folder):
+        if name.startswith(stem + '-v') and name.endswith(os.path.splitext(keep)[1]) and name != keep:
+            try:
+                os.remove(os.path.join(folder, name))
+            except FileNotFoundError:
+                pass
+
+def send_report(fmt, scope, owner, year_filter, build):
+    """
+    Streams a report as PDF or CSV straight from the database. Finished
+    files are kept per (scope, year filter, data version), so repeat
+    downloads are served from disk until the data changes.
+    """
+    if fmt not in REPORT_FORMATS:
+        return jsonify({'error': 'Unknown report format'}), 404
+
+    conn = get_db_connection()
+    # One read transaction, so the version stamp and every row come from the same snapshot
+    conn.execute("BEGIN")
+    paper_version, user_version = get_data_version(conn, ('Paper', 'Users'))
+
+    folder = app.config['REPORT_CACHE_FOLDER']
+    stem = f"{scope}-{owner}-{parse_year(year_filter) or 'All'}"
+    cached_name = f"{stem}-v{paper_version}.{user_version}.{fmt}"
+    cached_path = os.path.join(folder, cached_name)
+    download_name = f"{stem}.{fmt}"
+
+    record_cache('report', os.path.exists(cached_path))
+    if os.path.exists(cached_path):
+        conn.rollback()
+        return send_file(cached_path, mimetype=REPORT_FORMATS[fmt], as_attachment=True, download_name=download_name)
+
+    os.makedirs(folder, exist_ok=True)
+    render = render_pdf if fmt == 'pdf' else render_csv
+
+    def generate():
+        fd, temp_path = tempfile.mkstemp(dir=folder, suffix='.part')
+        try:
+            with os.fdopen(fd, 'wb') as out:
+                for chunk in render(build(conn)):
+                    out.write(chunk)
+                    yield chunk
+            os.replace(temp_path, cached_path)
+            remove_stale_reports(folder, stem, cached_name)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            if conn.in_transaction:
+                conn.rollback()
+
+    return Response(stream_with_context(generate()), mimetype=REPORT_FORMATS[fmt],
+                    headers={'Content-Disposition': f'attachment; filename="{download_name}"'})
+
 @app.route('/admin/api/report-data')
+@conditional_on_data('Paper', 'Users')
 def get_report_data():
     if session.get('role') != 'admin':
         return jsonify({'error': 'Unauthorized'}), 403
 
     conn = get_db_connection()
     
-    # 1. Fetch ALL Papers for general stats
-    papers = conn.execute("SELECT * FROM Paper").fetchall()
-    
-    # --- University Stats ---
-    years = {}
-    types = {}
-    for p in papers:
-        y = p['DatePublished'][:4]
-        years[y] = years.get(y, 0) + 1
-        t = p['PaperType']
-        types[t] = types.get(t, 0) + 1
+    # --- University Stats (all statuses, from the summary table) ---
+    years, types = get_summary_year_type_counts(conn, '')
 
     # --- Faculty Stats ---
-    # We link papers to faculty via the uploader (Lecturer OR Student)
-    faculty_query = '''
-        SELECT f.FacultyName, COUNT(p.PaperID) as Count
-        FROM Paper p
-        LEFT JOIN Lecturer l ON p.LecturerID = l.LecturerID
-        LEFT JOIN Student s ON p.StudentID = s.StudentID
-        LEFT JOIN Faculty f ON (l.FacultyID = f.FacultyID OR s.FacultyID = f.FacultyID)
-        WHERE f.FacultyName IS NOT NULL
-        GROUP BY f.FacultyName
-    '''
-    faculty_rows = conn.execute(faculty_query).fetchall()
-    faculty_stats = {row['FacultyName']: row['Count'] for row in faculty_rows}
-
-    user_stats_list = []
-
-    # A. Student Counts
-    stu_rows = conn.execute('''
-        SELECT s.StudentName as Name, COUNT(p.PaperID) as Count 
-        FROM Paper p 
-        JOIN Student s ON p.StudentID = s.StudentID 
-        GROUP BY s.StudentName
-    ''').fetchall()
-    for row in stu_rows:
-        user_stats_list.append({'name': row['Name'] + " (Student)", 'count': row['Count']})
-
-    # B. Lecturer Counts
-    lec_rows = conn.execute('''
-        SELECT l.LecturerName as Name, COUNT(p.PaperID) as Count 
-        FROM Paper p 
-        JOIN Lecturer l ON p.LecturerID = l.LecturerID 
-        GROUP BY l.LecturerName
-    ''').fetchall()
-    for row in lec_rows:
-        # Check if name already exists (e.g. if we want to merge, but usually keeping them separate is safer)
-        user_stats_list.append({'name': row['Name'], 'count': row['Count']})
-
-    # C. Coordinator Counts
-    coord_rows = conn.execute('''
-        SELECT c.CoordinatorName as Name, COUNT(p.PaperID) as Count 
-        FROM Paper p 
-        JOIN ProgrammeCoordinator c ON p.CoordinatorID = c.CoordinatorID 
-        GROUP BY c.CoordinatorName
-    ''').fetchall()
-    for row in coord_rows:
-        user_stats_list.append({'name': row['Name'], 'count': row['Count']})
+    faculty_stats = {row['FacultyName']: row['Count'] for row in get_faculty_counts(conn)}
 
-    # Sort combined list by Count descending
-    user_stats_list.sort(key=lambda x: x['count'], reverse=True)
+    # --- Student, Lecturer and Coordinator Counts, highest first ---
+    user_stats_list = [{'name': row['Name'], 'count': row['Count']} for row in iter_author_counts(conn)]
 
-    conn.close()
 
     return jsonify({
         'university': {
@@ -123,6 +948,7 @@ def get_report_data():
     })
 
 @app.route('/coordinator/api/report-data')
+@conditional_on_data('Paper', 'Users')
 def get_coordinator_report_data():
     if session.get('role') != 'coordinator':
         return jsonify({'error': 'Unauthorized'}), 403
@@ -132,64 +958,22 @@ def get_coordinator_report_data():
     conn = get_db_connection()
     
     # Get Coordinator's Faculty
-    coord_row = conn.execute("SELECT FacultyID, CoordinatorName FROM ProgrammeCoordinator WHERE CoordinatorID = ?", (user_id,)).fetchone()
-    if not coord_row:
+    profile = get_user_profile(user_id)
+    if not profile or profile['role'] != 'ProgrammeCoordinator':
         return jsonify({'error': 'Coordinator not found'}), 404
     
-    faculty_id = coord_row['FacultyID']
-    coord_name = coord_row['CoordinatorName']
+    faculty_id = profile['faculty_id']
+    coord_name = profile['name']
 
     if mode == 'faculty':
         # --- FACULTY STATS MODE ---
         
-        # 1. General Stats (Annual & Types) for this Faculty
-        # We check if the uploader (Student or Lecturer) belongs to this faculty
-        query_general = '''
-            SELECT p.DatePublished, p.PaperType
-            FROM Paper p
-            LEFT JOIN Lecturer l ON p.LecturerID = l.LecturerID
-            LEFT JOIN Student s ON p.StudentID = s.StudentID
-            WHERE l.FacultyID = ? OR s.FacultyID = ?
-        '''
-        papers = conn.execute(query_general, (faculty_id, faculty_id)).fetchall()
-        
-        years = {}
-        types = {}
-        for p in papers:
-            y = p['DatePublished'][:4]
-            years[y] = years.get(y, 0) + 1
-            t = p['PaperType']
-            types[t] = types.get(t, 0) + 1
-
-        # 2. User Performance (FIXED: Include Students & Lecturers)
-        authors_list = []
-
-        # Count Student Papers in this Faculty
-        stu_query = '''
-            SELECT s.StudentName as Name, COUNT(p.PaperID) as Count
-            FROM Paper p
-            JOIN Student s ON p.StudentID = s.StudentID
-            WHERE s.FacultyID = ?
-            GROUP BY s.StudentName
-        '''
-        for row in conn.execute(stu_query, (faculty_id,)).fetchall():
-            authors_list.append({'name': row['Name'] + " (Student)", 'count': row['Count']})
+        # 1. General Stats (Annual & Types) for this Faculty, from the summary table
+        years, types = get_summary_year_type_counts(conn, faculty_id)
 
-        # Count Lecturer Papers in this Faculty
-        lec_query = '''
-            SELECT l.LecturerName as Name, COUNT(p.PaperID) as Count
-            FROM Paper p
-            JOIN Lecturer l ON p.LecturerID = l.LecturerID
-            WHERE l.FacultyID = ?
-            GROUP BY l.LecturerName
-        '''
-        for row in conn.execute(lec_query, (faculty_id,)).fetchall():
-            authors_list.append({'name': row['Name'], 'count': row['Count']})
-
-        # Sort by count descending
-        authors_list.sort(key=lambda x: x['count'], reverse=True)
+        # 2. User Performance (Students & Lecturers of this faculty, highest first)
+        authors_list = [{'name': row['Name'], 'count': row['Count']} for row in iter_author_counts(conn, faculty_id)]
 
-        conn.close()
         return jsonify({
             'mode': 'faculty',
             'faculty_id': faculty_id,
@@ -200,11 +984,8 @@ def get_coordinator_report_data():
 
     else:
         # --- PERSONAL MODE ---
-        query = "SELECT * FROM Paper WHERE CoordinatorID = ? ORDER BY DatePublished DESC"
-        papers = conn.execute(query, (user_id,)).fetchall()
-        
         paper_list = []
-        for p in papers:
+        for p in iter_personal_papers(conn, user_id):
             paper_list.append({
                 'title': p['PaperTitle'],
                 'authors': p['Authors'], # Includes co-authors string
@@ -212,7 +993,6 @@ def get_coordinator_report_data():
                 'type': p['PaperType']
             })
             
-        conn.close()
         return jsonify({
             'mode': 'personal',
             'name': coord_name,
@@ -220,6 +1000,7 @@ def get_coordinator_report_data():
         })
 
 @app.route('/academic/api/report-data')
+@conditional_on_data('Paper', 'Users')
 def get_academic_report_data():
     role = session.get('role')
     if role not in ['lecturer', 'student']:
@@ -229,20 +1010,12 @@ def get_academic_report_data():
     conn = get_db_connection()
 
     # 1. Get User Name & Query
-    if role == 'lecturer':
-        name_row = conn.execute("SELECT LecturerName FROM Lecturer WHERE LecturerID = ?", (user_id,)).fetchone()
-        name = name_row['LecturerName'] if name_row else "Unknown"
-        query = "SELECT * FROM Paper WHERE LecturerID = ? ORDER BY DatePublished DESC"
-    else:
-        name_row = conn.execute("SELECT StudentName FROM Student WHERE StudentID = ?", (user_id,)).fetchone()
-        name = name_row['StudentName'] if name_row else "Unknown"
-        query = "SELECT * FROM Paper WHERE StudentID = ? ORDER BY DatePublished DESC"
-
-    # 2. Fetch Papers
-    papers = conn.execute(query, (user_id,)).fetchall()
+    profile = get_user_profile(user_id)
+    name = profile['name'] if profile else "Unknown"
 
+    # 2. Stream Papers
     paper_list = []
-    for p in papers:
+    for p in iter_personal_papers(conn, user_id):
         paper_list.append({
             'title': p['PaperTitle'],
             'authors': p['Authors'],
@@ -250,30 +1023,230 @@ def get_academic_report_data():
             'type': p['PaperType']
         })
 
-    conn.close()
     return jsonify({
         'name': name,
         'papers': paper_list
     })
 
+@app.route('/admin/report/<fmt>')
+def admin_report(fmt):
+    if session.get('role') != 'admin':
+        return jsonify({'error': 'Unauthorized'}), 403
+
+    year_filter = request.args.get('year', 'All')
+    faculty_id = request.args.get('faculty', '')
+
+    if faculty_id:
+        conn = get_db_connection()
+        if not conn.execute("SELECT 1 FROM Faculty WHERE FacultyID = ?", (faculty_id,)).fetchone():
+            return jsonify({'error': 'Faculty not found'}), 404
+        return send_report(fmt, 'faculty', faculty_id, year_filter,
+                           lambda conn: build_faculty_report(conn, faculty_id, year_filter))
+
+    return send_report(fmt, 'university', 'all', year_filter,
+                       lambda conn: build_university_report(conn, year_filter))
+
+@app.route('/coordinator/report/<fmt>')
+def coordinator_report(fmt):
+    if session.get('role') != 'coordinator':
+        return jsonify({'error': 'Unauthorized'}), 403
+
+    mode = request.args.get('mode', 'faculty')
+    year_filter = request.args.get('year', 'All')
+    user_id = session.get('user_id')
+
+    profile = get_user_profile(user_id)
+    if not profile or profile['role'] != 'ProgrammeCoordinator':
+        return jsonify({'error': 'Coordinator not found'}), 404
+
+    if mode == 'faculty':
+        faculty_id = profile['faculty_id']
+        return send_report(fmt, 'faculty', faculty_id, year_filter,
+                           lambda conn: build_faculty_report(conn, faculty_id, year_filter))
+
+    name = profile['name']
+    return send_report(fmt, 'personal', user_id, year_filter,
+                       lambda conn: build_personal_report(conn, name, user_id, year_filter))
+
+@app.route('/academic/report/<fmt>')
+def academic_report(fmt):
+    role = session.get('role')
+    if role not in ['lecturer', 'student']:
+        return jsonify({'error': 'Unauthorized'}), 403
+
+    year_filter = request.args.get('year', 'All')
+    user_id = session.get('user_id')
+
+    profile = get_user_profile(user_id)
+    name = profile['name'] if profile else "Unknown"
+
+    return send_report(fmt, 'personal', user_id, year_filter,
+                       lambda conn: build_personal_report(conn, name, user_id, year_filter))
+
+def parse_since(value):
+    # ModifiedAt is stored as UTC 'YYYY-MM-DD HH:MM:SS'; accept any ISO date or datetime
+    try:
+        since = datetime.fromisoformat(value.strip().replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if since.tzinfo:
+        since = since.astimezone(timezone.utc).replace(tzinfo=None)
+    return since.strftime('%Y-%m-%d %H:%M:%S')
+
+def query_paper_export(conn, filters, since=None):
+    """
+    Runs the catalogue export and returns (watermark, cursor). Each row
+    carries the uploader (linked lecturer, student, coordinator or admin)
+    and the uploader's faculty. The watermark is the database clock when
+    the export started; passing it back as `since` picks up every paper
+    changed after this run.
+    """
+    base_query = "SELECT * FROM Paper WHERE 1=1"
+    base_params = []
+    if since:
+        base_query += " AND ModifiedAt >= ?"
+        base_params.append(since)
+    sql, params, _ = apply_paper_filters(base_query, base_params, filters)
+
+    watermark = conn.execute("SELECT datetime('now')").fetchone()[0]
+    cursor = conn.execute(f'''
+        SELECT q.PaperID, q.PaperTitle, q.Authors, q.DOI, q.DatePublished, q.PaperType, q.Status,
+               q.LinkToPaper, q.DateRequest, q.ModifiedAt,
+               COALESCE(l.LecturerID, s.StudentID, c.CoordinatorID, a.AdminID) as UploaderID,
+               COALESCE(l.LecturerName, s.StudentName, c.CoordinatorName, a.AdminName) as UploaderName,
+               f.FacultyName
+        FROM ({sql}) q
+        LEFT JOIN Lecturer l ON l.LecturerID = q.LecturerID
+        LEFT JOIN Student s ON s.StudentID = q.StudentID
+        LEFT JOIN ProgrammeCoordinator c ON c.CoordinatorID = q.CoordinatorID
+        LEFT JOIN Admin a ON a.AdminID = q.AdminID
+        LEFT JOIN Faculty f ON f.FacultyID = COALESCE(l.FacultyID, s.FacultyID, c.FacultyID)
+        ORDER BY q.ModifiedAt, q.PaperID
+    ''', params)
+    return watermark, cursor
+
+def bibtex_entries(rows):
+    for row in rows:
+        fields = [
+            ('title', row['PaperTitle']),
+            ('author', ' and '.join(split_author_names(row['Authors'] or ''))),
+            ('year', row['DatePublished'][:4]),
+            ('date', row['DatePublished']),
+            ('doi', row['DOI']),
+            ('url', row['LinkToPaper']),
+            ('status', row['Status']),
+            ('uploader', row['UploaderName']),
+            ('faculty', row['FacultyName']),
+        ]
+        yield BIBTEX_TYPES.get(row['PaperType'], 'misc'), row['PaperID'], fields
+
+def render_paper_export(fmt, cursor):
+    columns = [column[0] for column in cursor.description]
+    if fmt == 'ndjson':
+        return render_ndjson(columns, cursor)
+    if fmt == 'bibtex':
+        return render_bibtex(bibtex_entries(cursor))
+    return render_rows_csv(columns, cursor)
+
+@app.route('/admin/export')
+def admin_export():
+    if session.get('role') != 'admin':
+        return jsonify({'error': 'Unauthorized'}), 403
+
+    fmt = request.args.get('format', 'csv')
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({'error': 'Unknown export format'}), 400
+
+    since = None
+    if request.args.get('since'):
+        since = parse_since(request.args['since'])
+        if since is None:
+            return jsonify({'error': 'since must be an ISO date or datetime'}), 400
+
+    conn = get_db_connection()
+    # One read transaction, so the rows and the watermark come from the same snapshot
+    conn.execute("BEGIN")
+    watermark, cursor = query_paper_export(conn, request.args, since)
+
+    def generate():
+        try:
+            yield from render_paper_export(fmt, cursor)
+        finally:
+            cursor.close()
+            if conn.in_transaction:
+                conn.rollback()
+
+    mimetype, extension = EXPORT_FORMATS[fmt]
+    return Response(stream_with_context(generate()), mimetype=mimetype, headers={
+        'Content-Disposition': f'attachment; filename="papers.{extension}"',
+        'X-Export-Watermark': watermark,
+    })
+
+# Public search pages (paper IDs, total, page count and cursors) shared by every caller,
+# tagged with the search generation and the time they were stored
+search_cache = OrderedDict()
+search_generation = {'value': 0}
+
+def bump_search_generation():
+    """Retires every cached search page. Called by the writers that change which papers search returns."""
+    search_generation['value'] += 1
+
+def with_bookmark_flags(conn, papers, user_id):
+    """Copies the rows into dicts with IsBookmarked set for user_id, using one indexed lookup for the page."""
+    paper_ids = [row['PaperID'] for row in papers]
+    marked = set()
+    if paper_ids and user_id:
+        placeholders = ', '.join('?' for _ in paper_ids)
+        marked = {row['PaperID'] for row in conn.execute(
+            f"SELECT PaperID FROM Bookmarks WHERE UserID = ? AND PaperID IN ({placeholders})", [user_id] + paper_ids)}
+    return [dict(row, IsBookmarked=1 if row['PaperID'] in marked else 0) for row in papers]
+
 def get_public_search_results(user_id, page=1, per_page=10):
     search_query = request.args.get('query', '').strip()
     filter_type = request.args.get('filter_type', '')
     filter_year = request.args.get('filter_year', '')
 
-    sql = '''
-        SELECT p.*, 
-        CASE WHEN b.PaperID IS NOT NULL THEN 1 ELSE 0 END as IsBookmarked
-        FROM Paper p
-        LEFT JOIN Bookmarks b ON p.PaperID = b.PaperID AND b.UserID = ?
-        WHERE p.Status = 'Approved'
-    '''
-    params = [user_id]
-    
-    # 1. Search Logic
-    if search_query:
-        sql += " AND (p.PaperTitle LIKE ? OR p.Authors LIKE ?)"
-        params.extend([f"%{search_query}%", f"%{search_query}%"])
+    match_query = build_match_query(search_query)
+    conn = get_db_connection()
+
+    # The page is the same for every caller; FTS matching ignores case, so neither is part of the key
+    key = (match_query.lower(), filter_type, parse_year(filter_year) if filter_year else None, page, per_page,
+           request.args.get('after') or None, request.args.get('before') or None)
+    now = time.monotonic()
+    cached = search_cache.get(key)
+    fresh = bool(cached and cached[0] == search_generation['value']
+                 and now - cached[1] <= app.config['SEARCH_CACHE_TTL'])
+    record_cache('search', fresh)
+    if fresh:
+        search_cache.move_to_end(key)
+        paper_ids, total, pages, current, cursors = cached[2]
+        papers = []
+        if paper_ids:
+            placeholders = ', '.join('?' for _ in paper_ids)
+            rows = {row['PaperID']: row for row in conn.execute(
+                f"SELECT * FROM Paper WHERE PaperID IN ({placeholders}) AND Status = 'Approved'", paper_ids)}
+            papers = [rows[paper_id] for paper_id in paper_ids if paper_id in rows]
+        return with_bookmark_flags(conn, papers, user_id), total, pages, current, cursors
+
+    # Read before querying, so a write that lands meanwhile leaves this entry already stale
+    generation = search_generation['value']
+
+    # 1. Search Logic (full-text index, ranked by BM25)
+    if match_query:
+        sql = '''
+            SELECT p.*, fts.rank AS SearchRank
+            FROM PaperSearch fts
+            JOIN Paper p ON p.PaperID = fts.PaperID
+            WHERE PaperSearch MATCH ? AND p.Status = 'Approved'
+        '''
+        params = [match_query]
+    else:
+        sql = '''
+            SELECT p.*
+            FROM Paper p
+            WHERE p.Status = 'Approved'
+        '''
+        params = []
 
     # 2. Filter Logic
     if filter_type:
@@ -281,107 +1254,347 @@ def get_public_search_results(user_id, page=1, per_page=10):
         params.append(filter_type)
         
     if filter_year:
-        sql += " AND substr(p.DatePublished, 1, 4) = ?" 
-        params.append(filter_year)
-
-    # 3. Pagination
-    conn = get_db_connection()
-    count_sql = f"SELECT COUNT(*) FROM ({sql})"
-    total_count = conn.execute(count_sql, params).fetchone()[0]
-    total_pages = ceil(total_count / per_page)
-    
-    offset = (page - 1) * per_page
-    sql += f" LIMIT {per_page} OFFSET {offset}"
-    
-    papers = conn.execute(sql, params).fetchall()
-    conn.close()
-    
-    return papers, total_count, total_pages, page
+        sql += " AND p.PubYear = ?" 
+        params.append(parse_year(filter_year))
 
-def generate_new_user_id(role, faculty_id):
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    prefix_map = {
-        'Student': ('STU', 'Student'),
-        'Lecturer': ('LEC', 'Lecturer'),
-        'ProgrammeCoordinator': ('COO', 'ProgrammeCoordinator'),
-        'Admin': ('ADM', 'Admin')
-    }
-    
-    prefix, table = prefix_map.get(role)
-    
-    query = f"SELECT {table}ID FROM {table} WHERE {table}ID LIKE ?"
-    cursor.execute(query, (f"{prefix}-{faculty_id}-%",))
-    existing_ids = [row[0] for row in cursor.fetchall()]
-    conn.close()
+    # 3. Pagination (relevance order for searches, newest first otherwise)
+    if match_query:
+        result = paginate(sql, params, [('fts.rank', 'SearchRank'), ('p.PaperID', 'PaperID')], False, page, per_page)
+    else:
+        result = paginate(sql, params, [('p.DatePublished', 'DatePublished'), ('p.PaperID', 'PaperID')], True, page, per_page)
+    papers, total, pages, current, cursors = result
+
+    search_cache[key] = (generation, now, ([row['PaperID'] for row in papers], total, pages, current, cursors))
+    search_cache.move_to_end(key)
+    while len(search_cache) > SEARCH_CACHE_SIZE:
+        search_cache.popitem(last=False)
+    return with_bookmark_flags(conn, papers, user_id), total, pages, current, cursors
+
+# Prefix index behind the search box typeahead: lowercase keys kept sorted for bisect, with a
+# parallel list of (kind, label, PaperID) entries. Built in a background thread on first use.
+typeahead = {'keys': None, 'entries': None, 'built': 0.0, 'building': False, 'pending': None}
+typeahead_lock = threading.Lock()
+
+def typeahead_key(text):
+    return ' '.join(text.lower().split())
+
+def typeahead_name_entries(name):
+    # Indexed from every word, so "Dr. Siti Aminah" is found by "dr", "siti" and "ami"
+    words = typeahead_key(name).split(' ')
+    return [(' '.join(words[i:]), ('author', name, None)) for i in range(len(words)) if words[i]]
+
+def typeahead_paper_entries(row):
+    entries = []
+    if row['PaperTitle']:
+        entries.append((typeahead_key(row['PaperTitle']), ('title', row['PaperTitle'], row['PaperID'])))
+    if row['DOI']:
+        entries.append((typeahead_key(row['DOI']), ('doi', row['DOI'], row['PaperID'])))
+    return entries
+
+def build_typeahead(conn, limit):
+    """
+    Collects up to `limit` index entries: user and author names first, then
+    approved papers newest first. Returns (keys, entries) sorted by key.
+    """
+    pairs = []
+    for row in conn.execute('''
+        SELECT LecturerName AS Name FROM Lecturer
+        UNION SELECT CoordinatorName FROM ProgrammeCoordinator
+        UNION SELECT StudentName FROM Student
+        UNION SELECT pa.AuthorName FROM PaperAuthor pa JOIN Paper p ON p.PaperID = pa.PaperID WHERE p.Status = 'Approved'
+    '''):
+        pairs.extend(typeahead_name_entries(row['Name']))
+        if len(pairs) >= limit:
+            break
 
-    max_num = 0
-    for eid in existing_ids:
+    if len(pairs) < limit:
+        for row in conn.execute('''
+            SELECT PaperID, PaperTitle, DOI FROM Paper WHERE Status = 'Approved'
+            ORDER BY DatePublished DESC, PaperID DESC
+        '''):
+            pairs.extend(typeahead_paper_entries(row))
+            if len(pairs) >= limit:
+                break
+
+    pairs = pairs[:limit]
+    pairs.sort(key=lambda pair: pair[0])
+    return [key for key, _ in pairs], [entry for _, entry in pairs]
+
+def rebuild_typeahead():
+    keys = entries = None
+    try:
+        conn = open_db_connection()
         try:
-            parts = eid.split('-')
-            if len(parts) == 3:
-                num = int(parts[2])
-                if num > max_num: max_num = num
-        except:
-            continue
-            
-    new_num = max_num + 1
-    return f"{prefix}-{faculty_id}-{str(new_num).zfill(2)}"
-
-def get_analytics_data(user_role, user_id=None, faculty_id=None, year_filter=None):
-    conn = get_db_connection()
-    papers = []
-
-    if user_role == 'admin':
-        if faculty_id:
-             papers = conn.execute('''
-                SELECT p.* FROM Paper p
-                LEFT JOIN Lecturer l ON p.LecturerID = l.LecturerID
-                LEFT JOIN Student s ON p.StudentID = s.StudentID
-                WHERE p.Status = 'Approved' AND (l.FacultyID = ? OR s.FacultyID = ?)
-             ''', (faculty_id, faculty_id)).fetchall()
+            # Headroom so incremental additions do not overflow the cap straight away
+            keys, entries = build_typeahead(conn, app.config['TYPEAHEAD_MAX_ENTRIES'] * 9 // 10)
+        finally:
+            conn.close()
+    except Exception:
+        app.logger.exception("Building the typeahead index failed")
+    finally:
+        with typeahead_lock:
+            if keys is not None:
+                typeahead.update(keys=keys, entries=entries, built=time.monotonic())
+                # Writes that landed while the build was reading are replayed on top
+                for changes in typeahead['pending']:
+                    apply_typeahead_changes(changes)
+            # Cleared even when the build failed, so the next lookup tries again
+            typeahead.update(building=False, pending=None)
+
+def ensure_typeahead():
+    """Starts a background (re)build if there is no index yet or it is older than TYPEAHEAD_MAX_AGE."""
+    with typeahead_lock:
+        if typeahead['building']:
+            return
+        if typeahead['keys'] is not None and time.monotonic() - typeahead['built'] < app.config['TYPEAHEAD_MAX_AGE']:
+            return
+        typeahead['building'] = True
+        typeahead['pending'] = []
+    threading.Thread(target=rebuild_typeahead, name='typeahead-build', daemon=True).start()
+
+def apply_typeahead_changes(changes):
+    """
+    Applies a batch of ('add' | 'remove', key, entry) changes by splicing the
+    sorted lists once and swapping them in. The published lists are never
+    modified in place, so lookups can scan them outside the lock.
+    Caller holds typeahead_lock.
+    """
+    keys, entries = typeahead['keys'], typeahead['entries']
+    if keys is None:
+        return
+
+    # Only the last change to each entry counts (a re-approval removes then re-adds its title)
+    final = {}
+    for action, key, entry in changes:
+        final[(key, entry)] = action
+
+    edits = []
+    for (key, entry), action in final.items():
+        i = bisect.bisect_left(keys, key)
+        while i < len(keys) and keys[i] == key and entries[i] != entry:
+            i += 1
+        present = i < len(keys) and keys[i] == key
+        if action == 'remove' and present:
+            edits.append((i, 1, key, entry))
+        elif action == 'add' and not present:
+            edits.append((i, 0, key, entry))
+    if not edits:
+        return
+
+    # Insertions at a position go before the existing entry there, which a removal then skips
+    edits.sort(key=lambda edit: edit[:3])
+    new_keys, new_entries = [], []
+    position = 0
+    for i, removal, key, entry in edits:
+        new_keys += keys[position:i]
+        new_entries += entries[position:i]
+        position = i
+        if removal:
+            position += 1
         else:
-             papers = conn.execute("SELECT * FROM Paper WHERE Status = 'Approved'").fetchall()
+            new_keys.append(key)
+            new_entries.append(entry)
+    new_keys += keys[position:]
+    new_entries += entries[position:]
+
+    if len(new_keys) > app.config['TYPEAHEAD_MAX_ENTRIES']:
+        # Dropped rather than trimmed; the next lookup rebuilds it newest first
+        typeahead.update(keys=None, entries=None)
+    else:
+        typeahead.update(keys=new_keys, entries=new_entries)
 
-    elif user_role == 'coordinator':
-        if faculty_id == 'personal':
-             papers = conn.execute("SELECT * FROM Paper WHERE Status = 'Approved' AND CoordinatorID = ?", (user_id,)).fetchall()
+def refresh_typeahead(conn, paper_ids):
+    """
+    Re-indexes papers after a write: their title and DOI entries are removed
+    and, for those now Approved, added back together with their author names.
+    Author names that no user and no other approved paper still carries are
+    removed. Does nothing until the index has been built.
+    """
+    with typeahead_lock:
+        if typeahead['keys'] is None and not typeahead['building']:
+            return
+
+    changes = []
+    paper_ids = list(paper_ids)
+    for i in range(0, len(paper_ids), 500):
+        chunk = paper_ids[i:i + 500]
+        placeholders = ', '.join('?' for _ in chunk)
+        approved, withdrawn = [], []
+        for row in conn.execute(f"SELECT PaperID, PaperTitle, DOI, Status FROM Paper WHERE PaperID IN ({placeholders})", chunk):
+            paper_entries = typeahead_paper_entries(row)
+            changes.extend(('remove', key, entry) for key, entry in paper_entries)
+            if row['Status'] == 'Approved':
+                changes.extend(('add', key, entry) for key, entry in paper_entries)
+                approved.append(row['PaperID'])
+            else:
+                withdrawn.append(row['PaperID'])
+        if approved:
+            placeholders = ', '.join('?' for _ in approved)
+            for row in conn.execute(f"SELECT DISTINCT AuthorName FROM PaperAuthor WHERE PaperID IN ({placeholders})", approved):
+                changes.extend(('add', key, entry) for key, entry in typeahead_name_entries(row['AuthorName']))
+        if withdrawn:
+            placeholders = ', '.join('?' for _ in withdrawn)
+            for row in conn.execute(f'''
+                SELECT DISTINCT pa.AuthorName FROM PaperAuthor pa
+                WHERE pa.PaperID IN ({placeholders})
+                AND NOT EXISTS (
+                    SELECT 1 FROM PaperAuthor other JOIN Paper p ON p.PaperID = other.PaperID
+                    WHERE other.NormalizedName = pa.NormalizedName AND other.AuthorName = pa.AuthorName
+                    AND p.Status = 'Approved'
+                )
+                AND NOT EXISTS (
+                    SELECT 1 FROM AuthorLookup al
+                    LEFT JOIN Lecturer l ON l.LecturerID = al.UserID
+                    LEFT JOIN ProgrammeCoordinator pc ON pc.CoordinatorID = al.UserID
+                    LEFT JOIN Student s ON s.StudentID = al.UserID
+                    WHERE al.NormalizedName = pa.NormalizedName
+                    AND pa.AuthorName IN (l.LecturerName, pc.CoordinatorName, s.StudentName)
+                )
+            ''', withdrawn):
+                changes.extend(('remove', key, entry) for key, entry in typeahead_name_entries(row['AuthorName']))
+
+    with typeahead_lock:
+        if typeahead['building']:
+            typeahead['pending'].append(changes)
         else:
-             coord = conn.execute("SELECT FacultyID FROM ProgrammeCoordinator WHERE CoordinatorID = ?", (user_id,)).fetchone()
-             f_id = coord['FacultyID']
-             papers = conn.execute('''
-                SELECT DISTINCT p.* FROM Paper p
-                LEFT JOIN Lecturer l ON p.LecturerID = l.LecturerID
-                LEFT JOIN Student s ON p.StudentID = s.StudentID
-                LEFT JOIN ProgrammeCoordinator c ON p.CoordinatorID = c.CoordinatorID
-                WHERE p.Status = 'Approved' AND (l.FacultyID = ? OR s.FacultyID = ? OR c.FacultyID = ?)
-             ''', (f_id, f_id, f_id)).fetchall()
+            apply_typeahead_changes(changes)
 
-    elif user_role == 'academic':
-        papers = conn.execute("SELECT * FROM Paper WHERE Status = 'Approved' AND (LecturerID = ? OR StudentID = ?)", (user_id, user_id)).fetchall()
+def typeahead_suggestions(query, limit=TYPEAHEAD_LIMIT):
+    """
+    Up to `limit` suggestions whose title, DOI or author name starts with
+    the query: a few authors first, then titles, then DOIs. Returns None
+    while the index is still being built.
+    """
+    key = typeahead_key(query)
+    matches = {'author': [], 'title': [], 'doi': []}
+    seen = set()
+    with typeahead_lock:
+        keys, entries = typeahead['keys'], typeahead['entries']
+    if keys is None:
+        return None
+    i = bisect.bisect_left(keys, key)
+    # A bounded window keeps very short prefixes as cheap as long ones
+    for i in range(i, min(i + limit * 25, len(keys))):
+        if not keys[i].startswith(key):
+            break
+        kind, label, paper_id = entries[i]
+        if (kind, label) in seen or len(matches[kind]) >= limit:
+            continue
+        seen.add((kind, label))
+        matches[kind].append({'type': kind, 'label': label, 'paper_id': paper_id})
+
+    suggestions = matches['author'][:3]
+    for kind in ['title', 'doi', 'author']:
+        suggestions.extend(s for s in matches[kind] if s not in suggestions)
+    return suggestions[:limit]
+
+@app.route('/api/typeahead')
+def typeahead_suggest():
+    if not session.get('user_id'):
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    query = request.args.get('q', '')
+    if len(typeahead_key(query)) < 2:
+        return jsonify({'suggestions': []})
+
+    ensure_typeahead()
+    suggestions = typeahead_suggestions(query)
+    if suggestions is None:
+        return jsonify({'suggestions': [], 'building': True})
+    return jsonify({'suggestions': suggestions})
+
+def format_user_id(role, faculty_id, number):
+    # At least two digits, matching the IDs issued so far
+    return f"{USER_ROLES[role][0]}-{faculty_id}-{number:02d}"
+
+def reserve_user_ids(conn, role, faculty_id, count=1):
+    """
+    Reserves the next `count` numbers of the role/faculty sequence with one
+    atomic increment and returns their IDs. Call it on the connection that
+    inserts the users, inside the same transaction: the increment takes the
+    write lock, so concurrent admins queue rather than share a number, and
+    a rollback hands the block back.
+    """
+    last = conn.execute('''
+        INSERT INTO UserSequence (Role, FacultyID, LastNumber) VALUES (?, ?, ?)
+        ON CONFLICT (Role, FacultyID) DO UPDATE SET LastNumber = LastNumber + excluded.LastNumber
+        RETURNING LastNumber
+    ''', (role, faculty_id, count)).fetchone()[0]
+    return [format_user_id(role, faculty_id, number) for number in range(last - count + 1, last + 1)]
+
+def get_summary_analytics(conn, faculty_id, year_filter=None):
+    # Dashboards over a whole faculty (or the university, faculty '') read the summary tables
+    year_sql = ""
+    params = [faculty_id]
+    if year_filter and year_filter != 'All':
+        year_sql = " AND PubYear = ?"
+        params.append(parse_year(year_filter))
 
-    conn.close()
+    annual_counts = {}
+    type_counts = {}
+    for row in conn.execute(f'''
+        SELECT PubYear, PaperType, SUM(PaperCount) as Count FROM PaperStats
+        WHERE FacultyID = ? AND Status = 'Approved'{year_sql}
+        GROUP BY PubYear, PaperType HAVING Count > 0
+    ''', params):
+        annual_counts[str(row['PubYear'])] = annual_counts.get(str(row['PubYear']), 0) + row['Count']
+        type_counts[row['PaperType']] = type_counts.get(row['PaperType'], 0) + row['Count']
+
+    top_authors = conn.execute(f'''
+        SELECT MIN(AuthorName) as Name, SUM(PaperCount) as Count FROM AuthorStats
+        WHERE FacultyID = ?{year_sql}
+        GROUP BY NormalizedName HAVING Count > 0
+        ORDER BY Count DESC, Name LIMIT 5
+    ''', params).fetchall()
+
+    return annual_counts, type_counts, top_authors
+
+def get_personal_analytics(conn, user_id, year_filter=None):
+    # Personal dashboards only touch the caller's own papers, aggregated in SQL
+    scope = "p.Status = 'Approved' AND p.PaperID IN (SELECT PaperID FROM PaperAuthor WHERE UserID = ?)"
+    params = [user_id]
+    if year_filter and year_filter != 'All':
+        scope += " AND p.PubYear = ?"
+        params.append(parse_year(year_filter))
 
     annual_counts = {}
     type_counts = {}
-    author_counts = Counter()
+    for row in conn.execute(f'''
+        SELECT p.PubYear, p.PaperType, COUNT(*) as Count
+        FROM Paper p
+        WHERE {scope}
+        GROUP BY PubYear, p.PaperType
+    ''', params):
+        annual_counts[str(row['PubYear'])] = annual_counts.get(str(row['PubYear']), 0) + row['Count']
+        type_counts[row['PaperType']] = type_counts.get(row['PaperType'], 0) + row['Count']
+
+    top_authors = conn.execute(f'''
+        SELECT MIN(pa.AuthorName) as Name, COUNT(*) as Count
+        FROM PaperAuthor pa
+        JOIN Paper p ON p.PaperID = pa.PaperID
+        WHERE {scope}
+        GROUP BY pa.NormalizedName
+        ORDER BY Count DESC, Name LIMIT 5
+    ''', params).fetchall()
+
+    return annual_counts, type_counts, top_authors
 
-    for p in papers:
-        year = p['DatePublished'][:4]
-        
-        if year_filter and year_filter != 'All' and year != str(year_filter):
-            continue
+def get_analytics_data(user_role, user_id=None, faculty_id=None, year_filter=None):
+    conn = get_db_connection()
+    summary_faculty = None
 
-        annual_counts[year] = annual_counts.get(year, 0) + 1
-        
-        p_type = p['PaperType']
-        type_counts[p_type] = type_counts.get(p_type, 0) + 1
-        
-        if p['Authors']:
-            authors = [a.strip() for a in p['Authors'].split(',')]
-            for a in authors:
-                author_counts[a] += 1
+    if user_role == 'admin':
+        summary_faculty = faculty_id or ''
+
+    elif user_role == 'coordinator':
+        if faculty_id != 'personal':
+             profile = get_user_profile(user_id)
+             summary_faculty = profile['faculty_id'] if profile else None
+
+    if summary_faculty is not None:
+        annual_counts, type_counts, top_authors = get_summary_analytics(conn, summary_faculty, year_filter)
+    else:
+        annual_counts, type_counts, top_authors = get_personal_analytics(conn, user_id, year_filter)
 
     sorted_years = sorted(annual_counts.keys())
     chart_annual = {
@@ -394,26 +1607,28 @@ def get_analytics_data(user_role, user_id=None, faculty_id=None, year_filter=Non
         'data': list(type_counts.values())
     }
     
-    top_5 = author_counts.most_common(5)
     chart_authors = {
-        'labels': [x[0] for x in top_5],
-        'data': [x[1] for x in top_5]
+        'labels': [row['Name'] for row in top_authors],
+        'data': [row['Count'] for row in top_authors]
     }
 
     return chart_annual, chart_types, chart_authors
 
-def get_filtered_papers(base_query, query_params, page=1, per_page=10):
-    search_query = request.args.get('query', '').strip()
-    filter_type = request.args.get('filter_type', '')
-    filter_status = request.args.get('filter_status', '')
-    filter_year = request.args.get('filter_year', '')
-    
+def apply_paper_filters(base_query, query_params, filters):
+    """
+    Narrows a Paper query by the listing filters (query, filter_type,
+    filter_status, filter_year). Returns (sql, params, match_query); when
+    there is a search the query is joined to the full-text index, which
+    exposes its rank as SearchRank.
+    """
+    search_query = filters.get('query', '').strip()
+    filter_type = filters.get('filter_type', '')
+    filter_status = filters.get('filter_status', '')
+    filter_year = filters.get('filter_year', '')
+
     sql = base_query
     params = list(query_params)
-    
-    if search_query:
-        sql += " AND (PaperTitle LIKE ? OR Authors LIKE ?)"
-        params.extend([f"%{search_query}%", f"%{search_query}%"])
+    match_query = build_match_query(search_query)
 
     if filter_type:
         sql += " AND PaperType = ?"
@@ -424,30 +1639,33 @@ def get_filtered_papers(base_query, query_params, page=1, per_page=10):
         params.append(filter_status)
         
     if filter_year:
-        sql += " AND substr(DatePublished, 1, 4) = ?" 
-        params.append(filter_year)
+        sql += " AND PubYear = ?" 
+        params.append(parse_year(filter_year))
+
+    # Search goes through the full-text index on top of the caller's scope
+    if match_query:
+        sql = f'''
+            SELECT q.*, fts.rank AS SearchRank FROM ({sql}) q
+            JOIN PaperSearch fts ON fts.PaperID = q.PaperID
+            WHERE PaperSearch MATCH ?
+        '''
+        params.append(match_query)
+    return sql, params, match_query
 
-    conn = get_db_connection()
-    
-    count_sql = f"SELECT COUNT(*) FROM ({sql})"
-    total_count = conn.execute(count_sql, params).fetchone()[0]
-    total_pages = ceil(total_count / per_page)
-    
-    offset = (page - 1) * per_page
-    sql += f" LIMIT {per_page} OFFSET {offset}"
-    
-    papers = conn.execute(sql, params).fetchall()
-    conn.close()
-    
-    return papers, total_count, total_pages, page
+def get_filtered_papers(base_query, query_params, page=1, per_page=10):
+    sql, params, match_query = apply_paper_filters(base_query, query_params, request.args)
+    if match_query:
+        return paginate(sql, params, [('fts.rank', 'SearchRank'), ('q.PaperID', 'PaperID')], False, page, per_page)
+
+    return paginate(sql, params, [('DatePublished', 'DatePublished'), ('PaperID', 'PaperID')], True, page, per_page)
 
 def get_all_years():
     conn = get_db_connection()
-    query = "SELECT DISTINCT substr(DatePublished, 1, 4) as year FROM Paper ORDER BY year DESC"
+    # The university-wide summary rows already hold one entry per year with papers
+    query = "SELECT DISTINCT PubYear as year FROM PaperStats WHERE FacultyID = '' AND PaperCount > 0 ORDER BY year DESC"
     years_data = conn.execute(query).fetchall()
-    conn.close()
     
-    years = [row['year'] for row in years_data if row['year']]
+    years = [str(row['year']) for row in years_data if row['year']]
     
     if not years:
         from datetime import datetime
@@ -456,52 +1674,75 @@ def get_all_years():
     return years
 
 def clean_name(name):
-    return name.lower().replace(" ", "").strip()
-
-def validate_authors_and_get_ids(authors_text, bypass_staff_check=False):
-    if not authors_text:
-        return False, "Author list cannot be empty.", None, None, None
+    return normalize_author_name(name)
+
+def update_author_lookup(conn, user_id, role, name):
+    # Admins never appear as paper authors
+    if role == 'Admin':
+        return
+    conn.execute("INSERT OR REPLACE INTO AuthorLookup (UserID, Role, NormalizedName) VALUES (?, ?, ?)",
+                 (user_id, role, clean_name(name)))
+
+def remove_author_lookup(conn, user_id):
+    conn.execute("DELETE FROM AuthorLookup WHERE UserID = ?", (user_id,))
+
+def get_author_matches(conn, cleaned_names):
+    # Indexed lookups (500 names at a time) resolve every author across all roles
+    unique_names = list(dict.fromkeys(cleaned_names))
+    matches = {}
+    for i in range(0, len(unique_names), 500):
+        chunk = unique_names[i:i + 500]
+        placeholders = ', '.join('?' for _ in chunk)
+        for row in conn.execute(f'''
+            SELECT a.NormalizedName, a.UserID, a.Role, s.StudentName, s.IsFinalYear
+            FROM AuthorLookup a
+            LEFT JOIN Student s ON a.Role = 'Student' AND s.StudentID = a.UserID
+            WHERE a.NormalizedName IN ({placeholders})
+            ORDER BY length(a.UserID), a.UserID
+        ''', chunk):
+            matches.setdefault(row['NormalizedName'], []).append(row)
+    return matches
+
+def build_paper_author_rows(paper_id, authors_text, matches, preferred_ids):
+    rows = []
+    for position, author in enumerate(split_author_names(authors_text), start=1):
+        c_name = clean_name(author)
+        candidates = [(m['Role'], m['UserID']) for m in matches.get(c_name, [])]
+        rows.append((paper_id, position, choose_author_id(candidates, preferred_ids), author, c_name))
+    return rows
 
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    author_names = [a.strip() for a in authors_text.split(',') if a.strip()]
+def resolve_author_ids(cleaned_names, author_matches, bypass_staff_check=False):
+    """
+    Picks the lecturer, student and coordinator a paper is linked to from
+    already-loaded `get_author_matches` results, so a batch of papers can
+    share one lookup. Returns (valid, message, lec_id, stu_id, coord_id).
+    """
+    matches = {}
+    for c_name in cleaned_names:
+        for row in author_matches.get(c_name, []):
+            matches.setdefault(c_name, {}).setdefault(row['Role'], row)
     
     found_lec = None
     found_stu = None
     found_coord = None
     academic_staff_found = False
 
-    for author in author_names:
-        c_name = clean_name(author)
+    for c_name in cleaned_names:
+        found = matches.get(c_name, {})
         
-        if not found_lec:
-            cursor.execute("SELECT LecturerID, LecturerName FROM Lecturer")
-            for row in cursor.fetchall():
-                if c_name == clean_name(row['LecturerName']):
-                    found_lec = row['LecturerID']
-                    academic_staff_found = True
-                    break
+        if not found_lec and 'Lecturer' in found:
+            found_lec = found['Lecturer']['UserID']
+            academic_staff_found = True
         
-        if not found_coord:
-            cursor.execute("SELECT CoordinatorID, CoordinatorName FROM ProgrammeCoordinator")
-            for row in cursor.fetchall():
-                if c_name == clean_name(row['CoordinatorName']):
-                    found_coord = row['CoordinatorID']
-                    academic_staff_found = True
-                    break
-
-        if not found_stu:
-            cursor.execute("SELECT StudentID, StudentName, IsFinalYear FROM Student")
-            for row in cursor.fetchall():
-                if c_name == clean_name(row['StudentName']):
-                    if row['IsFinalYear'] != 1:
-                         conn.close()
-                         return False, f"Error: Student '{row['StudentName']}' is not a Final Year student.", None, None, None
-                    found_stu = row['StudentID']
-                    break
+        if not found_coord and 'ProgrammeCoordinator' in found:
+            found_coord = found['ProgrammeCoordinator']['UserID']
+            academic_staff_found = True
 
-    conn.close()
+        if not found_stu and 'Student' in found:
+            row = found['Student']
+            if row['IsFinalYear'] != 1:
+                return False, f"Error: Student '{row['StudentName']}' is not a Final Year student.", None, None, None
+            found_stu = row['UserID']
 
     if not academic_staff_found and not bypass_staff_check:
         return False, "Error: Authors must include at least one valid Lecturer or Coordinator.", None, None, None
@@ -523,10 +1764,19 @@ def process_publication_request(form, file):
         flash("Error: Please fill in all required fields.")
         return False
 
+    try:
+        datetime.strptime(pub_date, '%Y-%m-%d')
+    except ValueError:
+        flash("Error: Date Published must be a valid date (YYYY-MM-DD).")
+        return False
+
     req_date = datetime.now().strftime('%Y-%m-%d')
 
     is_admin = (user_role == 'admin')
-    valid, msg, lec_id, stu_id, coord_id = validate_authors_and_get_ids(authors, bypass_staff_check=is_admin)
+    conn = get_db_connection()
+    cleaned_names = [clean_name(a) for a in split_author_names(authors)]
+    matches = get_author_matches(conn, cleaned_names)
+    valid, msg, lec_id, stu_id, coord_id = resolve_author_ids(cleaned_names, matches, bypass_staff_check=is_admin)
     
     if not valid:
         flash(msg)
@@ -544,15 +1794,16 @@ def process_publication_request(form, file):
 
     cover_image = None
     if file and allowed_file(file.filename):
-        filename = secure_filename(file.filename)
-        cover_image = f"{uuid.uuid4().hex}_{filename}"
-        file.save(os.path.join(app.config['UPLOAD_FOLDER'], cover_image))
+        try:
+            cover_image, cover_thumb, cover_preview = store_cover_upload(conn, file.stream)
+        except ValueError:
+            flash("Error: Valid Cover Page (PNG/JPG) required.")
+            return False
     else:
         flash("Error: Valid Cover Page (PNG/JPG) required.")
         return False
 
     try:
-        conn = get_db_connection()
         cursor = conn.cursor()
         paper_id = f"PAP-{uuid.uuid4().hex[:8].upper()}"
         
@@ -561,68 +1812,489 @@ def process_publication_request(form, file):
         cursor.execute('''
             INSERT INTO Paper (
                 PaperID, PaperTitle, DOI, DatePublished, DateRequest, 
-                LinkToPaper, PaperType, CoverImage, Authors, Status, 
+                LinkToPaper, PaperType, CoverImage, CoverThumb, CoverPreview, Authors, Status, 
                 LecturerID, StudentID, CoordinatorID, AdminID
             )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         ''', (
             paper_id, title, doi, pub_date, req_date, 
-            url, paper_type, cover_image, authors, 'Under Review', 
+            url, paper_type, cover_image, cover_thumb, cover_preview, authors, 'Under Review', 
             lec_id, stu_id, coord_id, admin_id
         ))
+
+        cursor.executemany(
+            "INSERT INTO PaperAuthor (PaperID, Position, UserID, AuthorName, NormalizedName) VALUES (?, ?, ?, ?, ?)",
+            build_paper_author_rows(paper_id, authors, matches, {lec_id, stu_id, coord_id, user_id})
+        )
+        adjust_paper_stats(conn, [paper_id], 1)
         
         conn.commit()
-        conn.close()
+        bump_search_generation()
         return True
     except Exception as e:
+        conn.rollback()
+        discard_unregistered_covers(conn, [(cover_image, cover_thumb, cover_preview)])
         flash(f"Database Error: {str(e)}")
         return False
 
+def bibtex_to_record(entry_type, fields):
+    authors = []
+    for name in re.split(r'\s+and\s+', fields.get('author', '')):
+        # BibTeX "Last, First" becomes "First Last"
+        last, comma, first = name.partition(',')
+        name = f"{first.strip()} {last.strip()}" if comma else name.strip()
+        if name.strip():
+            authors.append(name.strip())
+
+    date_published = fields.get('date', '')
+    if not re.fullmatch(r'\d{4}-\d{2}-\d{2}', date_published):
+        year = fields.get('year', '')
+        month = fields.get('month', '').strip().lower()[:3]
+        month_number = int(month) if month.isdigit() and 1 <= int(month) <= 12 else BIBTEX_MONTHS.get(month, 1)
+        date_published = f"{year}-{month_number:02d}-01" if re.fullmatch(r'\d{4}', year) else ''
+
+    doi = fields.get('doi', '')
+    return {
+        'title': fields.get('title', ''),
+        'authors': ', '.join(authors),
+        'date_published': date_published,
+        'url': fields.get('url') or (f"https://doi.org/{doi}" if doi else ''),
+        'paper_type': IMPORT_BIBTEX_TYPES.get(entry_type, ''),
+        'doi': doi,
+        'cover': fields.get('cover', ''),
+    }
+
+def read_import_records(filename, data):
+    """
+    Parses an uploaded CSV or BibTeX file into (line, record, error) tuples.
+    Records use the submission form's field names plus `cover`, the name of
+    the cover image inside the covers zip. Raises ValueError if the file
+    cannot be read at all.
+    """
+    try:
+        text = data.decode('utf-8-sig')
+    except UnicodeDecodeError:
+        raise ValueError("Import file must be UTF-8 encoded.")
+
+    extension = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+    records = []
+    if extension in ('bib', 'bibtex'):
+        for line, entry_type, key, fields in parse_bibtex(text):
+            if fields is None:
+                records.append((line, {'title': key}, "Could not parse this BibTeX entry."))
+            elif entry_type not in IMPORT_BIBTEX_TYPES:
+                records.append((line, {'title': fields.get('title', key)}, f"Unsupported BibTeX entry type @{entry_type}."))
+            else:
+                records.append((line, bibtex_to_record(entry_type, fields), None))
+    elif extension == 'csv':
+        reader = csv.DictReader(io.StringIO(text))
+        if not reader.fieldnames:
+            raise ValueError("The CSV file is empty.")
+        reader.fieldnames = [IMPORT_CSV_ALIASES.get(name, name) for name in
+                             (field.strip().lower().replace(' ', '_') for field in reader.fieldnames)]
+        for row in reader:
+            record = {field: (row.get(field) or '').strip() for field in IMPORT_FIELDS}
+            records.append((reader.line_num, record, None))
+    else:
+        raise ValueError("Import file must be a .csv or .bib file.")
+    return records
+
+def new_paper_ids(conn, count):
+    # Random IDs, re-drawn until none clash with each other or with existing papers
+    ids = set()
+    while len(ids) < count:
+        candidates = list({f"PAP-{uuid.uuid4().hex[:8].upper()}" for _ in range(count - len(ids))} - ids)
+        for i in range(0, len(candidates), 500):
+            chunk = candidates[i:i + 500]
+            placeholders = ', '.join('?' for _ in chunk)
+            taken = {row[0] for row in conn.execute(f"SELECT PaperID FROM Paper WHERE PaperID IN ({placeholders})", chunk)}
+            ids.update(c for c in chunk if c not in taken)
+    return list(ids)
+
+def check_import_record(record, author_ids, existing_dois, seen_dois, cover_names):
+    missing = [field for field in ['title', 'authors', 'date_published', 'url', 'paper_type'] if not record.get(field)]
+    if missing:
+        return "Missing required field(s): " + ', '.join(missing) + "."
+    try:
+        datetime.strptime(record['date_published'], '%Y-%m-%d')
+    except ValueError:
+        return "Date Published must be a valid date (YYYY-MM-DD)."
+    if record['paper_type'] not in PAPER_TYPES:
+        return f"Paper type must be one of {', '.join(PAPER_TYPES)}."
+
+    doi = record.get('doi')
+    if doi and doi.lower() in existing_dois:
+        return f"A paper with DOI {doi} already exists."
+    if doi and doi.lower() in seen_dois:
+        return f"DOI {doi} appears more than once in this file."
+
+    valid, message = author_ids[:2]
+    if not valid:
+        return message
+
+    cover = record.get('cover')
+    if cover and cover_names is None:
+        return f"Cover '{cover}' is named but no covers zip was given."
+    if cover and cover not in cover_names:
+        return f"Cover '{cover}' was not found in the covers zip."
+    return None
+
+def import_papers(conn, records, covers=None, status='Approved', dry_run=False, admin_id=None, progress=None,
+                  bypass_staff_check=False):
+    """
+    Validates parsed import records as one batch and, unless dry_run,
+    inserts the accepted ones in a single transaction (Paper, PaperAuthor,
+    summary stats and cover blobs). Every author name in the file is
+    resolved with one preloaded lookup rather than per row, with the same
+    staff rule as a single request (`bypass_staff_check` for admins).
+    `covers` is an open ZipFile, and `progress(stage, done, total)` is
+    called as the batch moves along. Returns (accepted_count, errors) with
+    errors as (line, title, message).
+    """
+    def report(stage, done, total):
+        if progress and (done % IMPORT_PROGRESS_EVERY == 0 or done == total):
+            progress(stage, done, total)
+
+    # Preload everything the batch refers to: author names and DOIs already on file
+    cleaned = [[clean_name(a) for a in split_author_names(record.get('authors', ''))] if not error else []
+               for _, record, error in records]
+    author_matches = get_author_matches(conn, [name for names in cleaned for name in names])
+
+    dois = list({record['doi'].lower() for _, record, error in records if not error and record.get('doi')})
+    existing_dois = set()
+    for i in range(0, len(dois), 500):
+        chunk = dois[i:i + 500]
+        placeholders = ', '.join('?' for _ in chunk)
+        existing_dois.update(row[0] for row in conn.execute(f"SELECT lower(DOI) FROM Paper WHERE lower(DOI) IN ({placeholders})", chunk))
+
+    cover_names = set(covers.namelist()) if covers else None
+    cover_types = {}
+
+    accepted = []
+    errors = []
+    seen_dois = set()
+    for done, ((line, record, error), names) in enumerate(zip(records, cleaned), start=1):
+        if not error:
+            author_ids = resolve_author_ids(names, author_matches, bypass_staff_check=bypass_staff_check)
+            error = check_import_record(record, author_ids, existing_dois, seen_dois, cover_names)
+
+        cover = record.get('cover')
+        if not error and cover:
+            if cover not in cover_types:
+                with covers.open(cover) as stream:
+                    cover_types[cover] = sniff_image_type(stream.read(16))
+            if cover_types[cover] is None:
+                error = f"Cover '{cover}' must be a PNG or JPEG image."
+
+        if error:
+            errors.append((line, record.get('title', ''), error))
+        else:
+            accepted.append((record, author_ids[2:]))
+            if record.get('doi'):
+                seen_dois.add(record['doi'].lower())
+        report("Checked", done, len(records))
+
+    if dry_run or not accepted:
+        return len(accepted), errors
+
+    req_date = datetime.now().strftime('%Y-%m-%d')
+    paper_ids = new_paper_ids(conn, len(accepted))
+    stored_covers = {}
+    paper_rows = []
+    author_rows = []
+    try:
+        for done, ((record, (lec_id, stu_id, coord_id)), paper_id) in enumerate(zip(accepted, paper_ids), start=1):
+            cover_image = cover_thumb = cover_preview = None
+            cover = record.get('cover')
+            if cover:
+                # Each distinct cover is stored once; identical images dedupe in the blob store
+                if cover not in stored_covers:
+                    with covers.open(cover) as stream:
+                        stored_covers[cover] = store_cover_upload(conn, stream)
+                cover_image, cover_thumb, cover_preview = stored_covers[cover]
+
+            paper_rows.append((
+                paper_id, record['title'], record.get('doi') or None, record['date_published'], req_date,
+                record['url'], record['paper_type'], cover_image, cover_thumb, cover_preview, record['authors'], status,
+                lec_id, stu_id, coord_id, admin_id
+            ))
+            author_rows.extend(build_paper_author_rows(paper_id, record['authors'], author_matches, {lec_id, stu_id, coord_id}))
+            report("Prepared", done, len(accepted))
+
+        conn.executemany('''
+            INSERT INTO Paper (
+                PaperID, PaperTitle, DOI, DatePublished, DateRequest,
+                LinkToPaper, PaperType, CoverImage, CoverThumb, CoverPreview, Authors, Status,
+                LecturerID, StudentID, CoordinatorID, AdminID
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', paper_rows)
+        conn.executemany(
+            "INSERT INTO PaperAuthor (PaperID, Position, UserID, AuthorName, NormalizedName) VALUES (?, ?, ?, ?, ?)",
+            author_rows
+        )
+        adjust_paper_stats(conn, [row[0] for row in paper_rows], 1)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        discard_unregistered_covers(conn, stored_covers.values())
+        raise
+    bump_search_generation()
+    refresh_typeahead(conn, [row[0] for row in paper_rows])
+
+    return len(paper_rows), errors
+
+# Web imports run in a background thread; the page polls their progress from here
+import_jobs = OrderedDict()
+IMPORT_JOBS_KEPT = 20
+
+def run_import_job(job, work_dir, filename, covers_path, status, dry_run, bypass_staff_check):
+    """
+    Parses and imports the spooled upload in `work_dir`, then deletes the
+    directory. Outcomes are written to `job` for the polling page.
+    """
+    def progress(stage, done, total):
+        job.update(stage=stage, done=done, total=total)
+
+    conn = covers = None
+    try:
+        with open(os.path.join(work_dir, 'import'), 'rb') as f:
+            records = read_import_records(filename, f.read())
+        job['total'] = len(records)
+        covers = zipfile.ZipFile(covers_path) if covers_path else None
+        conn = open_db_connection()
+        accepted, errors = import_papers(conn, records, covers, status, dry_run, job['admin_id'], progress,
+                                         bypass_staff_check=bypass_staff_check)
+        job['result'] = {'total': len(records), 'accepted': accepted, 'errors': errors, 'dry_run': dry_run}
+    except ValueError as e:
+        job['error'] = f"Error: {e}"
+    except Exception as e:
+        app.logger.exception("Import job %s failed", job['id'])
+        job['error'] = f"Database Error: {e}"
+    finally:
+        if covers:
+            covers.close()
+        if conn:
+            conn.close()
+        shutil.rmtree(work_dir, ignore_errors=True)
+        job['finished'] = True
+
+def start_import_job(work_dir, filename, covers_path, status, dry_run, admin_id, bypass_staff_check):
+    """Starts a background import of files spooled into `work_dir`; the job deletes the directory when done."""
+    job = {'id': uuid.uuid4().hex, 'admin_id': admin_id, 'stage': "Queued", 'done': 0, 'total': 0,
+           'dry_run': dry_run, 'finished': False, 'result': None, 'error': None}
+    import_jobs[job['id']] = job
+    while len(import_jobs) > IMPORT_JOBS_KEPT:
+        oldest = next(iter(import_jobs))
+        if not import_jobs[oldest]['finished']:
+            break
+        import_jobs.pop(oldest)
+    threading.Thread(target=run_import_job,
+                     args=(job, work_dir, filename, covers_path, status, dry_run, bypass_staff_check),
+                     name=f"import-{job['id'][:8]}", daemon=True).start()
+    return job
+
+def read_user_records(data):
+    """
+    Parses an uploaded provisioning CSV into (line, record) tuples keyed by
+    PROVISION_FIELDS. Raises ValueError if the file cannot be read at all.
+    """
+    try:
+        text = data.decode('utf-8-sig')
+    except UnicodeDecodeError:
+        raise ValueError("User file must be UTF-8 encoded.")
+
+    reader = csv.DictReader(io.StringIO(text))
+    if not reader.fieldnames:
+        raise ValueError("The CSV file is empty.")
+    reader.fieldnames = [PROVISION_CSV_ALIASES.get(name, name) for name in
+                         (field.strip().lower().replace(' ', '_') for field in reader.fieldnames)]
+    missing = [field for field in ('role', 'faculty', 'name', 'password') if field not in reader.fieldnames]
+    if missing:
+        raise ValueError(f"The CSV file is missing the column(s): {', '.join(missing)}.")
+    return [(reader.line_num, {field: (row.get(field) or '').strip() for field in PROVISION_FIELDS})
+            for row in reader]
+
+def load_staff_references(conn, role, values, batch):
+    # Existing staff matched by ID or by name, plus staff of this role created earlier in the batch (by name)
+    pk = USER_ROLES[role][1]
+    values = list(values)
+    known_ids = set()
+    names = {}
+    for i in range(0, len(values), 500):
+        chunk = values[i:i + 500]
+        placeholders = ', '.join('?' for _ in chunk)
+        known_ids.update(row[0] for row in conn.execute(f"SELECT {pk} FROM {role} WHERE {pk} IN ({placeholders})", chunk))
+
+    cleaned = list({clean_name(value) for value in values})
+    for i in range(0, len(cleaned), 500):
+        chunk = cleaned[i:i + 500]
+        placeholders = ', '.join('?' for _ in chunk)
+        for user_id, name in conn.execute(
+                f"SELECT UserID, NormalizedName FROM AuthorLookup WHERE Role = ? AND NormalizedName IN ({placeholders})",
+                [role] + chunk):
+            names.setdefault(name, []).append(user_id)
+
+    for user in batch:
+        if user['role'] == role:
+            names.setdefault(clean_name(user['name']), []).append(user['user_id'])
+    return known_ids, names
+
+def resolve_staff_reference(value, known_ids, names, label):
+    if not value:
+        return None, None
+    if value in known_ids:
+        return value, None
+    matches = names.get(clean_name(value), [])
+    if len(matches) == 1:
+        return matches[0], None
+    if matches:
+        return None, f"{label} '{value}' matches {len(matches)} users; use the ID instead."
+    return None, f"{label} '{value}' was not found."
+
+def provision_users(conn, records, dry_run=False, admin_id=None):
+    """
+    Creates users of any role from parsed provisioning records as one batch.
+    IDs are reserved in one block per role and faculty, assigned lecturers and
+    coordinators (by ID, or by name including staff created in the same
+    file) are resolved with preloaded lookups, and every table is filled with
+    executemany in a single transaction. The batch is all or nothing: if any
+    row is rejected, nothing is written. Returns (mapping, errors) with
+    mapping rows as PROVISION_MAPPING_COLUMNS and errors as (line, name, message).
+    """
+    faculties = {row[0] for row in conn.execute("SELECT FacultyID FROM Faculty")}
+    flags = {'': 0, '0': 0, 'no': 0, 'n': 0, 'false': 0, '1': 1, 'yes': 1, 'y': 1, 'true': 1}
+
+    users = []
+    errors = []
+    for line, record in records:
+        role = USER_ROLE_ALIASES.get(record['role'].lower().replace(' ', '_'))
+        if not role:
+            error = f"Unknown role '{record['role']}'."
+        elif not record['name'] or not record['password']:
+            error = "Name and password are required."
+        elif record['faculty'] not in faculties:
+            error = f"Unknown faculty '{record['faculty']}'."
+        elif record['is_final_year'].lower() not in flags:
+            error = f"is_final_year must be yes or no, not '{record['is_final_year']}'."
+        elif role == 'Lecturer' and not record['assigned_coordinator']:
+            error = "Lecturers need an assigned coordinator."
+        else:
+            error = None
+
+        if error:
+            errors.append((line, record['name'], error))
+        else:
+            users.append(dict(record, line=line, role=role, is_final_year=flags[record['is_final_year'].lower()]))
+
+    # One block reservation per role and faculty for the whole batch
+    groups = {}
+    for user in users:
+        groups.setdefault((user['role'], user['faculty']), []).append(user)
+    for (role, faculty_id), members in groups.items():
+        for user, user_id in zip(members, reserve_user_ids(conn, role, faculty_id, len(members))):
+            user['user_id'] = user_id
+
+    lecturers = load_staff_references(conn, 'Lecturer', {u['assigned_lecturer'] for u in users
+                                                         if u['role'] == 'Student' and u['assigned_lecturer']}, users)
+    coordinators = load_staff_references(conn, 'ProgrammeCoordinator', {u['assigned_coordinator'] for u in users
+                                                                       if u['role'] == 'Lecturer'}, users)
+
+    rows = {role: [] for role in USER_ROLES}
+    lookup_rows = []
+    mapping = []
+    for user in users:
+        role = user['role']
+        if role == 'Student':
+            lecturer_id, error = resolve_staff_reference(user['assigned_lecturer'], *lecturers, "Lecturer")
+            rows[role].append((user['user_id'], user['password'], user['name'], user['is_final_year'],
+                               lecturer_id, admin_id, user['faculty']))
+        elif role == 'Lecturer':
+            coord_id, error = resolve_staff_reference(user['assigned_coordinator'], *coordinators, "Coordinator")
+            rows[role].append((user['user_id'], user['password'], user['name'], coord_id, admin_id, user['faculty']))
+        elif role == 'ProgrammeCoordinator':
+            error = None
+            rows[role].append((user['user_id'], user['password'], user['name'], user['faculty'], admin_id))
+        else:
+            error = None
+            rows[role].append((user['user_id'], user['password'], user['name']))
+
+        if error:
+            errors.append((user['line'], user['name'], error))
+            continue
+        # Admins never appear as paper authors
+        if role != 'Admin':
+            lookup_rows.append((user['user_id'], role, clean_name(user['name'])))
+        mapping.append((user['line'], user['name'], role, user['faculty'], user['user_id']))
+
+    errors.sort(key=lambda error: error[0])
+    if errors or dry_run:
+        # Hand the reserved blocks back; the mapping only previews the IDs
+        conn.rollback()
+        return mapping, errors
+
+    try:
+        # Parents first so every assignment points at a row that already exists
+        conn.executemany("INSERT INTO Admin (AdminID, AdminPassword, AdminName) VALUES (?,?,?)", rows['Admin'])
+        conn.executemany("INSERT INTO ProgrammeCoordinator (CoordinatorID, CoordinatorPassword, CoordinatorName, FacultyID, AdminID) VALUES (?,?,?,?,?)",
+                         rows['ProgrammeCoordinator'])
+        conn.executemany("INSERT INTO Lecturer (LecturerID, LecturerPassword, LecturerName, CoordinatorID, AdminID, FacultyID) VALUES (?,?,?,?,?,?)",
+                         rows['Lecturer'])
+        conn.executemany("INSERT INTO Student (StudentID, StudentPassword, StudentName, IsFinalYear, LecturerID, AdminID, FacultyID) VALUES (?,?,?,?,?,?,?)",
+                         rows['Student'])
+        conn.executemany("INSERT OR REPLACE INTO AuthorLookup (UserID, Role, NormalizedName) VALUES (?, ?, ?)", lookup_rows)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    return mapping, errors
+
+@app.errorhandler(413)
+def request_too_large(error):
+    limit_mb = app.config['MAX_CONTENT_LENGTH'] // (1024 * 1024)
+    flash(f"Error: Upload is too large (limit {limit_mb} MB).")
+    return redirect(request.referrer or url_for('login'))
+
 @app.route('/')
 def root():
     return redirect(url_for('login'))
 
+def authenticate_user(conn, user_id, password):
+    """
+    Returns the user table (role) of the account matching user_id and
+    password, or None. UserIdentity says which table holds the ID, so this
+    is one statement probing only that table rather than all four in turn.
+    """
+    row = conn.execute('''
+        SELECT Role FROM UserIdentity
+        WHERE UserID = ? AND ? = CASE Role
+            WHEN 'Admin' THEN (SELECT AdminPassword FROM Admin WHERE AdminID = UserID)
+            WHEN 'ProgrammeCoordinator' THEN (SELECT CoordinatorPassword FROM ProgrammeCoordinator WHERE CoordinatorID = UserID)
+            WHEN 'Lecturer' THEN (SELECT LecturerPassword FROM Lecturer WHERE LecturerID = UserID)
+            WHEN 'Student' THEN (SELECT StudentPassword FROM Student WHERE StudentID = UserID)
+        END
+    ''', (user_id, password)).fetchone()
+    return row['Role'] if row else None
+
 @app.route('/login', methods=['GET', 'POST'])
 def login():
     if request.method == 'POST':
         user_id = request.form.get('user_id')
         password = request.form.get('password')
         conn = get_db_connection()
-        cursor = conn.cursor()
-
-        # Admin
-        cursor.execute("SELECT * FROM Admin WHERE AdminID = ? AND AdminPassword = ?", (user_id, password))
-        if cursor.fetchone():
-            session['user_id'] = user_id
-            session['role'] = 'admin'
-            conn.close()
-            return redirect(url_for('admin_home'))
 
-        # Coordinator
-        cursor.execute("SELECT * FROM ProgrammeCoordinator WHERE CoordinatorID = ? AND CoordinatorPassword = ?", (user_id, password))
-        if cursor.fetchone():
-            session['user_id'] = user_id
-            session['role'] = 'coordinator'
-            conn.close()
-            return redirect(url_for('coordinator_home'))
-        
-        # Lecturer
-        cursor.execute("SELECT * FROM Lecturer WHERE LecturerID = ? AND LecturerPassword = ?", (user_id, password))
-        if cursor.fetchone():
+        role = authenticate_user(conn, user_id, password)
+        if role:
             session['user_id'] = user_id
-            session['role'] = 'lecturer'
-            conn.close()
-            return redirect(url_for('lecturer_student_home'))
+            session['role'], home = LOGIN_HOMES[role]
+            # Warm the profile the dashboards and reports read on every request
+            profile_cache.pop(user_id, None)
+            get_user_profile(user_id)
+            # Have the search box suggestions ready by the time the home page loads
+            ensure_typeahead()
+            return redirect(url_for(home))
 
-        # Student
-        cursor.execute("SELECT * FROM Student WHERE StudentID = ? AND StudentPassword = ?", (user_id, password))
-        if cursor.fetchone():
-            session['user_id'] = user_id
-            session['role'] = 'student'
-            conn.close()
-            return redirect(url_for('lecturer_student_home'))
-
-        conn.close()
         flash('Invalid ID or Password')
         return redirect(url_for('login'))
 
@@ -642,10 +2314,13 @@ def submit_review():
     new_status = "Approved" if action == "approve" else "Rejected"
     
     conn = get_db_connection()
+    adjust_paper_stats(conn, [paper_id], -1)
     conn.execute("UPDATE Paper SET Status = ?, Feedback = ? WHERE PaperID = ?", 
                  (new_status, feedback, paper_id))
+    adjust_paper_stats(conn, [paper_id], 1)
     conn.commit()
-    conn.close()
+    bump_search_generation()
+    refresh_typeahead(conn, [paper_id])
     
     flash(f"Paper {new_status} successfully.")
     
@@ -659,7 +2334,6 @@ def view_feedback_detail():
     paper_id = request.args.get('id')
     conn = get_db_connection()
     paper = conn.execute("SELECT * FROM Paper WHERE PaperID = ?", (paper_id,)).fetchone()
-    conn.close()
     return render_template('mainScreens/view_feedback.html', paper=paper)
 
 @app.route('/bookmark/toggle', methods=['POST'])
@@ -679,7 +2353,6 @@ def toggle_bookmark():
         msg = "Added to bookmarks"
         
     conn.commit()
-    conn.close()
     return redirect(request.referrer)
 
 @app.route('/admin/remove_paper', methods=['POST'])
@@ -689,9 +2362,12 @@ def admin_remove_paper():
         
     paper_id = request.form.get('paper_id')
     conn = get_db_connection()
+    adjust_paper_stats(conn, [paper_id], -1)
     conn.execute("UPDATE Paper SET Status = 'Removed' WHERE PaperID = ?", (paper_id,))
+    adjust_paper_stats(conn, [paper_id], 1)
     conn.commit()
-    conn.close()
+    bump_search_generation()
+    refresh_typeahead(conn, [paper_id])
     flash("Paper removed from search results.")
     return redirect(request.referrer)
 
@@ -701,29 +2377,28 @@ def get_bookmarked_papers(user_id, page=1, per_page=10):
     """
     search_query = request.args.get('query', '').strip()
     
-    sql = '''
-        SELECT p.* FROM Paper p
-        JOIN Bookmarks b ON p.PaperID = b.PaperID
-        WHERE b.UserID = ?
-    '''
-    params = [user_id]
-    
-    if search_query:
-        sql += " AND (p.PaperTitle LIKE ? OR p.Authors LIKE ?)"
-        params.extend([f"%{search_query}%", f"%{search_query}%"])
+    match_query = build_match_query(search_query)
 
-    conn = get_db_connection()
-    count_sql = f"SELECT COUNT(*) FROM ({sql})"
-    total_count = conn.execute(count_sql, params).fetchone()[0]
-    total_pages = ceil(total_count / per_page)
-    
-    offset = (page - 1) * per_page
-    sql += f" LIMIT {per_page} OFFSET {offset}"
-    
-    papers = conn.execute(sql, params).fetchall()
-    conn.close()
-    
-    return papers, total_count, total_pages, page
+    if match_query:
+        sql = '''
+            SELECT p.*, fts.rank AS SearchRank FROM PaperSearch fts
+            JOIN Paper p ON p.PaperID = fts.PaperID
+            JOIN Bookmarks b ON p.PaperID = b.PaperID
+            WHERE PaperSearch MATCH ? AND b.UserID = ?
+        '''
+        params = [match_query, user_id]
+    else:
+        sql = '''
+            SELECT p.* FROM Paper p
+            JOIN Bookmarks b ON p.PaperID = b.PaperID
+            WHERE b.UserID = ?
+        '''
+        params = [user_id]
+
+    count_tables = ('Paper', 'Bookmarks')
+    if match_query:
+        return paginate(sql, params, [('fts.rank', 'SearchRank'), ('p.PaperID', 'PaperID')], False, page, per_page, count_tables)
+    return paginate(sql, params, [('p.DatePublished', 'DatePublished'), ('p.PaperID', 'PaperID')], True, page, per_page, count_tables)
 
 # ADMIN -----------------------------------------------------------------------------------------------
 @app.route('/admin/home')
@@ -743,30 +2418,33 @@ def admin_dashboard():
                            year_filter=year_filter, years=all_years)
 
 @app.route('/admin/bookmarks')
+@conditional_on_data('Paper', 'Bookmarks')
 def admin_bookmarks():
     page = request.args.get('page', 1, type=int)
-    papers, total, pages, current = get_bookmarked_papers(session.get('user_id'), page)
+    papers, total, pages, current, cursors = get_bookmarked_papers(session.get('user_id'), page)
     return render_template('admin/admin_bookmarks.html', 
-                           papers=papers, total=total, pages=pages, current_page=current)
+                           papers=papers, total=total, pages=pages, current_page=current, cursors=cursors)
 
 @app.route('/admin/search_results')
+@conditional_on_data('Paper', 'Bookmarks')
 def admin_search_results():
     page = request.args.get('page', 1, type=int)
-    papers, total, pages, current = get_public_search_results(session.get('user_id'), page)
+    papers, total, pages, current, cursors = get_public_search_results(session.get('user_id'), page)
     return render_template('admin/admin_publicationresults.html', 
-                           papers=papers, total=total, pages=pages, current_page=current)
+                           papers=papers, total=total, pages=pages, current_page=current, cursors=cursors)
 
 @app.route('/admin/status')
+@conditional_on_data('Paper')
 def admin_status():
     page = request.args.get('page', 1, type=int)
     
     base_query = "SELECT * FROM Paper WHERE 1=1" 
     base_params = []
     
-    papers, total, pages, current_page = get_filtered_papers(base_query, base_params, page)
+    papers, total, pages, current_page, cursors = get_filtered_papers(base_query, base_params, page)
     
     return render_template('admin/admin_publicationStatus.html', 
-                           papers=papers, total=total, pages=pages, current_page=current_page)
+                           papers=papers, total=total, pages=pages, current_page=current_page, cursors=cursors)
 
 @app.route('/admin/requests', methods=['GET', 'POST'])
 def admin_requests():
@@ -776,12 +2454,76 @@ def admin_requests():
             return redirect(url_for('admin_dashboard'))
     return render_template('admin/admin_trackingRequests.html')
 
+@app.route('/admin/import', methods=['GET', 'POST'])
+def admin_import():
+    if session.get('role') != 'admin':
+        return redirect(url_for('login'))
+
+    result = None
+    if request.method == 'POST':
+        # Covers archives outgrow the app-wide limit; the files are spooled to disk, not held in memory
+        request.max_content_length = app.config['IMPORT_MAX_CONTENT_LENGTH']
+        upload = request.files.get('import_file')
+        covers_upload = request.files.get('covers_zip')
+        status = request.form.get('status', 'Approved')
+        dry_run = request.form.get('dry_run') == '1'
+
+        if not upload or not upload.filename:
+            flash("Error: Choose a CSV or BibTeX file to import.")
+            return render_template('admin/admin_import.html', result=None)
+        if status not in IMPORT_STATUSES:
+            status = 'Approved'
+
+        # The job outlives the request and its upload streams, so it gets its own copies on disk
+        work_dir = tempfile.mkdtemp(prefix='import-')
+        upload.save(os.path.join(work_dir, 'import'))
+        covers_path = None
+        if covers_upload and covers_upload.filename:
+            covers_path = os.path.join(work_dir, 'covers.zip')
+            covers_upload.save(covers_path)
+            if not zipfile.is_zipfile(covers_path):
+                shutil.rmtree(work_dir, ignore_errors=True)
+                flash("Error: The covers file is not a valid zip archive.")
+                return render_template('admin/admin_import.html', result=None)
+
+        # Only admins reach this point, and an admin's single submission skips the staff-author
+        # rule too, so imported papers may list students or outside authors only
+        job = start_import_job(work_dir, upload.filename, covers_path, status, dry_run, session.get('user_id'),
+                               bypass_staff_check=True)
+        return redirect(url_for('admin_import', job=job['id']))
+
+    job = import_jobs.get(request.args.get('job', ''))
+    if job and job['admin_id'] == session.get('user_id'):
+        if job['error']:
+            flash(job['error'])
+        elif job['finished']:
+            result = job['result']
+        else:
+            return render_template('admin/admin_import.html', result=None, job=job)
+
+    return render_template('admin/admin_import.html', result=result)
+
+@app.route('/admin/import/status/<job_id>')
+def admin_import_status(job_id):
+    if session.get('role') != 'admin':
+        return jsonify({'error': 'Unauthorized'}), 403
+    job = import_jobs.get(job_id)
+    if not job or job['admin_id'] != session.get('user_id'):
+        return jsonify({'error': 'Unknown import'}), 404
+    return jsonify({key: job[key] for key in ('stage', 'done', 'total', 'finished')})
+
+@app.route('/admin/metrics')
+def admin_metrics():
+    if session.get('role') != 'admin':
+        return jsonify({'error': 'Unauthorized'}), 403
+    # Counters are per worker process; scrape each worker to aggregate
+    return Response(render_metrics(), mimetype='text/plain; version=0.0.4')
+
 @app.route('/admin/review_detail')
 def admin_review_detail():
     paper_id = request.args.get('id')
     conn = get_db_connection()
     paper = conn.execute("SELECT * FROM Paper WHERE PaperID = ?", (paper_id,)).fetchone()
-    conn.close()
     return render_template('admin/admin_review_detail.html', paper=paper)
 
 @app.route('/admin/users', methods=['GET'])
@@ -792,11 +2534,46 @@ def admin_users():
     faculties = conn.execute("SELECT * FROM Faculty").fetchall()
     coords = conn.execute("SELECT CoordinatorID, CoordinatorName, FacultyID FROM ProgrammeCoordinator").fetchall()
     lecturers = conn.execute("SELECT LecturerID, LecturerName, FacultyID FROM Lecturer").fetchall()
-    conn.close()
     
     return render_template('admin/userManagement.html', 
                            faculties=faculties, coords=coords, lecturers=lecturers)
 
+@app.route('/admin/users/provision', methods=['GET', 'POST'])
+def admin_provision_users():
+    if session.get('role') != 'admin':
+        return redirect(url_for('login'))
+
+    result = None
+    if request.method == 'POST':
+        upload = request.files.get('users_file')
+        dry_run = request.form.get('dry_run') == '1'
+
+        if not upload or not upload.filename:
+            flash("Error: Choose a CSV file of users.")
+            return render_template('admin/admin_provisionUsers.html', result=None)
+
+        try:
+            records = read_user_records(upload.read())
+        except ValueError as e:
+            flash(f"Error: {e}")
+            return render_template('admin/admin_provisionUsers.html', result=None)
+
+        conn = get_db_connection()
+        try:
+            mapping, errors = provision_users(conn, records, dry_run, admin_id=session.get('user_id'))
+        except Exception as e:
+            flash(f"Database Error: {str(e)}")
+            return render_template('admin/admin_provisionUsers.html', result=None)
+
+        if not dry_run and not errors:
+            # The mapping of file rows to generated IDs is the result of a real run
+            return Response(render_rows_csv(PROVISION_MAPPING_COLUMNS, mapping), mimetype='text/csv', headers={
+                'Content-Disposition': 'attachment; filename="provisioned-users.csv"',
+            })
+        result = {'total': len(records), 'mapping': mapping, 'errors': errors, 'dry_run': dry_run}
+
+    return render_template('admin/admin_provisionUsers.html', result=result)
+
 @app.route('/admin/users/search', methods=['POST'])
 def search_user():
     user_id = request.json.get('user_id')
@@ -806,22 +2583,14 @@ def search_user():
     user_data = None
     role = None
 
-    tables = [
-        ('Student', 'StudentID'), 
-        ('Lecturer', 'LecturerID'), 
-        ('ProgrammeCoordinator', 'CoordinatorID'), 
-        ('Admin', 'AdminID')
-    ]
-
-    for table, pk in tables:
-        row = cursor.execute(f"SELECT * FROM {table} WHERE {pk} = ?", (user_id,)).fetchone()
+    identity = cursor.execute("SELECT Role FROM UserIdentity WHERE UserID = ?", (user_id,)).fetchone()
+    if identity:
+        role = identity['Role']
+        pk = USER_ROLES[role][1]
+        row = cursor.execute(f"SELECT * FROM {role} WHERE {pk} = ?", (user_id,)).fetchone()
         if row:
             user_data = dict(row)
-            role = table
-            break
-    
-    conn.close()
-    
+
     if user_data:
         return json.dumps({'success': True, 'role': role, 'data': user_data})
     else:
@@ -846,14 +2615,20 @@ def save_user():
     conn = get_db_connection()
     
     try:
+        # Papers attributed to this user may change faculty, so re-count them around the change
+        affected_papers = get_user_paper_ids(conn, original_id) if original_id else []
+        adjust_paper_stats(conn, affected_papers, -1)
+
         if action == 'delete':
             table = original_role
             pk = f"{original_role}ID" if original_role != 'ProgrammeCoordinator' else 'CoordinatorID'
             conn.execute(f"DELETE FROM {table} WHERE {pk} = ?", (original_id,))
+            conn.execute("UPDATE PaperAuthor SET UserID = NULL WHERE UserID = ?", (original_id,))
+            remove_author_lookup(conn, original_id)
             flash("User deleted successfully.")
 
         elif action == 'create':
-            new_id = generate_new_user_id(role, faculty_id)
+            new_id = reserve_user_ids(conn, role, faculty_id)[0]
             
             if role == 'Student':
                 conn.execute("INSERT INTO Student (StudentID, StudentPassword, StudentName, IsFinalYear, LecturerID, AdminID, FacultyID) VALUES (?,?,?,?,?,?,?)",
@@ -868,6 +2643,7 @@ def save_user():
                 conn.execute("INSERT INTO Admin (AdminID, AdminPassword, AdminName) VALUES (?,?,?)",
                              (new_id, password, name))
             
+            update_author_lookup(conn, new_id, role, name)
             flash(f"User created: {new_id}")
 
         elif action == 'update':
@@ -881,10 +2657,11 @@ def save_user():
                 elif role == 'ProgrammeCoordinator':
                     conn.execute("UPDATE ProgrammeCoordinator SET CoordinatorName=?, CoordinatorPassword=?, FacultyID=? WHERE CoordinatorID=?",
                                  (name, password, faculty_id, original_id))
+                update_author_lookup(conn, original_id, role, name)
                 flash(f"User {original_id} updated.")
             
             else:
-                new_id = generate_new_user_id(role, faculty_id)
+                new_id = reserve_user_ids(conn, role, faculty_id)[0]
                 
                 if role == 'Student':
                     conn.execute("INSERT INTO Student (StudentID, StudentPassword, StudentName, IsFinalYear, LecturerID, AdminID, FacultyID) VALUES (?,?,?,?,?,?,?)",
@@ -909,19 +2686,26 @@ def save_user():
 
                 if old_col and new_col:
                     conn.execute(f"UPDATE Paper SET {new_col} = ?, {old_col} = NULL WHERE {old_col} = ?", (new_id, original_id))
+                conn.execute("UPDATE PaperAuthor SET UserID = ? WHERE UserID = ?", (new_id, original_id))
 
                 old_table = original_role
                 old_pk = f"{original_role}ID" if original_role != 'ProgrammeCoordinator' else 'CoordinatorID'
                 conn.execute(f"DELETE FROM {old_table} WHERE {old_pk} = ?", (original_id,))
+
+                remove_author_lookup(conn, original_id)
+                update_author_lookup(conn, new_id, role, name)
                 
                 flash(f"User migrated from {original_id} to {new_id}")
 
+        adjust_paper_stats(conn, affected_papers, 1)
         conn.commit()
     except Exception as e:
         conn.rollback()
         flash(f"Error: {str(e)}")
-    finally:
-        conn.close()
+
+    # The cached profile of the changed user is stale (and gone, if it was deleted or migrated)
+    if original_id:
+        profile_cache.pop(original_id, None)
 
     return redirect(url_for('admin_users'))
 
@@ -947,42 +2731,41 @@ def coordinator_dashboard():
                            year_filter=year_filter, years=all_years) 
 
 @app.route('/coordinator/bookmarks')
+@conditional_on_data('Paper', 'Bookmarks')
 def coordinator_bookmarks():
     page = request.args.get('page', 1, type=int)
-    papers, total, pages, current = get_bookmarked_papers(session.get('user_id'), page)
+    papers, total, pages, current, cursors = get_bookmarked_papers(session.get('user_id'), page)
     return render_template('coordinator/coordinator_bookmarks.html', 
-                           papers=papers, total=total, pages=pages, current_page=current)
+                           papers=papers, total=total, pages=pages, current_page=current, cursors=cursors)
 
 @app.route('/coordinator/search_results')
+@conditional_on_data('Paper', 'Bookmarks')
 def coordinator_search_results():
     page = request.args.get('page', 1, type=int)
-    papers, total, pages, current = get_public_search_results(session.get('user_id'), page)
+    papers, total, pages, current, cursors = get_public_search_results(session.get('user_id'), page)
     return render_template('coordinator/coordinator_publicationresults.html', 
-                           papers=papers, total=total, pages=pages, current_page=current)
+                           papers=papers, total=total, pages=pages, current_page=current, cursors=cursors)
 
 @app.route('/coordinator/status')
+@conditional_on_data('Paper', 'Users')
 def coordinator_status():
     user_id = session.get('user_id')
     page = request.args.get('page', 1, type=int)
     
-    conn = get_db_connection()
-    coord = conn.execute("SELECT FacultyID FROM ProgrammeCoordinator WHERE CoordinatorID = ?", (user_id,)).fetchone()
-    faculty_id = coord['FacultyID'] if coord else None
-    conn.close()
+    profile = get_user_profile(user_id)
+    faculty_id = profile['faculty_id'] if profile else None
 
+    # The coordinator's own papers belong to their faculty too, so one indexed lookup covers both
     base_query = '''
-        SELECT DISTINCT p.* FROM Paper p
-        LEFT JOIN Lecturer l ON p.LecturerID = l.LecturerID
-        LEFT JOIN Student s ON p.StudentID = s.StudentID
-        LEFT JOIN ProgrammeCoordinator c ON p.CoordinatorID = c.CoordinatorID
-        WHERE (p.CoordinatorID = ? OR l.FacultyID = ? OR s.FacultyID = ? OR c.FacultyID = ?)
+        SELECT p.* FROM Paper p
+        WHERE p.PaperID IN (SELECT PaperID FROM PaperFaculty WHERE FacultyID = ?)
     '''
-    base_params = [user_id, faculty_id, faculty_id, faculty_id]
+    base_params = [faculty_id]
     
-    papers, total, pages, current_page = get_filtered_papers(base_query, base_params, page)
+    papers, total, pages, current_page, cursors = get_filtered_papers(base_query, base_params, page)
     
     return render_template('coordinator/coordinator_publicationStatus.html', 
-                           papers=papers, total=total, pages=pages, current_page=current_page, current_user_id=user_id)
+                           papers=papers, total=total, pages=pages, current_page=current_page, cursors=cursors, current_user_id=user_id)
 
 
 @app.route('/coordinator/requests', methods=['GET', 'POST'])
@@ -998,7 +2781,6 @@ def coordinator_review():
     paper_id = request.args.get('id')
     conn = get_db_connection()
     paper = conn.execute("SELECT * FROM Paper WHERE PaperID = ?", (paper_id,)).fetchone()
-    conn.close()
     return render_template('coordinator/coordinator_review_detail.html', paper=paper)
 
 # LECTURER/STUDENT -----------------------------------------------------------------------
@@ -1020,31 +2802,34 @@ def lecturer_student_dashboard():
                            year_filter=year_filter, years=all_years) # Passed 'years'
 
 @app.route('/academic/bookmarks')
+@conditional_on_data('Paper', 'Bookmarks')
 def lecturer_student_bookmarks():
     page = request.args.get('page', 1, type=int)
-    papers, total, pages, current = get_bookmarked_papers(session.get('user_id'), page)
+    papers, total, pages, current, cursors = get_bookmarked_papers(session.get('user_id'), page)
     return render_template('lecturerStudent/lecturerStudent_bookmarks.html', 
-                           papers=papers, total=total, pages=pages, current_page=current)
+                           papers=papers, total=total, pages=pages, current_page=current, cursors=cursors)
 
-@app.route('/academic/search_results') 
+@app.route('/academic/search_results')
+@conditional_on_data('Paper', 'Bookmarks')
 def lecturer_student_search_results():
     page = request.args.get('page', 1, type=int)
-    papers, total, pages, current = get_public_search_results(session.get('user_id'), page)
+    papers, total, pages, current, cursors = get_public_search_results(session.get('user_id'), page)
     return render_template('lecturerStudent/lecturerStudent_publicationresults.html', 
-                           papers=papers, total=total, pages=pages, current_page=current)
+                           papers=papers, total=total, pages=pages, current_page=current, cursors=cursors)
 
 @app.route('/academic/status')
+@conditional_on_data('Paper', 'Users')
 def lecturer_student_status():
     user_id = session.get('user_id')
     page = request.args.get('page', 1, type=int)
     
-    base_query = "SELECT * FROM Paper WHERE (LecturerID = ? OR StudentID = ?)"
-    base_params = [user_id, user_id]
+    base_query = "SELECT * FROM Paper WHERE PaperID IN (SELECT PaperID FROM PaperAuthor WHERE UserID = ?)"
+    base_params = [user_id]
     
-    papers, total, pages, current_page = get_filtered_papers(base_query, base_params, page)
+    papers, total, pages, current_page, cursors = get_filtered_papers(base_query, base_params, page)
     
     return render_template('lecturerStudent/lecturerStudent_publicationStatus.html', 
-                           papers=papers, total=total, pages=pages, current_page=current_page)
+                           papers=papers, total=total, pages=pages, current_page=current_page, cursors=cursors)
 
 @app.route('/academic/requests', methods=['GET', 'POST'])
 def lecturer_student_requests():
@@ -1055,6 +2840,306 @@ def lecturer_student_requests():
             return redirect(url_for('lecturer_student_dashboard'))
     return render_template('lecturerStudent/lecturerStudent_trackingRequests.html')
 
+@app.cli.command('migrate-db')
+def migrate_db_command():
+    """Applies pending schema migrations and refreshes the planner statistics."""
+    conn = get_db_connection()
+    before = conn.execute("PRAGMA user_version").fetchone()[0]
+    applied = run_migrations(conn)
+    if applied:
+        print(f"Migrated schema from version {before} to {applied[-1]}.")
+    else:
+        print(f"Schema is up to date at version {before}.")
+
+@app.cli.command('rebuild-search-index')
+def rebuild_search_index_command():
+    """Backfills the full-text search index from existing papers."""
+    indexed = rebuild_search_index()
+    print(f"Indexed {indexed} papers.")
+
+@app.cli.command('rebuild-author-lookup')
+def rebuild_author_lookup_command():
+    """Backfills the normalized author-name lookup from the user tables."""
+    indexed = rebuild_author_lookup()
+    print(f"Indexed {indexed} author names.")
+
+@app.cli.command('rebuild-paper-authors')
+def rebuild_paper_authors_command():
+    """Backfills PaperAuthor from the comma-separated Paper.Authors lists."""
+    linked = rebuild_paper_authors()
+    print(f"Recorded {linked} paper authors.")
+
+@app.cli.command('rebuild-paper-faculty')
+def rebuild_paper_faculty_command():
+    """Backfills the faculties each paper belongs to from its linked users."""
+    linked = rebuild_paper_faculty()
+    print(f"Recorded {linked} paper faculties.")
+
+@app.cli.command('rebuild-paper-stats')
+def rebuild_paper_stats_command():
+    """Checks the dashboard summary tables against the raw data and rebuilds them."""
+    mismatches = rebuild_paper_stats()
+    for table, key, stored, expected in mismatches:
+        print(f"{table} {key}: stored {stored}, expected {expected}")
+    print(f"Summary tables rebuilt, {len(mismatches)} inconsistent rows corrected.")
+
+@app.cli.command('rebuild-user-identity')
+def rebuild_user_identity_command():
+    """Backfills the user ID index used by login and user search."""
+    indexed = rebuild_user_identity()
+    print(f"Indexed {indexed} users.")
+
+@app.cli.command('benchmark-login')
+@click.option('--logins', default=2000, show_default=True, help="Login attempts per measurement.")
+@click.option('--seed', default=0, show_default=True, help="Seed for picking which users log in.")
+def benchmark_login_command(logins, seed):
+    """Compares login throughput of the identity index against probing each user table in turn."""
+    conn = get_db_connection()
+    accounts = []
+    for role, (_, pk) in USER_ROLES.items():
+        password_col = pk.replace('ID', 'Password')
+        accounts.extend(conn.execute(f"SELECT {pk}, {password_col} FROM {role}").fetchall())
+    if not accounts:
+        raise click.ClickException("There are no users to log in as.")
+    attempts = [tuple(account) for account in random.Random(seed).choices(accounts, k=logins)]
+
+    def probe_each_table(user_id, password):
+        # The previous login: Admin, then coordinator, lecturer and student until one matches
+        for role in ['Admin', 'ProgrammeCoordinator', 'Lecturer', 'Student']:
+            pk = USER_ROLES[role][1]
+            if conn.execute(f"SELECT * FROM {role} WHERE {pk} = ? AND {pk.replace('ID', 'Password')} = ?",
+                            (user_id, password)).fetchone():
+                return role
+        return None
+
+    def measure(authenticate):
+        started = time.perf_counter()
+        for user_id, password in attempts:
+            if authenticate(user_id, password) is None:
+                raise click.ClickException(f"Login failed for {user_id}.")
+        return logins / (time.perf_counter() - started)
+
+    legacy_rate = measure(probe_each_table)
+    indexed_rate = measure(lambda user_id, password: authenticate_user(conn, user_id, password))
+    click.echo(f"Probing each table: {legacy_rate:,.0f} logins/s")
+    click.echo(f"Identity index:     {indexed_rate:,.0f} logins/s ({indexed_rate / legacy_rate:.1f}x)")
+
+    # The whole route, including session and redirect, through the test client
+    client = app.test_client()
+    started = time.perf_counter()
+    for user_id, password in attempts:
+        response = client.post('/login', data={'user_id': user_id, 'password': password})
+        if response.status_code != 302 or response.headers['Location'].endswith('/login'):
+            raise click.ClickException(f"Login route failed for {user_id}.")
+    click.echo(f"POST /login:        {logins / (time.perf_counter() - started):,.0f} logins/s")
+
+@app.cli.command('generate-data')
+@click.option('--faculties', default=5, show_default=True, help="Faculties to create (F01, F02, ...).")
+@click.option('--coordinators', default=2, show_default=True, help="Programme coordinators per faculty.")
+@click.option('--lecturers', default=10, show_default=True, help="Lecturers per faculty.")
+@click.option('--students', default=50, show_default=True, help="Students per faculty.")
+@click.option('--papers', default=1000, show_default=True, help="Papers in total.")
+@click.option('--coauthors', default='30,40,20,10', show_default=True,
+              help="Relative weights of 0, 1, 2, ... co-authors per paper.")
+@click.option('--years', default='2010-2025', show_default=True, help="Publication year range.")
+@click.option('--status-mix', default='Approved=70,Under Review=20,Rejected=10', show_default=True,
+              help="Relative weight of each paper status.")
+@click.option('--bookmarks', default=10, show_default=True, help="Bookmarks per user.")
+@click.option('--seed', default=0, show_default=True, help="Seed; the same options and seed give the same data.")
+def generate_data_command(faculties, coordinators, lecturers, students, papers, coauthors, years, status_mix, bookmarks, seed):
+    """Fills the database with generated faculties, users, papers and bookmarks at any scale."""
+    try:
+        coauthor_weights = [int(weight) for weight in coauthors.split(',')]
+        first_year, last_year = (int(year) for year in years.split('-'))
+        statuses = [(status.strip(), int(weight)) for status, weight in
+                    (entry.rsplit('=', 1) for entry in status_mix.split(','))]
+    except ValueError:
+        raise click.BadParameter("Use the formats shown in --help.")
+    unknown = [status for status, _ in statuses if status not in ('Approved', 'Under Review', 'Rejected')]
+    if unknown:
+        raise click.BadParameter(f"Unknown status(es): {', '.join(unknown)}", param_hint='--status-mix')
+
+    init_db()
+    started = time.perf_counter()
+    try:
+        counts = generate_synthetic_data(faculties=faculties, coordinators_per_faculty=coordinators,
+                                         lecturers_per_faculty=lecturers, students_per_faculty=students,
+                                         papers=papers, coauthor_weights=coauthor_weights,
+                                         years=(first_year, last_year), status_mix=statuses,
+                                         bookmarks_per_user=bookmarks, seed=seed)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    for table, count in counts.items():
+        print(f"{table}: {count:,}")
+    print(f"Generated in {time.perf_counter() - started:.1f}s.")
+
+@app.cli.command('seed-user-sequences')
+def seed_user_sequences_command():
+    """Raises the user ID sequences past any IDs created outside the app."""
+    seeded = seed_user_sequences()
+    print(f"Checked {seeded} user ID sequences.")
+
+@app.cli.command('export-papers')
+@click.option('--format', 'fmt', type=click.Choice(list(EXPORT_FORMATS)), default='csv', help="Output format.")
+@click.option('--status', default='', help="Only papers with this status.")
+@click.option('--type', 'paper_type', default='', help="Only papers of this type.")
+@click.option('--year', default='', help="Only papers published in this year.")
+@click.option('--query', default='', help="Full-text search over title, authors and DOI.")
+@click.option('--since', default='', help="Only papers changed at or after this ISO date/datetime (UTC).")
+@click.option('--output', '-o', default='-', help="File to write; defaults to stdout.")
+def export_papers_command(fmt, status, paper_type, year, query, since, output):
+    """Streams the publication catalogue as CSV, NDJSON or BibTeX."""
+    since_value = None
+    if since:
+        since_value = parse_since(since)
+        if since_value is None:
+            raise click.BadParameter("must be an ISO date or datetime", param_hint='--since')
+
+    filters = {'query': query, 'filter_type': paper_type, 'filter_status': status, 'filter_year': year}
+    conn = get_db_connection()
+    conn.execute("BEGIN")
+    watermark, cursor = query_paper_export(conn, filters, since_value)
+    with click.open_file(output, 'wb') as out:
+        for chunk in render_paper_export(fmt, cursor):
+            out.write(chunk)
+    conn.rollback()
+    # The next incremental run should start from here
+    click.echo(f"Watermark: {watermark}", err=True)
+
+@app.cli.command('import-papers')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--covers', 'covers_path', type=click.Path(exists=True, dir_okay=False),
+              help="Zip of the cover images named in the file's cover column or field.")
+@click.option('--status', type=click.Choice(IMPORT_STATUSES), default='Approved', help="Status given to imported papers.")
+@click.option('--admin', 'admin_id', default=None, help="AdminID recorded on the imported papers.")
+@click.option('--dry-run', is_flag=True, help="Validate every row without writing anything.")
+def import_papers_command(path, covers_path, status, admin_id, dry_run):
+    """Bulk-imports papers from a CSV or BibTeX file in one transaction."""
+    with open(path, 'rb') as f:
+        try:
+            records = read_import_records(path, f.read())
+        except ValueError as e:
+            raise click.ClickException(str(e))
+
+    covers = zipfile.ZipFile(covers_path) if covers_path else None
+    conn = get_db_connection()
+    # The CLI runs with admin rights, so the staff check is bypassed as for a web admin
+    accepted, errors = import_papers(conn, records, covers, status, dry_run, admin_id,
+                                     progress=lambda stage, done, total: click.echo(f"{stage} {done}/{total}", err=True),
+                                     bypass_staff_check=True)
+
+    for line, title, message in errors:
+        click.echo(f"Line {line} ({title}): {message}")
+    verb = "Would import" if dry_run else "Imported"
+    click.echo(f"{verb} {accepted} of {len(records)} papers; {len(errors)} rejected.")
+
+@app.cli.command('provision-users')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--admin', 'admin_id', required=True, help="AdminID recorded as the creator of the new users.")
+@click.option('--output', '-o', default='-', help="File to write the row-to-ID mapping to; defaults to stdout.")
+@click.option('--dry-run', is_flag=True, help="Validate every row without writing anything.")
+def provision_users_command(path, admin_id, output, dry_run):
+    """Creates users of any role from a CSV file in one transaction."""
+    with open(path, 'rb') as f:
+        try:
+            records = read_user_records(f.read())
+        except ValueError as e:
+            raise click.ClickException(str(e))
+
+    conn = get_db_connection()
+    if not conn.execute("SELECT 1 FROM Admin WHERE AdminID = ?", (admin_id,)).fetchone():
+        raise click.ClickException(f"Unknown admin '{admin_id}'.")
+    mapping, errors = provision_users(conn, records, dry_run, admin_id)
+
+    for line, name, message in errors:
+        click.echo(f"Line {line} ({name}): {message}", err=True)
+    if errors:
+        raise click.ClickException(f"{len(errors)} of {len(records)} rows rejected; no users were created.")
+
+    with click.open_file(output, 'wb') as out:
+        for chunk in render_rows_csv(PROVISION_MAPPING_COLUMNS, mapping):
+            out.write(chunk)
+    verb = "Would create" if dry_run else "Created"
+    click.echo(f"{verb} {len(mapping)} users.", err=True)
+
+@app.cli.command('backfill-cover-thumbnails')
+def backfill_cover_thumbnails_command():
+    """Generates thumbnails and previews for covers uploaded before derivatives existed."""
+    conn = get_db_connection()
+    rows = conn.execute("SELECT PaperID, CoverImage FROM Paper WHERE CoverImage IS NOT NULL AND CoverThumb IS NULL").fetchall()
+
+    done = 0
+    for row in rows:
+        cover_thumb, cover_preview = generate_cover_derivatives(row['CoverImage'])
+        if cover_thumb is None:
+            print(f"Skipped {row['PaperID']}: could not read {row['CoverImage']}")
+            continue
+        conn.execute("UPDATE Paper SET CoverThumb = ?, CoverPreview = ? WHERE PaperID = ?",
+                     (cover_thumb, cover_preview, row['PaperID']))
+        done += 1
+        if done % 100 == 0:
+            conn.commit()
+    conn.commit()
+    print(f"Generated derivatives for {done} of {len(rows)} covers.")
+
+@app.cli.command('migrate-cover-storage')
+def migrate_cover_storage_command():
+    """Moves covers saved under random names into the content-addressed store, merging duplicates."""
+    conn = get_db_connection()
+    upload_folder = app.config['UPLOAD_FOLDER']
+    rows = conn.execute('''
+        SELECT CoverImage, MAX(CoverThumb) as CoverThumb, MAX(CoverPreview) as CoverPreview FROM Paper
+        WHERE CoverImage IS NOT NULL AND CoverImage NOT LIKE 'blobs/%'
+        GROUP BY CoverImage
+    ''').fetchall()
+
+    moved = 0
+    for row in rows:
+        old_path = os.path.join(upload_folder, row['CoverImage'])
+        if not os.path.exists(old_path):
+            print(f"Missing file for {row['CoverImage']}")
+            continue
+
+        with open(old_path, 'rb') as source:
+            header = source.read(16)
+            ext = sniff_image_type(header)
+            if ext is None:
+                print(f"Skipped {row['CoverImage']}: not a PNG or JPEG")
+                continue
+            source.seek(0)
+            sha = hashlib.sha256()
+            for chunk in iter(lambda: source.read(64 * 1024), b''):
+                sha.update(chunk)
+
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(old_path), suffix='.part')
+        os.close(fd)
+        shutil.copyfile(old_path, temp_path)
+        cover_image, cover_thumb, cover_preview = register_cover_blob(conn, temp_path, sha.hexdigest(), ext, os.path.getsize(old_path))
+
+        conn.execute("UPDATE Paper SET CoverImage = ?, CoverThumb = ?, CoverPreview = ? WHERE CoverImage = ?",
+                     (cover_image, cover_thumb, cover_preview, row['CoverImage']))
+        conn.commit()
+        for path in [row['CoverImage'], row['CoverThumb'], row['CoverPreview']]:
+            if path and path not in (cover_thumb, cover_preview) and os.path.exists(os.path.join(upload_folder, path)):
+                os.remove(os.path.join(upload_folder, path))
+        moved += 1
+
+    print(f"Migrated {moved} of {len(rows)} cover files.")
+
+@app.cli.command('gc-covers')
+def gc_covers_command():
+    """Deletes stored covers that no paper references any more."""
+    conn = get_db_connection()
+    upload_folder = app.config['UPLOAD_FOLDER']
+    rows = conn.execute("SELECT Hash, CoverImage, CoverThumb, CoverPreview FROM CoverBlob WHERE RefCount <= 0").fetchall()
+    for row in rows:
+        for path in [row['CoverImage'], row['CoverThumb'], row['CoverPreview']]:
+            if path and os.path.exists(os.path.join(upload_folder, path)):
+                os.remove(os.path.join(upload_folder, path))
+        conn.execute("DELETE FROM CoverBlob WHERE Hash = ?", (row['Hash'],))
+    conn.commit()
+    print(f"Removed {len(rows)} unreferenced covers.")
+
 if __name__ == '__main__':
     init_db() 
     populate_db()
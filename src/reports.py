@@ -0,0 +1,425 @@
+"""
+Server-side report and export rendering. A report is an iterable of blocks:
+
+    ('heading', text)
+    ('table', title, [(header, width_fraction), ...], rows)
+    ('chart', title, labels, values, colour)
+    ('page',)
+
+Table rows are consumed lazily and output is yielded page by page (PDF) or
+in batches of rows (CSV), so a report built over a database cursor is never
+held in memory as a whole.
+
+Exports are flat row streams rendered as CSV, NDJSON or BibTeX in the same
+constant-memory fashion; `parse_bibtex` reads BibTeX back for imports.
+"""
+import csv
+import io
+import json
+import re
+import zlib
+
+PAGE_WIDTH, PAGE_HEIGHT = 595, 842  # A4, in points
+MARGIN = 40
+CONTENT_WIDTH = PAGE_WIDTH - 2 * MARGIN
+CSV_BATCH_ROWS = 500
+
+# Helvetica advance widths (1/1000 em) for ASCII 32-126, from the standard AFM
+HELVETICA_WIDTHS = [
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+]
+
+CHAR_WIDTHS = {chr(32 + i): width for i, width in enumerate(HELVETICA_WIDTHS)}
+
+def text_width(text, size, bold=False):
+    units = sum(CHAR_WIDTHS.get(ch, 556) for ch in text)
+    # Helvetica-Bold runs roughly 5% wider; close enough for layout
+    return units * size / 1000 * (1.05 if bold else 1)
+
+def split_to_width(text, width, size, bold=False):
+    """Returns how many leading characters of `text` fit in `width`."""
+    limit = width * 1000 / size / (1.05 if bold else 1)
+    used = 0
+    for i, ch in enumerate(text):
+        used += CHAR_WIDTHS.get(ch, 556)
+        if used > limit:
+            return i
+    return len(text)
+
+def fit_text(text, width, size, bold=False):
+    if text_width(text, size, bold) <= width:
+        return text
+    return text[:split_to_width(text, width - text_width('...', size, bold), size, bold)] + '...'
+
+def wrap_text(text, width, size):
+    space = text_width(' ', size)
+    lines = []
+    line, line_width = '', 0
+    for word in text.split():
+        word_width = text_width(word, size)
+        if line and line_width + space + word_width <= width:
+            line, line_width = f"{line} {word}", line_width + space + word_width
+            continue
+        if line:
+            lines.append(line)
+        # Words wider than the column are broken by character
+        while word_width > width and len(word) > 1:
+            cut = max(split_to_width(word, width, size), 1)
+            lines.append(word[:cut])
+            word = word[cut:]
+            word_width = text_width(word, size)
+        line, line_width = word, word_width
+    if line:
+        lines.append(line)
+    return lines or ['']
+
+def hex_to_rgb(colour):
+    colour = colour.lstrip('#')
+    return tuple(int(colour[i:i + 2], 16) / 255 for i in (0, 2, 4))
+
+def pdf_string(text):
+    text = ' '.join(str(text).split())
+    data = text.encode('cp1252', 'replace')
+    return b'(' + data.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)') + b')'
+
+class PdfStream:
+    """
+    Minimal PDF writer using the built-in Helvetica fonts. Finished pages
+    are serialised immediately; `drain()` hands back the bytes written so
+    far so they can be streamed before the document is complete.
+    """
+    def __init__(self):
+        self.pending = []
+        self.offset = 0
+        self.offsets = {}
+        self.page_ids = []
+        self.next_id = 5  # 1 catalog, 2 page tree, 3-4 fonts
+        self.ops = []
+        self.y = PAGE_HEIGHT - MARGIN
+
+        self.emit(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+        self.write_object(1, b'<< /Type /Catalog /Pages 2 0 R >>')
+        self.write_object(3, b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>')
+        self.write_object(4, b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>')
+
+    def emit(self, data):
+        self.pending.append(data)
+        self.offset += len(data)
+
+    def drain(self):
+        data = b''.join(self.pending)
+        self.pending = []
+        return data
+
+    def write_object(self, obj_id, body):
+        self.offsets[obj_id] = self.offset
+        self.emit(f"{obj_id} 0 obj\n".encode() + body + b"\nendobj\n")
+
+    def allocate(self):
+        self.next_id += 1
+        return self.next_id - 1
+
+    def text(self, x, y, text, size=9, bold=False, colour=(0, 0, 0)):
+        font = b'/F2' if bold else b'/F1'
+        self.ops.append(b'BT %s %d Tf %.3f %.3f %.3f rg %.2f %.2f Td %s Tj ET'
+                        % (font, size, colour[0], colour[1], colour[2], x, y, pdf_string(text)))
+
+    def rect(self, x, y, width, height, colour):
+        self.ops.append(b'%.3f %.3f %.3f rg %.2f %.2f %.2f %.2f re f'
+                        % (colour[0], colour[1], colour[2], x, y, width, height))
+
+    def ensure_space(self, height):
+        """Starts a new page unless `height` points fit above the bottom margin."""
+        if self.y - height < MARGIN and self.y < PAGE_HEIGHT - MARGIN:
+            self.finish_page()
+            return True
+        return False
+
+    def finish_page(self):
+        content = zlib.compress(b'\n'.join(self.ops))
+        content_id = self.allocate()
+        page_id = self.allocate()
+        self.write_object(content_id, b'<< /Length %d /Filter /FlateDecode >>\nstream\n%s\nendstream'
+                          % (len(content), content))
+        self.write_object(page_id, b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] '
+                          b'/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> /Contents %d 0 R >>'
+                          % (PAGE_WIDTH, PAGE_HEIGHT, content_id))
+        self.page_ids.append(page_id)
+        self.ops = []
+        self.y = PAGE_HEIGHT - MARGIN
+
+    def close(self):
+        if self.ops or not self.page_ids:
+            self.finish_page()
+        kids = b' '.join(b'%d 0 R' % page_id for page_id in self.page_ids)
+        self.write_object(2, b'<< /Type /Pages /Kids [%s] /Count %d >>' % (kids, len(self.page_ids)))
+
+        xref_offset = self.offset
+        lines = [b'xref', b'0 %d' % self.next_id, b'0000000000 65535 f ']
+        lines += [b'%010d 00000 n ' % self.offsets[obj_id] for obj_id in range(1, self.next_id)]
+        lines += [b'trailer', b'<< /Size %d /Root 1 0 R >>' % self.next_id,
+                  b'startxref', b'%d' % xref_offset, b'%%EOF', b'']
+        self.emit(b'\n'.join(lines))
+
+def draw_heading(pdf, text):
+    pdf.ensure_space(60)
+    size = 16
+    title = fit_text(text, CONTENT_WIDTH, size, bold=True)
+    pdf.text((PAGE_WIDTH - text_width(title, size, bold=True)) / 2, pdf.y - size, title, size, bold=True,
+             colour=(0.16, 0.16, 0.16))
+    pdf.y -= size + 16
+
+def draw_subtitle(pdf, text):
+    pdf.text(MARGIN, pdf.y - 12, fit_text(text, CONTENT_WIDTH, 12, bold=True), 12, bold=True, colour=(0.16, 0.16, 0.16))
+    pdf.y -= 22
+
+def draw_table(pdf, title, columns, rows, max_lines=6):
+    """Draws a striped table, repeating the header on every page. Yields once per row."""
+    widths = [CONTENT_WIDTH * fraction for _, fraction in columns]
+    size, leading, header_height = 9, 11, 18
+
+    def draw_header():
+        pdf.rect(MARGIN, pdf.y - header_height, CONTENT_WIDTH, header_height, hex_to_rgb('#3b82f6'))
+        x = MARGIN
+        for (header, _), width in zip(columns, widths):
+            pdf.text(x + 4, pdf.y - 12.5, fit_text(header, width - 8, size, bold=True), size, bold=True, colour=(1, 1, 1))
+            x += width
+        pdf.y -= header_height
+
+    pdf.ensure_space(80)
+    if title:
+        draw_subtitle(pdf, title)
+    draw_header()
+
+    count = 0
+    for row in rows:
+        cells = []
+        for value, width in zip(row, widths):
+            lines = wrap_text('' if value is None else str(value), width - 8, size)
+            if len(lines) > max_lines:
+                lines = lines[:max_lines - 1] + [fit_text(' '.join(lines[max_lines - 1:]), width - 8, size)]
+            cells.append(lines)
+        height = max(len(lines) for lines in cells) * leading + 6
+
+        if pdf.ensure_space(height):
+            draw_header()
+        if count % 2:
+            pdf.rect(MARGIN, pdf.y - height, CONTENT_WIDTH, height, (0.95, 0.95, 0.96))
+        x = MARGIN
+        for lines, width in zip(cells, widths):
+            for i, line in enumerate(lines):
+                pdf.text(x + 4, pdf.y - 1 - leading * (i + 1), line, size)
+            x += width
+        pdf.y -= height
+        count += 1
+        yield
+
+    if count == 0:
+        pdf.text(MARGIN + 4, pdf.y - 14, "No publications found.", size, colour=(0.4, 0.4, 0.4))
+        pdf.y -= 18
+    pdf.y -= 16
+
+def draw_chart(pdf, title, labels, values, colour):
+    """Horizontal bar chart; bars are vector shapes, so no image rendering is needed."""
+    if not labels:
+        return
+    bar_height, gap, label_width = 14, 6, 160
+    bar_space = CONTENT_WIDTH - label_width - 40
+    peak = max(values) or 1
+
+    pdf.ensure_space(40 + min(len(labels), 5) * (bar_height + gap))
+    draw_subtitle(pdf, title)
+    for label, value in zip(labels, values):
+        pdf.ensure_space(bar_height + gap)
+        top = pdf.y
+        pdf.text(MARGIN, top - 10.5, fit_text(str(label), label_width - 8, 9), 9, colour=(0.2, 0.2, 0.2))
+        bar = max(bar_space * value / peak, 1)
+        pdf.rect(MARGIN + label_width, top - bar_height, bar, bar_height, hex_to_rgb(colour))
+        pdf.text(MARGIN + label_width + bar + 4, top - 10.5, str(value), 9, colour=(0.2, 0.2, 0.2))
+        pdf.y -= bar_height + gap
+    pdf.y -= 16
+
+def render_pdf(blocks):
+    pdf = PdfStream()
+    for block in blocks:
+        kind = block[0]
+        if kind == 'heading':
+            draw_heading(pdf, block[1])
+        elif kind == 'table':
+            for _ in draw_table(pdf, *block[1:]):
+                if pdf.pending:
+                    yield pdf.drain()
+        elif kind == 'chart':
+            draw_chart(pdf, *block[1:])
+        elif kind == 'page' and pdf.ops:
+            pdf.finish_page()
+        if pdf.pending:
+            yield pdf.drain()
+    pdf.close()
+    yield pdf.drain()
+
+def render_csv(blocks):
+    """Writes every table as its own section: a header row, then its rows, tagged with the section title."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    first = True
+    for block in blocks:
+        if block[0] != 'table':
+            continue
+        _, title, columns, rows = block
+        if not first:
+            writer.writerow([])
+        first = False
+        section = title or 'Report'
+        writer.writerow(['Section'] + [header for header, _ in columns])
+        for count, row in enumerate(rows, 1):
+            writer.writerow([section] + list(row))
+            if count % CSV_BATCH_ROWS == 0:
+                yield buffer.getvalue().encode('utf-8')
+                buffer.seek(0)
+                buffer.truncate()
+    yield buffer.getvalue().encode('utf-8')
+
+def render_rows_csv(columns, rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for count, row in enumerate(rows, 1):
+        writer.writerow(list(row))
+        if count % CSV_BATCH_ROWS == 0:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode('utf-8')
+
+def render_ndjson(columns, rows):
+    batch = []
+    for row in rows:
+        batch.append(json.dumps(dict(zip(columns, row)), ensure_ascii=False))
+        if len(batch) == CSV_BATCH_ROWS:
+            yield ('\n'.join(batch) + '\n').encode('utf-8')
+            batch = []
+    if batch:
+        yield ('\n'.join(batch) + '\n').encode('utf-8')
+
+def bibtex_escape(value):
+    value = ' '.join(str(value).split()).replace('\\', '\\textbackslash ')
+    for ch in '{}%&$#_':
+        value = value.replace(ch, '\\' + ch)
+    return value
+
+def render_bibtex(entries):
+    """Renders (entry_type, key, [(field, value), ...]) entries; empty fields are left out."""
+    batch = []
+    for entry_type, key, fields in entries:
+        lines = [f"@{entry_type}{{{key},"]
+        lines += [f"  {name} = {{{bibtex_escape(value)}}}," for name, value in fields if value]
+        lines.append("}\n")
+        batch.append('\n'.join(lines))
+        if len(batch) == CSV_BATCH_ROWS:
+            yield ('\n'.join(batch) + '\n').encode('utf-8')
+            batch = []
+    if batch:
+        yield ('\n'.join(batch) + '\n').encode('utf-8')
+
+BIBTEX_ENTRY = re.compile(r'@\s*(\w+)\s*([{(])')
+BIBTEX_FIELD = re.compile(r'\s*([\w:.-]+)\s*=\s*')
+BIBTEX_KEY = re.compile(r'\s*([^,\s}]*)\s*,?')
+BIBTEX_BARE = re.compile(r'[^\s,#})]+')
+
+def read_bibtex_value(text, pos):
+    """Reads a braced, quoted or bare value (with # concatenation) starting at pos. Returns (value, end)."""
+    parts = []
+    while True:
+        while pos < len(text) and text[pos].isspace():
+            pos += 1
+        if pos >= len(text):
+            raise ValueError("unexpected end of entry")
+        if text[pos] in '{"':
+            closing = '}' if text[pos] == '{' else '"'
+            depth, start = 0, pos + 1
+            pos += 1
+            while pos < len(text) and not (text[pos] == closing and depth == 0 and text[pos - 1] != '\\'):
+                if text[pos] == '{' and text[pos - 1] != '\\':
+                    depth += 1
+                elif text[pos] == '}' and text[pos - 1] != '\\':
+                    depth -= 1
+                pos += 1
+            if pos >= len(text):
+                raise ValueError("unbalanced braces")
+            parts.append(text[start:pos])
+            pos += 1
+        else:
+            match = BIBTEX_BARE.match(text, pos)
+            if not match:
+                raise ValueError("missing value")
+            parts.append(match.group(0))
+            pos = match.end()
+        while pos < len(text) and text[pos].isspace():
+            pos += 1
+        if pos < len(text) and text[pos] == '#':
+            pos += 1
+            continue
+        return ''.join(parts), pos
+
+def clean_bibtex_value(value):
+    # Grouping braces are dropped; escaped characters (including braces) are kept literally
+    value = re.sub(r'\\textbackslash(\{\}|\s)?', '\x02', value)
+    value = value.replace('\\{', '\x00').replace('\\}', '\x01').replace('{', '').replace('}', '')
+    value = re.sub(r'\\([&%$#_])', r'\1', value)
+    value = value.replace('\x00', '{').replace('\x01', '}').replace('\x02', '\\')
+    return ' '.join(value.split())
+
+def parse_bibtex(text):
+    """
+    Yields (line, entry_type, key, fields) per entry, with lower-cased field
+    names and LaTeX braces/escapes removed. A malformed entry is yielded
+    with fields set to None, and parsing resumes at the next '@'.
+    """
+    pos = 0
+    # Lines are counted incrementally; recounting from the top for each entry is quadratic
+    line, counted = 1, 0
+    while True:
+        start = text.find('@', pos)
+        if start < 0:
+            return
+        match = BIBTEX_ENTRY.match(text, start)
+        if not match:
+            pos = start + 1
+            continue
+
+        entry_type = match.group(1).lower()
+        line += text.count('\n', counted, start)
+        counted = start
+        closing = '}' if match.group(2) == '{' else ')'
+        pos = match.end()
+        if entry_type in ('comment', 'preamble', 'string'):
+            continue
+
+        key = BIBTEX_KEY.match(text, pos)
+        pos = key.end()
+        fields = {}
+        try:
+            while True:
+                while pos < len(text) and (text[pos].isspace() or text[pos] == ','):
+                    pos += 1
+                if pos >= len(text):
+                    raise ValueError("unterminated entry")
+                if text[pos] == closing:
+                    pos += 1
+                    break
+                field = BIBTEX_FIELD.match(text, pos)
+                if not field:
+                    raise ValueError("expected a field")
+                value, pos = read_bibtex_value(text, field.end())
+                fields[field.group(1).lower()] = clean_bibtex_value(value)
+        except ValueError:
+            yield line, entry_type, key.group(1), None
+            pos = start + 1
+            continue
+        yield line, entry_type, key.group(1), fields
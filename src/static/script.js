@@ -19,8 +19,10 @@ document.addEventListener("DOMContentLoaded", function() {
             <a href="/admin/bookmarks"><i class="fas fa-bookmark"></i> Bookmarks</a>
             <a href="/admin/dashboard"><i class="fas fa-chart-pie"></i> Analytics</a>
             <a href="/admin/requests"><i class="fas fa-clipboard-list"></i> Request Tracking</a>
+            <a href="/admin/import"><i class="fas fa-file-import"></i> Bulk Import</a>
             <a href="/admin/status"><i class="fas fa-tasks"></i> Publication Status</a>
             <a href="/admin/users"><i class="fas fa-users-cog"></i> User Management</a>
+            <a href="/admin/users/provision"><i class="fas fa-users"></i> Bulk Users</a>
         `;
     } else if (role === 'coordinator') {
         homeLink = '/coordinator/home';
@@ -74,6 +76,8 @@ document.addEventListener("DOMContentLoaded", function() {
             }
         });
     });
+
+    document.querySelectorAll('input[data-typeahead]').forEach(setupTypeahead);
 });
 
 function toggleMenu() {
@@ -117,4 +121,83 @@ function previewImage(input) {
         }
         reader.readAsDataURL(input.files[0]);
     }
-}
\ No newline at end of file
+}
+
+function setupTypeahead(input) {
+    const container = input.closest('.search-container') || input.parentElement;
+    const list = document.createElement('ul');
+    list.className = 'typeahead-list';
+    container.appendChild(list);
+
+    const icons = { title: 'fa-file-alt', author: 'fa-user', doi: 'fa-link' };
+    let timer = null;
+    let active = -1;
+    let lastQuery = '';
+
+    function close() {
+        list.innerHTML = '';
+        list.style.display = 'none';
+        active = -1;
+    }
+
+    function choose(label) {
+        input.value = label;
+        close();
+        if (input.form) input.form.submit();
+    }
+
+    function highlight(index) {
+        const items = list.querySelectorAll('li');
+        items.forEach((item, i) => item.classList.toggle('active', i === index));
+        active = index;
+    }
+
+    function render(suggestions) {
+        list.innerHTML = '';
+        suggestions.forEach(s => {
+            const item = document.createElement('li');
+            const icon = document.createElement('i');
+            icon.className = 'fas ' + (icons[s.type] || 'fa-search');
+            const text = document.createElement('span');
+            text.textContent = s.label;
+            item.append(icon, text);
+            // mousedown fires before the input loses focus
+            item.addEventListener('mousedown', e => { e.preventDefault(); choose(s.label); });
+            list.appendChild(item);
+        });
+        list.style.display = suggestions.length ? 'block' : 'none';
+        active = -1;
+    }
+
+    input.addEventListener('input', () => {
+        clearTimeout(timer);
+        const query = input.value.trim();
+        if (query.length < 2) { close(); return; }
+        timer = setTimeout(() => {
+            lastQuery = query;
+            fetch(input.dataset.typeahead + '?q=' + encodeURIComponent(query))
+                .then(response => response.ok ? response.json() : { suggestions: [] })
+                .then(data => { if (query === lastQuery) render(data.suggestions || []); })
+                .catch(close);
+        }, 120);
+    });
+
+    input.addEventListener('keydown', e => {
+        const items = list.querySelectorAll('li');
+        if (!items.length) return;
+        if (e.key === 'ArrowDown') {
+            e.preventDefault();
+            highlight((active + 1) % items.length);
+        } else if (e.key === 'ArrowUp') {
+            e.preventDefault();
+            highlight((active - 1 + items.length) % items.length);
+        } else if (e.key === 'Enter' && active >= 0) {
+            e.preventDefault();
+            choose(items[active].textContent);
+        } else if (e.key === 'Escape') {
+            close();
+        }
+    });
+
+    input.addEventListener('blur', close);
+}
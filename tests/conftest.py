@@ -0,0 +1,74 @@
+import io
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+import database  # noqa: E402
+import main  # noqa: E402
+
+
+def reset_app_state():
+    # Logins start a background index build; let it finish before the database goes away
+    while main.typeahead['building']:
+        time.sleep(0.01)
+    while not main.db_pool.empty():
+        main.db_pool.get_nowait().close()
+    main.count_cache.clear()
+    main.profile_cache.clear()
+    main.search_cache.clear()
+    main.bump_search_generation()
+    main.data_stamp['rows'] = None
+    main.typeahead.update(keys=None, entries=None, built=0.0, building=False, pending=None)
+
+
+@pytest.fixture
+def empty_db(tmp_path, monkeypatch):
+    """An initialised but empty trackingsystem.db in a temp directory, with the app pointed at it."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setitem(main.app.config, 'UPLOAD_FOLDER', str(tmp_path / 'covers'))
+    monkeypatch.setitem(main.app.config, 'REPORT_CACHE_FOLDER', str(tmp_path / 'report_cache'))
+    monkeypatch.setitem(main.app.config, 'SLOW_QUERY_LOG', str(tmp_path / 'slow_queries.log'))
+    monkeypatch.setitem(main.app.config, 'TESTING', True)
+    os.makedirs(tmp_path / 'covers')
+    database.init_db()
+    reset_app_state()
+    yield tmp_path
+    reset_app_state()
+
+
+@pytest.fixture
+def db(empty_db):
+    """The sample faculties, users and papers from populate_db."""
+    database.populate_db()
+    return empty_db
+
+
+@pytest.fixture
+def client(db):
+    return main.app.test_client()
+
+
+def login(client, user_id, password):
+    response = client.post('/login', data={'user_id': user_id, 'password': password})
+    assert response.status_code == 302 and not response.headers['Location'].endswith('/login')
+    return response
+
+
+def png_bytes(color='white', size=(40, 60)):
+    from PIL import Image
+    out = io.BytesIO()
+    Image.new('RGB', size, color).save(out, 'PNG')
+    return out.getvalue()
+
+
+def submit_paper(client, authors, title='A paper', cover=None):
+    """Posts the academic tracking-request form and returns the response."""
+    return client.post('/academic/requests', data={
+        'title': title, 'authors': authors, 'date_published': '2024-01-15',
+        'url': 'http://example.org/p', 'paper_type': 'Journal',
+        'cover_page': (io.BytesIO(cover or png_bytes()), 'cover.png'),
+    })
@@ -0,0 +1,77 @@
+import sqlite3
+
+import pytest
+
+import database
+import main
+from conftest import login
+
+
+@pytest.fixture
+def conn(db):
+    conn = main.open_db_connection()
+    yield conn
+    conn.close()
+
+
+def lookup(conn, user_id):
+    row = conn.execute("SELECT Role, NormalizedName FROM AuthorLookup WHERE UserID = ?", (user_id,)).fetchone()
+    return tuple(row) if row else None
+
+
+def resolve(conn, authors, bypass_staff_check=False):
+    names = [main.clean_name(a) for a in database.split_author_names(authors)]
+    return main.resolve_author_ids(names, main.get_author_matches(conn, names), bypass_staff_check)
+
+
+def test_rebuild_indexes_every_author_role_but_not_admins(conn):
+    assert database.rebuild_author_lookup() == 15 + 10 + 25
+    assert lookup(conn, 'LEC-FCI-01') == ('Lecturer', 'dr.azman')
+    assert lookup(conn, 'STU-FCI-01') == ('Student', 'harvind')
+    assert lookup(conn, 'ADM-FCI-01') is None
+
+
+def test_names_match_regardless_of_case_and_spacing(conn):
+    matches = main.get_author_matches(conn, [main.clean_name(' DR. AZ MAN '), main.clean_name('nobody')])
+    assert [(row['UserID'], row['Role']) for row in matches['dr.azman']] == [('LEC-FCI-01', 'Lecturer')]
+    assert 'nobody' not in matches
+
+
+def test_lookups_are_chunked_for_long_author_lists(conn):
+    names = [f"ghost{n}" for n in range(1200)] + ['harvind']
+    assert list(main.get_author_matches(conn, names)) == ['harvind']
+
+
+def test_authors_resolve_to_one_user_per_role(conn):
+    assert resolve(conn, 'Dr. Azman, Harvind, Prof. Siva') == (True, None, 'LEC-FCI-01', 'STU-FCI-01', 'COO-FCI-01')
+    # The first lecturer listed is the one the paper is linked to
+    assert resolve(conn, 'Dr. Sarah, Dr. Azman') == (True, None, 'LEC-FCI-02', None, None)
+
+
+def test_resolution_enforces_the_author_rules(conn):
+    valid, message, *_ = resolve(conn, 'Dr. Azman, Sybau')
+    assert not valid and "'Sybau' is not a Final Year student" in message
+    valid, message, *_ = resolve(conn, 'Harvind, Somebody Else')
+    assert not valid and 'at least one valid Lecturer or Coordinator' in message
+    assert resolve(conn, 'Harvind', bypass_staff_check=True) == (True, None, None, 'STU-FCI-01', None)
+
+
+def test_users_already_on_the_paper_win_namesakes():
+    candidates = [('Student', 'STU-1'), ('Lecturer', 'LEC-1'), ('ProgrammeCoordinator', 'COO-1')]
+    assert database.choose_author_id(candidates) == 'LEC-1'
+    assert database.choose_author_id(candidates, {'STU-1'}) == 'STU-1'
+    assert database.choose_author_id([]) is None
+
+
+def test_admin_user_changes_keep_the_lookup_current(client):
+    login(client, 'ADM-FCI-01', 'admin123')
+    client.post('/admin/users/save', data={
+        'action': 'update', 'role': 'Lecturer', 'original_role': 'Lecturer', 'original_id': 'LEC-FCI-01',
+        'name': 'Dr. Azman Hakim', 'password': 'lec123', 'faculty': 'FCI', 'assigned_coord': 'COO-FCI-01',
+    })
+    client.post('/admin/users/save', data={'action': 'delete', 'original_role': 'Student', 'original_id': 'STU-FCI-01'})
+
+    conn = sqlite3.connect('trackingsystem.db')
+    assert lookup(conn, 'LEC-FCI-01') == ('Lecturer', 'dr.azmanhakim')
+    assert lookup(conn, 'STU-FCI-01') is None
+    conn.close()
@@ -0,0 +1,43 @@
+import database
+import main
+from conftest import login
+
+
+def any_paper_id():
+    conn = main.open_db_connection()
+    try:
+        return conn.execute("SELECT PaperID FROM Paper ORDER BY PaperID LIMIT 1").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_unchanged_listing_answers_304(client):
+    login(client, 'ADM-FCI-01', 'admin123')
+    first = client.get('/admin/search_results')
+    assert first.status_code == 200 and first.headers['ETag']
+
+    again = client.get('/admin/search_results', headers={'If-None-Match': first.headers['ETag']})
+    assert again.status_code == 304
+    assert again.headers['ETag'] == first.headers['ETag']
+
+
+def test_write_changes_the_etag(client):
+    database.generate_synthetic_data(faculties=1, papers=5)
+    login(client, 'ADM-FCI-01', 'admin123')
+    first = client.get('/admin/bookmarks')
+    paper_id = any_paper_id()
+
+    client.post('/bookmark/toggle', data={'paper_id': paper_id}, headers={'Referer': '/admin/home'})
+    after = client.get('/admin/bookmarks', headers={'If-None-Match': first.headers['ETag']})
+    assert after.status_code == 200
+    assert after.headers['ETag'] != first.headers['ETag']
+
+
+def test_etag_is_per_user(client):
+    login(client, 'COO-FCI-01', 'coord123')
+    first = client.get('/coordinator/search_results')
+    client.get('/logout')
+    login(client, 'COO-FCI-02', 'coord123')
+    second = client.get('/coordinator/search_results', headers={'If-None-Match': first.headers['ETag']})
+    assert second.status_code == 200
+    assert second.headers['ETag'] != first.headers['ETag']
@@ -0,0 +1,77 @@
+import io
+import os
+import sqlite3
+
+from PIL import Image
+
+import main
+from conftest import login, png_bytes, submit_paper
+
+
+def upload_path(name):
+    return os.path.join(main.app.config['UPLOAD_FOLDER'], name)
+
+
+def save_cover(name, data):
+    with open(upload_path(name), 'wb') as f:
+        f.write(data)
+
+
+def size_of(name):
+    with Image.open(upload_path(name)) as img:
+        return img.size
+
+
+def test_thumbnail_and_preview_are_scaled_to_width(empty_db):
+    save_cover('big.png', png_bytes(size=(1200, 1600)))
+    thumb, preview = main.generate_cover_derivatives('big.png')
+    assert thumb.startswith('derived/big_w160.') and preview.startswith('derived/big_w600.')
+    assert size_of(thumb) == (160, 213)
+    assert size_of(preview) == (600, 800)
+
+
+def test_small_covers_are_not_enlarged(empty_db):
+    save_cover('small.png', png_bytes(size=(100, 140)))
+    thumb, preview = main.generate_cover_derivatives('small.png')
+    assert size_of(thumb) == size_of(preview) == (100, 140)
+
+
+def test_camera_orientation_is_applied(empty_db):
+    out = io.BytesIO()
+    exif = Image.Exif()
+    exif[0x0112] = 6  # rotate 90 degrees clockwise
+    Image.new('RGB', (800, 400), 'white').save(out, 'JPEG', exif=exif)
+    save_cover('photo.jpg', out.getvalue())
+    thumb, _ = main.generate_cover_derivatives('photo.jpg')
+    assert size_of(thumb) == (160, 320)
+
+
+def test_unreadable_covers_fall_back_to_the_original(empty_db):
+    save_cover('broken.png', b'\x89PNG\r\n\x1a\nnot really')
+    assert main.generate_cover_derivatives('broken.png') == (None, None)
+    assert main.generate_cover_derivatives(None) == (None, None)
+
+
+def test_listings_show_the_thumbnail(client):
+    login(client, 'LEC-FCI-01', 'lec123')
+    submit_paper(client, 'Dr. Azman', title='Covered')
+    with sqlite3.connect('trackingsystem.db') as conn:
+        thumb = conn.execute("SELECT CoverThumb FROM Paper").fetchone()[0]
+    assert thumb and os.path.exists(upload_path(thumb))
+    assert f"uploads/covers/{thumb}" in client.get('/academic/status').data.decode()
+
+
+def test_backfill_generates_missing_derivatives(client):
+    save_cover('old.png', png_bytes(size=(400, 600)))
+    with sqlite3.connect('trackingsystem.db') as conn:
+        for paper_id, cover in [('P1', 'old.png'), ('P2', 'gone.png')]:
+            conn.execute('''
+                INSERT INTO Paper (PaperID, PaperTitle, DatePublished, DateRequest, LinkToPaper, PaperType, CoverImage)
+                VALUES (?, 'Old', '2020-01-01', '2020-01-01', 'http://a', 'Journal', ?)
+            ''', (paper_id, cover))
+
+    result = main.app.test_cli_runner().invoke(main.backfill_cover_thumbnails_command)
+    assert 'Skipped P2' in result.output and 'Generated derivatives for 1 of 2 covers.' in result.output
+    with sqlite3.connect('trackingsystem.db') as conn:
+        thumb, preview = conn.execute("SELECT CoverThumb, CoverPreview FROM Paper WHERE PaperID = 'P1'").fetchone()
+    assert size_of(thumb) == (160, 240) and size_of(preview) == (400, 600)
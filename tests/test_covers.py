@@ -0,0 +1,80 @@
+import os
+import sqlite3
+
+import main
+from conftest import login, png_bytes, submit_paper
+
+
+def blobs():
+    with sqlite3.connect('trackingsystem.db') as conn:
+        return conn.execute("SELECT CoverImage, RefCount FROM CoverBlob ORDER BY CoverImage").fetchall()
+
+
+def run_sql(sql, *params):
+    conn = sqlite3.connect('trackingsystem.db')
+    with conn:
+        conn.execute(sql, params)
+    conn.close()
+
+
+def gc_covers():
+    result = main.app.test_cli_runner().invoke(main.gc_covers_command)
+    assert result.exit_code == 0, result.output
+    return result.output
+
+
+def test_identical_covers_are_stored_once_and_counted(client):
+    login(client, 'LEC-FCI-01', 'lec123')
+    cover = png_bytes('red')
+    for title in ['First', 'Second']:
+        assert submit_paper(client, 'Dr. Azman', title=title, cover=cover).status_code == 302
+    assert submit_paper(client, 'Dr. Azman', title='Third', cover=png_bytes('blue')).status_code == 302
+
+    stored = blobs()
+    assert sorted(count for _, count in stored) == [1, 2]
+    for path, _ in stored:
+        assert os.path.exists(os.path.join(main.app.config['UPLOAD_FOLDER'], path))
+
+
+def test_counts_follow_paper_updates_and_deletes(client):
+    login(client, 'LEC-FCI-01', 'lec123')
+    cover = png_bytes('red')
+    for title in ['First', 'Second']:
+        submit_paper(client, 'Dr. Azman', title=title, cover=cover)
+    [(path, _)] = blobs()
+
+    run_sql("UPDATE Paper SET CoverImage = NULL WHERE PaperTitle = 'First'")
+    assert blobs() == [(path, 1)]
+    run_sql("UPDATE Paper SET CoverImage = ? WHERE PaperTitle = 'First'", path)
+    assert blobs() == [(path, 2)]
+    run_sql("DELETE FROM Paper WHERE PaperTitle = 'Second'")
+    assert blobs() == [(path, 1)]
+
+
+def test_gc_removes_only_unreferenced_covers(client):
+    login(client, 'LEC-FCI-01', 'lec123')
+    submit_paper(client, 'Dr. Azman', title='Kept', cover=png_bytes('red'))
+    submit_paper(client, 'Dr. Azman', title='Dropped', cover=png_bytes('blue'))
+    with sqlite3.connect('trackingsystem.db') as conn:
+        dropped = conn.execute("SELECT CoverImage, CoverThumb, CoverPreview FROM Paper WHERE PaperTitle = 'Dropped'").fetchone()
+        kept = conn.execute("SELECT CoverImage FROM Paper WHERE PaperTitle = 'Kept'").fetchone()[0]
+    run_sql("DELETE FROM Paper WHERE PaperTitle = 'Dropped'")
+
+    assert 'Removed 1 unreferenced covers.' in gc_covers()
+    upload_folder = main.app.config['UPLOAD_FOLDER']
+    assert not any(path and os.path.exists(os.path.join(upload_folder, path)) for path in dropped)
+    assert os.path.exists(os.path.join(upload_folder, kept))
+    assert blobs() == [(kept, 1)]
+
+
+def test_resubmitting_a_collected_cover_stores_it_again(client):
+    login(client, 'LEC-FCI-01', 'lec123')
+    cover = png_bytes('red')
+    submit_paper(client, 'Dr. Azman', title='First', cover=cover)
+    run_sql("DELETE FROM Paper")
+    gc_covers()
+    assert blobs() == []
+
+    submit_paper(client, 'Dr. Azman', title='Again', cover=cover)
+    [(path, count)] = blobs()
+    assert count == 1 and os.path.exists(os.path.join(main.app.config['UPLOAD_FOLDER'], path))
@@ -0,0 +1,57 @@
+import queue
+import sqlite3
+
+import pytest
+
+import main
+
+
+def test_connections_are_tuned_for_concurrent_requests(empty_db):
+    conn = main.open_db_connection()
+    try:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == main.app.config['DB_BUSY_TIMEOUT']
+        assert conn.execute("PRAGMA cache_size").fetchone()[0] == main.app.config['DB_CACHE_SIZE']
+        assert isinstance(conn.execute("SELECT 1 AS one").fetchone(), sqlite3.Row)
+    finally:
+        conn.close()
+
+
+def test_requests_reuse_pooled_connections(empty_db):
+    with main.app.app_context():
+        first = main.get_db_connection()
+        assert main.get_db_connection() is first
+    assert main.db_pool.qsize() == 1
+
+    with main.app.app_context():
+        assert main.get_db_connection() is first
+    assert main.db_pool.qsize() == 1
+
+
+def test_uncommitted_writes_are_rolled_back_before_reuse(empty_db):
+    with main.app.app_context():
+        main.get_db_connection().execute("INSERT INTO Faculty (FacultyID, FacultyName) VALUES ('X', 'Left open')")
+
+    with main.app.app_context():
+        conn = main.get_db_connection()
+        assert not conn.in_transaction
+        assert conn.execute("SELECT COUNT(*) FROM Faculty").fetchone()[0] == 0
+
+
+def test_connections_beyond_the_pool_size_are_closed(empty_db, monkeypatch):
+    monkeypatch.setattr(main, 'db_pool', queue.LifoQueue(maxsize=1))
+    with main.app.app_context():
+        kept = main.get_db_connection()
+        with main.app.app_context():
+            extra = main.get_db_connection()
+            assert extra is not kept
+    assert main.db_pool.get_nowait() is extra
+    with pytest.raises(sqlite3.ProgrammingError):
+        kept.execute("SELECT 1")
+
+
+def test_connections_outside_a_request_are_not_pooled(empty_db):
+    conn = main.get_db_connection()
+    conn.close()
+    assert main.db_pool.empty()
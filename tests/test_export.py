@@ -0,0 +1,65 @@
+import csv
+import io
+import json
+
+import database
+import reports
+from conftest import login
+
+
+def test_rows_csv_streams_in_batches():
+    rows = ((n, f"Paper {n}") for n in range(reports.CSV_BATCH_ROWS * 2 + 3))
+    chunks = list(reports.render_rows_csv(['N', 'Title'], rows))
+    parsed = list(csv.reader(io.StringIO(b''.join(chunks).decode())))
+
+    assert len(chunks) == 3
+    assert parsed[0] == ['N', 'Title']
+    assert len(parsed) == reports.CSV_BATCH_ROWS * 2 + 4
+    assert parsed[-1] == [str(reports.CSV_BATCH_ROWS * 2 + 2), f"Paper {reports.CSV_BATCH_ROWS * 2 + 2}"]
+
+
+def test_ndjson_writes_one_object_per_line():
+    body = b''.join(reports.render_ndjson(['PaperID', 'Title'], [('PAP-1', 'Café'), ('PAP-2', None)])).decode()
+    assert [json.loads(line) for line in body.splitlines()] == [
+        {'PaperID': 'PAP-1', 'Title': 'Café'}, {'PaperID': 'PAP-2', 'Title': None},
+    ]
+
+
+def test_bibtex_output_parses_back():
+    title = "Costs & {braces}: 50% of x_y \\ z #1"
+    fields = [('title', title), ('author', 'Siti Aminah and Harvind Singh'), ('doi', ''), ('year', '2024')]
+    text = b''.join(reports.render_bibtex([('article', 'PAP-1', fields)])).decode()
+
+    [(_, entry_type, key, parsed)] = list(reports.parse_bibtex(text))
+    assert (entry_type, key) == ('article', 'PAP-1')
+    assert parsed == {'title': title, 'author': 'Siti Aminah and Harvind Singh', 'year': '2024'}
+
+
+def export(client, query):
+    # Closing the streamed response ends the request and hands its connection back to the pool
+    with client.get('/admin/export' + query) as response:
+        return response.status_code, response.headers, response.data.decode()
+
+
+def test_export_route_streams_every_paper_and_honours_since(client):
+    database.generate_synthetic_data(faculties=1, papers=25)
+    login(client, 'ADM-FCI-01', 'admin123')
+
+    status, headers, body = export(client, '?format=ndjson')
+    rows = [json.loads(line) for line in body.splitlines()]
+    assert status == 200
+    assert headers['X-Export-Watermark']
+    assert len(rows) == 25
+    assert {row['FacultyName'] for row in rows} == {'Faculty of Computing'}
+
+    assert len(export(client, '?format=csv&since=2000-01-01')[2].strip().splitlines()) == 26
+    assert len(export(client, '?format=csv&since=2999-01-01')[2].strip().splitlines()) == 1  # header only
+
+
+def test_export_route_rejects_bad_requests(client):
+    login(client, 'ADM-FCI-01', 'admin123')
+    assert export(client, '?format=xml')[0] == 400
+    assert export(client, '?since=yesterday')[0] == 400
+    client.get('/logout')
+    login(client, 'LEC-FCI-01', 'lec123')
+    assert export(client, '')[0] == 403
@@ -0,0 +1,66 @@
+import json
+import sqlite3
+
+import pytest
+
+import database
+import main
+from conftest import login
+
+
+def identity(user_id):
+    with sqlite3.connect('trackingsystem.db') as conn:
+        row = conn.execute("SELECT Role FROM UserIdentity WHERE UserID = ?", (user_id,)).fetchone()
+    return row[0] if row else None
+
+
+@pytest.mark.parametrize('user_id, password, role', [
+    ('ADM-FCI-01', 'admin123', 'Admin'),
+    ('COO-FCI-01', 'coord123', 'ProgrammeCoordinator'),
+    ('LEC-FCI-01', 'lec123', 'Lecturer'),
+    ('STU-FCI-01', 'stu123', 'Student'),
+    ('STU-FCI-01', 'lec123', None),
+    ('NOBODY', 'stu123', None),
+])
+def test_one_lookup_authenticates_every_role(db, user_id, password, role):
+    conn = main.open_db_connection()
+    try:
+        assert main.authenticate_user(conn, user_id, password) == role
+    finally:
+        conn.close()
+
+
+def test_login_lands_on_the_roles_home(client):
+    assert login(client, 'COO-FCI-01', 'coord123').headers['Location'].endswith('/coordinator/home')
+    response = client.post('/login', data={'user_id': 'COO-FCI-01', 'password': 'wrong'})
+    assert response.headers['Location'].endswith('/login')
+
+
+def test_triggers_follow_creates_key_changes_and_deletes(db):
+    conn = sqlite3.connect('trackingsystem.db')
+    with conn:
+        conn.execute("INSERT INTO Admin (AdminID, AdminPassword, AdminName) VALUES ('ADM-NEW', 'x', 'New')")
+        conn.execute("UPDATE Lecturer SET LecturerID = 'LEC-MOVED' WHERE LecturerID = 'LEC-FOM-03'")
+        conn.execute("DELETE FROM Student WHERE StudentID = 'STU-FOM-05'")
+    assert identity('ADM-NEW') == 'Admin'
+    assert (identity('LEC-FOM-03'), identity('LEC-MOVED')) == (None, 'Lecturer')
+    assert identity('STU-FOM-05') is None
+
+    expected = sorted(conn.execute("SELECT UserID, Role FROM UserIdentity"))
+    assert database.rebuild_user_identity() == len(expected)
+    assert sorted(conn.execute("SELECT UserID, Role FROM UserIdentity")) == expected
+    conn.close()
+
+
+def test_changing_a_users_role_moves_their_identity(client):
+    login(client, 'ADM-FCI-01', 'admin123')
+    client.post('/admin/users/save', data={
+        'action': 'update', 'role': 'Lecturer', 'original_role': 'Student', 'original_id': 'STU-FCI-01',
+        'name': 'Harvind', 'password': 'stu123', 'faculty': 'FCI', 'assigned_coord': 'COO-FCI-01',
+    })
+    assert identity('STU-FCI-01') is None
+    assert identity('LEC-FCI-04') == 'Lecturer'
+
+    found = json.loads(client.post('/admin/users/search', json={'user_id': 'LEC-FCI-04'}).data)
+    assert found['role'] == 'Lecturer' and found['data']['LecturerName'] == 'Harvind'
+    assert json.loads(client.post('/admin/users/search', json={'user_id': 'STU-FCI-01'}).data) == {'success': False}
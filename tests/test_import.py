@@ -0,0 +1,159 @@
+import io
+import os
+import time
+import zipfile
+
+import pytest
+
+import main
+import reports
+from conftest import login
+
+
+def test_csv_headers_are_normalised_and_aliased():
+    data = ("﻿Title,Authors,Date,Link,Type,DOI,Cover Page\n"
+            "Deep nets,\"Dr. Azman, Harvind\",2024-03-01,http://a,Journal,10.1/x, a.png \n").encode()
+    [(line, record, error)] = main.read_import_records('papers.CSV', data)
+    assert (line, error) == (2, None)
+    assert record == {'title': 'Deep nets', 'authors': 'Dr. Azman, Harvind', 'date_published': '2024-03-01',
+                      'url': 'http://a', 'paper_type': 'Journal', 'doi': '10.1/x', 'cover': 'a.png'}
+
+
+@pytest.mark.parametrize('filename, data, message', [
+    ('papers.xlsx', b'title\n', 'must be a .csv or .bib'),
+    ('papers.csv', b'', 'empty'),
+    ('papers.csv', 'title\nCaf\xe9\n'.encode('latin-1'), 'UTF-8'),
+])
+def test_unreadable_files_are_rejected(filename, data, message):
+    with pytest.raises(ValueError, match=message):
+        main.read_import_records(filename, data)
+
+
+def test_bibtex_entries_become_submission_records():
+    text = """
+    @Article{key1,
+      title = {Learning {LaTeX} \\& More},
+      author = {Aminah, Siti and Harvind Singh},
+      year = 2021, month = jun,
+      doi = "10.5/abc"
+    }
+    @inproceedings(key2, title={Second}, author={Azman}, year={2019}, month={11}, url={http://b})
+    """
+    records = main.read_import_records('refs.bib', text.encode())
+    assert [error for _, _, error in records] == [None, None]
+    first, second = records[0][1], records[1][1]
+    assert first['title'] == 'Learning LaTeX & More'
+    assert first['authors'] == 'Siti Aminah, Harvind Singh'
+    assert first['date_published'] == '2021-06-01'
+    assert first['paper_type'] == 'Journal'
+    assert first['url'] == 'https://doi.org/10.5/abc'
+    assert (second['paper_type'], second['date_published'], second['url']) == ('Conference', '2019-11-01', 'http://b')
+
+
+def test_bibtex_errors_are_reported_per_entry():
+    text = """@misc{m1, title={Not a paper}}
+@string{venue = "Somewhere"}
+@article{broken, title={never closed
+@article{ok, title={Fine}, author={Azman}, year={2020}}
+"""
+    records = main.read_import_records('refs.bib', text.encode())
+    assert [(line, error) for line, _, error in records] == [
+        (1, "Unsupported BibTeX entry type @misc."),
+        (3, "Could not parse this BibTeX entry."),
+        (4, None),
+    ]
+
+
+def test_bibtex_values_concatenate_and_keep_escaped_braces():
+    [(_, _, _, fields)] = list(reports.parse_bibtex('@book{b, title = "Part " # {One \\{x\\}}, note = bare}'))
+    assert fields == {'title': 'Part One {x}', 'note': 'bare'}
+
+
+def student_only_records():
+    data = b"title,authors,date_published,url,paper_type\nSolo,Harvind,2024-01-01,http://s,Journal\n"
+    return main.read_import_records('p.csv', data)
+
+
+def test_staff_rule_is_bypassed_only_when_asked(db):
+    conn = main.open_db_connection()
+    try:
+        accepted, errors = main.import_papers(conn, student_only_records(), dry_run=True)
+        assert accepted == 0 and len(errors) == 1
+        accepted, errors = main.import_papers(conn, student_only_records(), dry_run=True, bypass_staff_check=True)
+        assert (accepted, errors) == (1, [])
+    finally:
+        conn.close()
+
+
+def wait_for_job(client, job_id):
+    deadline = time.monotonic() + 30
+    while not (status := client.get(f'/admin/import/status/{job_id}').get_json())['finished']:
+        assert time.monotonic() < deadline
+        time.sleep(0.02)
+    return status
+
+
+def post_import(client, data, filename='p.csv', covers=None):
+    form = {'import_file': (io.BytesIO(data), filename), 'status': 'Approved'}
+    if covers is not None:
+        form['covers_zip'] = (io.BytesIO(covers), 'covers.zip')
+    return client.post('/admin/import', data=form, content_type='multipart/form-data')
+
+
+def test_web_import_runs_as_a_background_job(client):
+    login(client, 'ADM-FCI-01', 'admin123')
+    data = b"title,authors,date_published,url,paper_type\nJob paper,Dr. Azman,2024-01-01,http://j,Journal\n"
+    response = post_import(client, data)
+    assert response.status_code == 302
+    job_id = response.headers['Location'].split('job=')[1]
+
+    status = wait_for_job(client, job_id)
+    assert (status['done'], status['total']) == (1, 1)
+
+    page = client.get(response.headers['Location']).data.decode()
+    assert '1 of 1 papers' in page
+    client.get('/logout')
+    login(client, 'ADM-FAIE-01', 'admin123')
+    assert client.get(f'/admin/import/status/{job_id}').status_code == 404
+
+
+def test_web_import_accepts_covers_beyond_the_app_wide_limit(client, monkeypatch):
+    spooled = []
+    mkdtemp = main.tempfile.mkdtemp
+    monkeypatch.setattr(main.tempfile, 'mkdtemp', lambda **kwargs: spooled.append(mkdtemp(**kwargs)) or spooled[-1])
+    login(client, 'ADM-FCI-01', 'admin123')
+
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, 'w', zipfile.ZIP_STORED) as covers:
+        covers.writestr('padding.bin', os.urandom(main.app.config['MAX_CONTENT_LENGTH'] + 1024))
+    data = b"title,authors,date_published,url,paper_type\nBig,Dr. Azman,2024-01-01,http://b,Journal\n"
+    response = post_import(client, data, covers=archive.getvalue())
+
+    assert response.status_code == 302
+    wait_for_job(client, response.headers['Location'].split('job=')[1])
+    assert '1 of 1 papers' in client.get(response.headers['Location']).data.decode()
+    assert spooled and not any(os.path.exists(path) for path in spooled)
+
+
+def test_web_import_reports_unusable_uploads(client):
+    login(client, 'ADM-FCI-01', 'admin123')
+    assert 'not a valid zip archive' in post_import(client, b"title\n", covers=b'not a zip').data.decode()
+
+    response = post_import(client, b"title\n", filename='papers.txt')
+    wait_for_job(client, response.headers['Location'].split('job=')[1])
+    assert 'must be a .csv or .bib file' in client.get(response.headers['Location']).data.decode()
+
+
+def test_bibtex_line_numbers_hold_across_many_entries():
+    entry = "@article{{k{0},\n  title = {{T {0}}},\n  year = {{2020}}\n}}\n"
+    text = ''.join(entry.format(n) for n in range(3000))
+    lines = [line for line, _, _, _ in reports.parse_bibtex(text)]
+    assert lines == [1 + 4 * n for n in range(3000)]
+
+
+def test_web_imports_follow_the_admin_rule_for_authors(client):
+    login(client, 'ADM-FCI-01', 'admin123')
+    data = b"title,authors,date_published,url,paper_type\nSolo,Harvind,2024-01-01,http://s,Journal\n"
+    response = post_import(client, data)
+    wait_for_job(client, response.headers['Location'].split('job=')[1])
+    assert '1 of 1 papers' in client.get(response.headers['Location']).data.decode()
@@ -0,0 +1,90 @@
+import json
+import logging
+from collections import Counter
+
+import pytest
+
+import main
+from conftest import login
+
+
+class Capture(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+@pytest.fixture
+def metrics(client, monkeypatch):
+    """Fresh per-process counters, so each test sees only its own requests."""
+    monkeypatch.setattr(main, 'route_metrics', {})
+    monkeypatch.setattr(main, 'cache_metrics', Counter())
+    return client
+
+
+def scrape(client):
+    login(client, 'ADM-FCI-01', 'admin123')
+    response = client.get('/admin/metrics')
+    assert response.status_code == 200
+    return response.data.decode()
+
+
+def test_statement_shapes_share_one_label():
+    assert main.sql_template("SELECT *\n  FROM Paper WHERE PaperID IN (?, ?,?) LIMIT 10 offset 20") == \
+        "SELECT * FROM Paper WHERE PaperID IN (?, ...) LIMIT ? OFFSET ?"
+
+
+def request(client, method, path, **kwargs):
+    # Requests are recorded when the response is closed, as a WSGI server does after sending it
+    with client.open(path, method=method, **kwargs) as response:
+        return response.status_code
+
+
+def test_requests_are_counted_per_route(metrics):
+    request(metrics, 'GET', '/login')
+    request(metrics, 'GET', '/nowhere')
+    request(metrics, 'POST', '/login', data={'user_id': 'LEC-FCI-01', 'password': 'lec123'})
+    text = scrape(metrics)
+    assert 'tracking_requests_total{route="login",status="200"} 1' in text
+    assert 'tracking_requests_total{route="unmatched",status="404"} 1' in text
+    assert 'tracking_requests_total{route="login",status="302"} 1' in text
+    assert 'tracking_request_duration_seconds_count{route="login"} 2' in text
+    assert 'tracking_sql_queries_total{route="login"} 0' not in text
+
+
+def test_cache_lookups_are_reported_with_a_hit_ratio(metrics):
+    for hit in [True, True, False, True]:
+        main.record_cache('search', hit)
+    text = scrape(metrics)
+    assert 'tracking_cache_requests_total{cache="search",result="hit"} 3' in text
+    assert 'tracking_cache_hit_ratio{cache="search"} 0.7500' in text
+
+
+def test_metrics_are_for_admins_only(metrics):
+    assert metrics.get('/admin/metrics').status_code == 403
+    login(metrics, 'LEC-FCI-01', 'lec123')
+    assert metrics.get('/admin/metrics').status_code == 403
+
+
+def test_slow_requests_are_logged_with_their_slowest_statements(metrics, monkeypatch):
+    capture = Capture()
+    monkeypatch.setattr(main.slow_log, 'handlers', [capture])
+    monkeypatch.setitem(main.app.config, 'SLOW_REQUEST_SECONDS', 0)
+    request(metrics, 'POST', '/login', data={'user_id': 'LEC-FCI-01', 'password': 'lec123'})
+
+    entry = json.loads(capture.messages[0])
+    assert (entry['route'], entry['method'], entry['status']) == ('login', 'POST', 302)
+    assert entry['queries'] == len(entry['slowest']) > 0
+    assert all(set(statement) == {'sql', 'ms', 'rows'} for statement in entry['slowest'])
+    assert 'SELECT Role FROM UserIdentity' in ' '.join(statement['sql'] for statement in entry['slowest'])
+
+
+def test_fast_requests_are_not_logged(metrics, monkeypatch):
+    capture = Capture()
+    monkeypatch.setattr(main.slow_log, 'handlers', [capture])
+    monkeypatch.setitem(main.app.config, 'SLOW_REQUEST_SECONDS', 60)
+    request(metrics, 'GET', '/login')
+    assert capture.messages == []
@@ -0,0 +1,68 @@
+import sqlite3
+
+import pytest
+
+import database
+
+
+def connect():
+    return sqlite3.connect('trackingsystem.db')
+
+
+def indexes(conn):
+    return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+
+
+def test_init_db_leaves_the_database_at_the_latest_version(empty_db):
+    conn = connect()
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == database.MIGRATIONS[-1][0]
+    assert database.run_migrations(conn) == []
+    conn.close()
+
+
+def test_older_databases_are_brought_up_to_date(empty_db):
+    conn = connect()
+    conn.execute("DROP INDEX idx_paper_lecturer")
+    conn.execute("PRAGMA user_version = 0")
+    assert database.run_migrations(conn) == [version for version, _, _ in database.MIGRATIONS]
+    assert 'idx_paper_lecturer' in indexes(conn)
+    conn.close()
+
+
+def test_a_failed_migration_keeps_the_last_good_version(empty_db, monkeypatch):
+    latest = database.MIGRATIONS[-1][0]
+    monkeypatch.setattr(database, 'MIGRATIONS', database.MIGRATIONS + [
+        (latest + 1, "good", ["CREATE INDEX idx_test_good ON Paper (PaperType)"]),
+        (latest + 2, "bad", ["CREATE INDEX idx_test_bad ON Paper (PaperType)", "CREATE INDEX broken ON Missing (x)"]),
+    ])
+    conn = connect()
+    with pytest.raises(sqlite3.OperationalError):
+        database.run_migrations(conn)
+
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == latest + 1
+    assert 'idx_test_good' in indexes(conn)
+    assert 'idx_test_bad' not in indexes(conn)
+    conn.close()
+
+
+def test_migration_versions_are_increasing():
+    versions = [version for version, _, _ in database.MIGRATIONS]
+    assert versions == sorted(set(versions))
+
+
+def test_version_one_databases_get_the_later_indexes(empty_db):
+    conn = connect()
+    for name in ['idx_paper_published', 'idx_author_lookup_name', 'idx_paper_faculty_faculty']:
+        conn.execute(f"DROP INDEX {name}")
+    conn.execute("PRAGMA user_version = 1")
+    assert database.run_migrations(conn) == [version for version, _, _ in database.MIGRATIONS if version > 1]
+    assert {'idx_paper_published', 'idx_author_lookup_name', 'idx_paper_faculty_faculty'} <= indexes(conn)
+    conn.close()
+
+
+def test_every_index_comes_from_a_migration(empty_db):
+    conn = connect()
+    migrated = {statement.split()[5] for _, _, statements in database.MIGRATIONS for statement in statements}
+    created = {name for name in indexes(conn) if not name.startswith('sqlite_autoindex')}
+    assert created == migrated
+    conn.close()
@@ -0,0 +1,60 @@
+import database
+import main
+
+SQL = "SELECT * FROM Paper WHERE Status = 'Approved'"
+SORT_KEYS = [('DatePublished', 'DatePublished'), ('PaperID', 'PaperID')]
+
+
+def fetch_page(query=''):
+    with main.app.test_request_context('/' + query):
+        page = main.request.args.get('page', 1, type=int)
+        return main.paginate(SQL, [], SORT_KEYS, True, page, per_page=7)
+
+
+def expected_ids():
+    conn = main.open_db_connection()
+    try:
+        return [row['PaperID'] for row in conn.execute(SQL + " ORDER BY DatePublished DESC, PaperID DESC")]
+    finally:
+        conn.close()
+
+
+def test_next_cursors_visit_every_row_once(empty_db):
+    database.generate_synthetic_data(faculties=1, papers=60, seed=3)
+    expected = expected_ids()
+
+    papers, total, pages, _, cursors = fetch_page()
+    seen = [row['PaperID'] for row in papers]
+    for page in range(2, pages + 1):
+        papers, _, _, _, cursors = fetch_page(f"?page={page}&after={cursors['next']}")
+        seen += [row['PaperID'] for row in papers]
+
+    assert total == len(expected)
+    assert seen == expected
+    assert cursors['next'] is None
+
+
+def test_prev_cursor_returns_the_previous_page(empty_db):
+    database.generate_synthetic_data(faculties=1, papers=60, seed=3)
+    first, _, _, _, cursors = fetch_page()
+    second, _, _, _, cursors = fetch_page(f"?page=2&after={cursors['next']}")
+    back, _, _, _, _ = fetch_page(f"?page=1&before={cursors['prev']}")
+
+    assert [row['PaperID'] for row in back] == [row['PaperID'] for row in first]
+    assert not {row['PaperID'] for row in first} & {row['PaperID'] for row in second}
+
+
+def test_cursor_matches_offset_page(empty_db):
+    database.generate_synthetic_data(faculties=1, papers=60, seed=3)
+    _, _, _, _, cursors = fetch_page()
+    by_cursor, _, _, _, _ = fetch_page(f"?page=2&after={cursors['next']}")
+    by_offset, _, _, _, _ = fetch_page("?page=2")
+    assert [row['PaperID'] for row in by_cursor] == [row['PaperID'] for row in by_offset]
+
+
+def test_decode_cursor_rejects_bad_tokens():
+    token = main.encode_cursor({'DatePublished': '2020-01-01', 'PaperID': 'PAP-1'}, SORT_KEYS)
+    assert main.decode_cursor(token, SORT_KEYS) == ['2020-01-01', 'PAP-1']
+    assert main.decode_cursor(token, SORT_KEYS[:1]) is None
+    assert main.decode_cursor('not a cursor!', SORT_KEYS) is None
+    assert main.decode_cursor('', SORT_KEYS) is None
@@ -0,0 +1,67 @@
+import sqlite3
+
+import pytest
+
+import database
+
+
+@pytest.fixture
+def conn(db):
+    conn = sqlite3.connect('trackingsystem.db', isolation_level=None)
+    yield conn
+    conn.close()
+
+
+def add_paper(conn, paper_id, lecturer=None, student=None, coordinator=None):
+    conn.execute('''
+        INSERT INTO Paper (PaperID, PaperTitle, DatePublished, DateRequest, LinkToPaper, PaperType,
+                           Authors, LecturerID, StudentID, CoordinatorID)
+        VALUES (?, 'A paper', '2024-01-01', '2024-01-02', 'http://a', 'Journal', 'Someone', ?, ?, ?)
+    ''', (paper_id, lecturer, student, coordinator))
+
+
+def faculties(conn, paper_id):
+    return {row[0] for row in conn.execute("SELECT FacultyID FROM PaperFaculty WHERE PaperID = ?", (paper_id,))}
+
+
+def test_new_papers_belong_to_each_linked_users_faculty(conn):
+    add_paper(conn, 'P1', lecturer='LEC-FCI-01', student='STU-FCI-01', coordinator='COO-FAIE-01')
+    add_paper(conn, 'P2')
+    assert faculties(conn, 'P1') == {'FCI', 'FAIE'}
+    assert faculties(conn, 'P2') == set()
+
+
+def test_relinking_a_paper_moves_it(conn):
+    add_paper(conn, 'P1', lecturer='LEC-FCI-01', coordinator='COO-FAIE-01')
+    conn.execute("UPDATE Paper SET CoordinatorID = NULL, LecturerID = 'LEC-FCM-01' WHERE PaperID = 'P1'")
+    assert faculties(conn, 'P1') == {'FCM'}
+    # Other columns leave the links alone
+    conn.execute("UPDATE Paper SET Status = 'Approved' WHERE PaperID = 'P1'")
+    assert faculties(conn, 'P1') == {'FCM'}
+
+
+def test_a_user_changing_faculty_takes_their_papers_along(conn):
+    add_paper(conn, 'P1', lecturer='LEC-FCI-01', student='STU-FAIE-01')
+    add_paper(conn, 'P2', lecturer='LEC-FCI-01')
+    conn.execute("UPDATE Lecturer SET FacultyID = 'FOM' WHERE LecturerID = 'LEC-FCI-01'")
+    assert faculties(conn, 'P1') == {'FOM', 'FAIE'}
+    assert faculties(conn, 'P2') == {'FOM'}
+
+
+def test_deleting_a_user_or_paper_removes_the_links(conn):
+    add_paper(conn, 'P1', lecturer='LEC-FCI-01', student='STU-FAIE-01')
+    add_paper(conn, 'P2', lecturer='LEC-FCM-01')
+    conn.execute("PRAGMA foreign_keys = OFF")
+    conn.execute("DELETE FROM Student WHERE StudentID = 'STU-FAIE-01'")
+    assert faculties(conn, 'P1') == {'FCI'}
+    conn.execute("DELETE FROM Paper WHERE PaperID = 'P2'")
+    assert faculties(conn, 'P2') == set()
+
+
+def test_triggers_agree_with_a_rebuild(conn):
+    add_paper(conn, 'P1', lecturer='LEC-FCI-01', student='STU-FAIE-01', coordinator='COO-FCM-01')
+    add_paper(conn, 'P2', lecturer='LEC-FAC-01')
+    conn.execute("UPDATE Lecturer SET FacultyID = 'FOM' WHERE LecturerID = 'LEC-FAC-01'")
+    kept = sorted(conn.execute("SELECT PaperID, FacultyID FROM PaperFaculty"))
+    assert database.rebuild_paper_faculty(conn.cursor()) == len(kept)
+    assert sorted(conn.execute("SELECT PaperID, FacultyID FROM PaperFaculty")) == kept
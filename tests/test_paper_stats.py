@@ -0,0 +1,83 @@
+import sqlite3
+
+import database
+from conftest import login, submit_paper
+
+
+def paper_counts(faculty_id):
+    with sqlite3.connect('trackingsystem.db') as conn:
+        return dict(conn.execute('''
+            SELECT Status, SUM(PaperCount) FROM PaperStats WHERE FacultyID = ? AND PaperCount != 0 GROUP BY Status
+        ''', (faculty_id,)).fetchall())
+
+
+def author_counts(faculty_id):
+    with sqlite3.connect('trackingsystem.db') as conn:
+        return dict(conn.execute('''
+            SELECT NormalizedName, SUM(PaperCount) FROM AuthorStats WHERE FacultyID = ? AND PaperCount != 0
+            GROUP BY NormalizedName
+        ''', (faculty_id,)).fetchall())
+
+
+def paper_id(title):
+    with sqlite3.connect('trackingsystem.db') as conn:
+        return conn.execute("SELECT PaperID FROM Paper WHERE PaperTitle = ?", (title,)).fetchone()[0]
+
+
+def submit_as_azman(client, *titles):
+    login(client, 'LEC-FCI-01', 'lec123')
+    for title in titles:
+        assert submit_paper(client, 'Dr. Azman, Harvind', title=title).status_code == 302
+    client.get('/logout')
+
+
+def test_submissions_and_reviews_keep_the_summaries_current(client):
+    submit_as_azman(client, 'First', 'Second', 'Third')
+    assert paper_counts('') == paper_counts('FCI') == {'Under Review': 3}
+    assert author_counts('FCI') == {}
+
+    login(client, 'ADM-FCI-01', 'admin123')
+    client.post('/review/submit', data={'paper_id': paper_id('First'), 'action': 'approve', 'feedback': 'ok'})
+    client.post('/review/submit', data={'paper_id': paper_id('Second'), 'action': 'reject', 'feedback': 'no'})
+    client.post('/admin/remove_paper', data={'paper_id': paper_id('Third')}, headers={'Referer': '/'})
+
+    assert paper_counts('FCI') == {'Approved': 1, 'Rejected': 1, 'Removed': 1}
+    assert author_counts('FCI') == author_counts('') == {'dr.azman': 1, 'harvind': 1}
+    assert database.rebuild_paper_stats() == []
+
+
+def test_moving_a_lecturer_moves_their_counts(client):
+    submit_as_azman(client, 'First')
+    login(client, 'ADM-FCI-01', 'admin123')
+    client.post('/review/submit', data={'paper_id': paper_id('First'), 'action': 'approve', 'feedback': ''})
+
+    client.post('/admin/users/save', data={
+        'action': 'update', 'role': 'Lecturer', 'original_role': 'Lecturer', 'original_id': 'LEC-FCI-01',
+        'name': 'Dr. Azman', 'password': 'lec123', 'faculty': 'FOM', 'assigned_coord': 'COO-FOM-01',
+    })
+
+    # Harvind still ties the paper to FCI
+    assert paper_counts('FOM') == paper_counts('FCI') == paper_counts('') == {'Approved': 1}
+    assert author_counts('FOM') == {'dr.azman': 1, 'harvind': 1}
+    assert database.rebuild_paper_stats() == []
+
+
+def test_deleting_a_user_keeps_the_summaries_consistent(client):
+    submit_as_azman(client, 'First', 'Second')
+    login(client, 'ADM-FCI-01', 'admin123')
+    client.post('/review/submit', data={'paper_id': paper_id('First'), 'action': 'approve', 'feedback': ''})
+
+    client.post('/admin/users/save', data={'action': 'delete', 'original_role': 'Student', 'original_id': 'STU-FCI-01'})
+    with sqlite3.connect('trackingsystem.db') as conn:
+        assert conn.execute("SELECT 1 FROM Student WHERE StudentID = 'STU-FCI-01'").fetchone() is None
+    assert paper_counts('FCI') == {'Approved': 1, 'Under Review': 1}
+    assert database.rebuild_paper_stats() == []
+
+
+def test_rebuild_reports_and_repairs_drift(db):
+    conn = sqlite3.connect('trackingsystem.db')
+    with conn:
+        conn.execute("INSERT INTO PaperStats (FacultyID, PubYear, PaperType, Status, PaperCount) VALUES ('FCI', 2024, 'Journal', 'Approved', 5)")
+    conn.close()
+    assert database.rebuild_paper_stats() == [('PaperStats', ('FCI', 2024, 'Journal', 'Approved'), 5, 0)]
+    assert database.rebuild_paper_stats() == []
@@ -0,0 +1,51 @@
+import sqlite3
+from collections import Counter
+
+import pytest
+
+import database
+import main
+
+
+@pytest.fixture
+def conn(empty_db):
+    database.generate_synthetic_data(faculties=1, lecturers_per_faculty=3, students_per_faculty=5, papers=300,
+                                     years=(2020, 2023))
+    conn = main.open_db_connection()
+    yield conn
+    conn.close()
+
+
+def expected(user_id, year=None):
+    """The same figures the old Python-side aggregation produced, from the raw rows."""
+    raw = sqlite3.connect('trackingsystem.db')
+    papers = raw.execute('''
+        SELECT PaperID, substr(DatePublished, 1, 4), PaperType FROM Paper
+        WHERE Status = 'Approved' AND PaperID IN (SELECT PaperID FROM PaperAuthor WHERE UserID = ?)
+    ''', (user_id,)).fetchall()
+    papers = [paper for paper in papers if year is None or paper[1] == str(year)]
+    authors = Counter()
+    for paper_id, _, _ in papers:
+        for (name,) in raw.execute("SELECT AuthorName FROM PaperAuthor WHERE PaperID = ?", (paper_id,)):
+            authors[name] += 1
+    raw.close()
+    top = sorted(authors.items(), key=lambda item: (-item[1], item[0]))[:5]
+    return Counter(year for _, year, _ in papers), Counter(kind for _, _, kind in papers), top
+
+
+@pytest.mark.parametrize('user_id', ['LEC-F01-01', 'STU-F01-01', 'COO-F01-01'])
+@pytest.mark.parametrize('year', [None, 2022])
+def test_personal_analytics_match_the_raw_rows(conn, user_id, year):
+    annual, types, top = main.get_personal_analytics(conn, user_id, year and str(year))
+    want_annual, want_types, want_top = expected(user_id, year)
+    assert annual == dict(want_annual) and types == dict(want_types)
+    assert [(row['Name'], row['Count']) for row in top] == want_top
+
+
+def test_personal_analytics_only_count_approved_papers(conn):
+    with conn:
+        conn.execute('''
+            UPDATE Paper SET Status = 'Rejected'
+            WHERE PaperID IN (SELECT PaperID FROM PaperAuthor WHERE UserID = 'LEC-F01-01')
+        ''')
+    assert main.get_personal_analytics(conn, 'LEC-F01-01') == ({}, {}, [])
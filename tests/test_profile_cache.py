@@ -0,0 +1,74 @@
+import sqlite3
+
+import pytest
+
+import main
+from conftest import login
+
+
+@pytest.fixture
+def loads(db, monkeypatch):
+    """Counts the profile reads that reach the database."""
+    calls = []
+    original = main.load_user_profile
+
+    def counting(conn, user_id):
+        calls.append(user_id)
+        return original(conn, user_id)
+
+    monkeypatch.setattr(main, 'load_user_profile', counting)
+    return calls
+
+
+def profile(user_id):
+    with main.app.app_context():
+        return main.get_user_profile(user_id)
+
+
+def rename_student(name):
+    conn = sqlite3.connect('trackingsystem.db')
+    with conn:
+        conn.execute("UPDATE Student SET StudentName = ? WHERE StudentID = 'STU-FCI-01'", (name,))
+    conn.close()
+
+
+def test_profiles_carry_the_links_reports_need(db):
+    assert profile('STU-FCI-01') == {'user_id': 'STU-FCI-01', 'role': 'Student', 'name': 'Harvind', 'faculty_id': 'FCI',
+                                     'lecturer_id': 'LEC-FCI-01', 'coordinator_id': 'COO-FCI-01'}
+    assert profile('ADM-FCI-01')['faculty_id'] is None
+    assert profile('NOBODY') is None
+
+
+def test_repeat_lookups_are_served_from_memory(loads):
+    profile('STU-FCI-01')
+    profile('STU-FCI-01')
+    assert loads == ['STU-FCI-01']
+
+
+def test_save_user_drops_the_changed_profile(client, loads):
+    login(client, 'ADM-FCI-01', 'admin123')
+    assert profile('LEC-FCI-01')['name'] == 'Dr. Azman'
+    client.post('/admin/users/save', data={
+        'action': 'update', 'role': 'Lecturer', 'original_role': 'Lecturer', 'original_id': 'LEC-FCI-01',
+        'name': 'Dr. Azman Hakim', 'password': 'lec123', 'faculty': 'FCI', 'assigned_coord': 'COO-FCI-01',
+    })
+    assert profile('LEC-FCI-01')['name'] == 'Dr. Azman Hakim'
+
+
+def test_writes_from_other_processes_show_once_the_stamp_expires(loads, monkeypatch):
+    monkeypatch.setitem(main.app.config, 'DATA_STAMP_TTL', 3600)
+    profile('STU-FCI-01')
+    rename_student('Harvind Singh')
+    assert profile('STU-FCI-01')['name'] == 'Harvind'
+
+    main.data_stamp['checked'] -= 3601
+    assert profile('STU-FCI-01')['name'] == 'Harvind Singh'
+
+
+def test_the_cache_is_bounded(loads, monkeypatch):
+    monkeypatch.setattr(main, 'PROFILE_CACHE_SIZE', 2)
+    for user_id in ['STU-FCI-01', 'STU-FCI-02', 'STU-FCI-01', 'STU-FCI-03']:
+        profile(user_id)
+    assert list(main.profile_cache) == ['STU-FCI-01', 'STU-FCI-03']
+    profile('STU-FCI-02')
+    assert loads == ['STU-FCI-01', 'STU-FCI-02', 'STU-FCI-03', 'STU-FCI-02']
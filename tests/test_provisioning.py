@@ -0,0 +1,88 @@
+import io
+import sqlite3
+
+import pytest
+
+import main
+from conftest import login
+
+USERS_CSV = """﻿User Type,Faculty ID,Name,Password,Final Year,Lecturer,Coordinator
+coordinator,FCI,Prof. Nadia,pw1,,,
+lecturer,FCI,Dr. Omar,pw2,,,Prof. Nadia
+lecturer,FCI,Dr. Lina,pw3,,,COO-FCI-01
+student,FCI,Mei Tan,pw4,yes,Dr. Omar,
+student,FCI,Raj Nair,pw5,no,LEC-FCI-01,
+admin,FCI,Admin Zoe,pw6,,,
+"""
+
+
+def provision(data, dry_run=False):
+    conn = main.open_db_connection()
+    try:
+        return main.provision_users(conn, main.read_user_records(data.encode()), dry_run, admin_id='ADM-FCI-01')
+    finally:
+        conn.close()
+
+
+def users_named(*names):
+    with sqlite3.connect('trackingsystem.db') as conn:
+        return conn.execute(f'''
+            SELECT COUNT(*) FROM UserIdentity WHERE UserID IN (
+                SELECT LecturerID FROM Lecturer WHERE LecturerName IN ({', '.join('?' * len(names))})
+                UNION SELECT StudentID FROM Student WHERE StudentName IN ({', '.join('?' * len(names))}))
+        ''', names + names).fetchone()[0]
+
+
+def test_headers_are_normalised_and_required():
+    [(line, record)] = main.read_user_records("Role,Faculty,Name,Password,Coord\nlecturer,FCI,A,b,\n".encode())
+    assert line == 2 and record['role'] == 'lecturer' and record['assigned_coordinator'] == ''
+    with pytest.raises(ValueError, match='missing the column'):
+        main.read_user_records(b"role,name\nstudent,A\n")
+
+
+def test_a_file_of_every_role_is_created_in_one_batch(db):
+    mapping, errors = provision(USERS_CSV)
+    assert errors == []
+    assert [(line, user_id) for line, _, _, _, user_id in mapping] == [
+        (2, 'COO-FCI-03'), (3, 'LEC-FCI-04'), (4, 'LEC-FCI-05'), (5, 'STU-FCI-06'), (6, 'STU-FCI-07'), (7, 'ADM-FCI-02')]
+
+    with sqlite3.connect('trackingsystem.db') as conn:
+        # Staff named in the same file resolve to the IDs just reserved for them
+        assert conn.execute("SELECT CoordinatorID FROM Lecturer WHERE LecturerID = 'LEC-FCI-04'").fetchone()[0] == 'COO-FCI-03'
+        assert conn.execute("SELECT LecturerID, IsFinalYear FROM Student WHERE StudentID = 'STU-FCI-06'").fetchone() == ('LEC-FCI-04', 1)
+        assert conn.execute("SELECT Role FROM AuthorLookup WHERE UserID = 'STU-FCI-07'").fetchone()[0] == 'Student'
+        assert conn.execute("SELECT 1 FROM AuthorLookup WHERE UserID = 'ADM-FCI-02'").fetchone() is None
+
+
+def test_any_bad_row_rejects_the_whole_file(db):
+    data = USERS_CSV + "student,FCI,Ghost,pw,maybe,,\nstudent,XYZ,Nobody,pw,,,\nlecturer,FCI,Dr. Nil,pw,,,Nobody Known\n"
+    mapping, errors = provision(data)
+    assert [(line, message) for line, _, message in errors] == [
+        (8, "is_final_year must be yes or no, not 'maybe'."),
+        (9, "Unknown faculty 'XYZ'."),
+        (10, "Coordinator 'Nobody Known' was not found."),
+    ]
+    assert users_named('Dr. Omar', 'Mei Tan') == 0
+
+
+def test_ambiguous_staff_names_must_use_the_id(db):
+    data = "role,faculty,name,password,assigned_coordinator\ncoordinator,FCI,Prof. Siva,p,\nlecturer,FCI,Dr. New,p,Prof. Siva\n"
+    _, errors = provision(data)
+    assert errors == [(3, 'Dr. New', "Coordinator 'Prof. Siva' matches 2 users; use the ID instead.")]
+
+
+def test_dry_runs_write_nothing_and_keep_the_ids_free(db):
+    preview, errors = provision(USERS_CSV, dry_run=True)
+    assert errors == [] and users_named('Dr. Omar', 'Mei Tan') == 0
+    real, _ = provision(USERS_CSV)
+    assert real == preview
+
+
+def test_the_admin_page_returns_the_id_mapping(client):
+    login(client, 'ADM-FCI-01', 'admin123')
+    with client.post('/admin/users/provision',
+                     data={'users_file': (io.BytesIO(USERS_CSV.encode()), 'users.csv')}) as response:
+        assert response.mimetype == 'text/csv'
+        lines = response.data.decode().splitlines()
+    assert lines[0] == 'line,name,role,faculty,user_id' and len(lines) == 7
+    login(client, 'STU-FCI-06', 'pw4')
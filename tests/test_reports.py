@@ -0,0 +1,46 @@
+import csv
+import io
+import re
+import zlib
+
+import reports
+
+
+def test_csv_report_writes_one_section_per_table():
+    blocks = [
+        ('heading', 'Faculty report'),
+        ('table', 'By year', [('Year', 0.5), ('Papers', 0.5)], iter([(2023, 4), (2024, 7)])),
+        ('chart', 'By type', ['Journal'], [3], '#3b82f6'),
+        ('table', 'Top authors', [('Name', 0.7), ('Papers', 0.3)], iter([('Dr. Azman', 5)])),
+    ]
+    rows = list(csv.reader(io.StringIO(b''.join(reports.render_csv(blocks)).decode())))
+    assert rows == [
+        ['Section', 'Year', 'Papers'], ['By year', '2023', '4'], ['By year', '2024', '7'],
+        [],
+        ['Section', 'Name', 'Papers'], ['Top authors', 'Dr. Azman', '5'],
+    ]
+
+
+def test_pdf_report_is_well_formed_and_paginates():
+    table_rows = ((f"Paper {n}", n) for n in range(200))
+    blocks = [('heading', 'Long report'), ('table', 'Papers', [('Title', 0.8), ('N', 0.2)], table_rows)]
+    chunks = list(reports.render_pdf(blocks))
+    pdf = b''.join(chunks)
+
+    assert pdf.startswith(b'%PDF-')
+    assert pdf.rstrip().endswith(b'%%EOF')
+    assert len(chunks) > 1  # streamed a page at a time
+    pages = int(re.search(rb'/Type /Pages /Kids \[[^\]]*\] /Count (\d+)', pdf).group(1))
+    assert pages > 1
+
+    # Every xref offset points at the object it names
+    xref = pdf[int(re.search(rb'startxref\s+(\d+)', pdf).group(1)):]
+    offsets = [int(line[:10]) for line in xref.split(b'\n')[3:] if re.match(rb'\d{10} 00000 n', line)]
+    for number, offset in enumerate(offsets, start=1):
+        assert pdf[offset:].startswith(f"{number} 0 obj".encode())
+
+
+def test_pdf_escapes_text():
+    pdf = b''.join(reports.render_pdf([('heading', 'Costs (draft) \\ notes')]))
+    content = b''.join(zlib.decompress(stream) for stream in re.findall(rb'stream\n(.*?)\nendstream', pdf, re.S))
+    assert b'(Costs \\(draft\\) \\\\ notes)' in content
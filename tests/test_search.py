@@ -0,0 +1,79 @@
+import sqlite3
+
+import pytest
+
+import main
+
+
+@pytest.fixture
+def conn(empty_db):
+    conn = sqlite3.connect('trackingsystem.db', isolation_level=None)
+    yield conn
+    conn.close()
+
+
+def add_paper(conn, paper_id, title, authors='Someone', doi=None, status='Approved'):
+    conn.execute('''
+        INSERT INTO Paper (PaperID, PaperTitle, DOI, DatePublished, DateRequest, LinkToPaper, PaperType, Authors, Status)
+        VALUES (?, ?, ?, '2024-01-01', '2024-01-02', 'http://a', 'Journal', ?, ?)
+    ''', (paper_id, title, doi, authors, status))
+
+
+def search(query, **args):
+    with main.app.test_request_context('/', query_string=dict(query=query, **args)):
+        papers, total, _, _, _ = main.get_public_search_results(None)
+    return [paper['PaperID'] for paper in papers], total
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('graph nets', '"graph"* "nets"*'),
+    ('  say "hi"  ', '"say"* """hi"""*'),
+    ('- & neural', '"neural"*'),
+    ('', ''),
+])
+def test_free_text_becomes_a_prefix_query(text, expected):
+    assert main.build_match_query(text) == expected
+
+
+def test_every_word_must_match_as_a_prefix(conn):
+    add_paper(conn, 'P1', 'Graph neural networks')
+    add_paper(conn, 'P2', 'Graph theory')
+    add_paper(conn, 'P3', 'Neural rendering')
+    assert sorted(search('gra')[0]) == ['P1', 'P2']
+    assert search('neur gra') == (['P1'], 1)
+    assert search('nothing') == ([], 0)
+
+
+def test_results_are_ranked_by_relevance(conn):
+    add_paper(conn, 'P1', 'A long survey of several methods for learning on very large graph structures')
+    add_paper(conn, 'P2', 'Graph theory')
+    add_paper(conn, 'P3', 'Graphs of graphs: graph products', authors='Graham Graph')
+    assert search('graph')[0] == ['P3', 'P2', 'P1']
+
+
+def test_authors_dois_and_accents_are_searchable(conn):
+    add_paper(conn, 'P1', 'Café culture', authors='Siti Aminah', doi='10.1234/abc.5678')
+    assert search('cafe')[0] == ['P1']
+    assert search('aminah')[0] == ['P1']
+    assert search('1234')[0] == ['P1']
+
+
+def test_only_approved_papers_are_found_and_filters_apply(conn):
+    add_paper(conn, 'P1', 'Graph theory')
+    add_paper(conn, 'P2', 'Graph theory', status='Under Review')
+    conn.execute("UPDATE Paper SET PaperType = 'Conference' WHERE PaperID = 'P1'")
+    assert search('graph') == (['P1'], 1)
+    assert search('graph', filter_type='Journal') == ([], 0)
+    assert search('graph', filter_year='2024') == (['P1'], 1)
+
+
+def test_the_index_follows_paper_edits_and_deletes(conn):
+    add_paper(conn, 'P1', 'Graph theory')
+    conn.execute("UPDATE Paper SET PaperTitle = 'Set theory' WHERE PaperID = 'P1'")
+    # Raw SQL writes skip the app's cache invalidation
+    main.bump_search_generation()
+    assert search('graph')[0] == [] and search('set')[0] == ['P1']
+    conn.execute("DELETE FROM Paper WHERE PaperID = 'P1'")
+    main.bump_search_generation()
+    assert search('set')[0] == []
+    assert conn.execute("SELECT COUNT(*) FROM PaperSearch").fetchone()[0] == 0
@@ -0,0 +1,84 @@
+import sqlite3
+
+import pytest
+
+import main
+from conftest import login
+
+
+@pytest.fixture
+def runs(client, monkeypatch):
+    """Counts the searches that reach the database rather than the cache."""
+    calls = []
+    original = main.paginate
+
+    def counting(*args, **kwargs):
+        calls.append(args[0])
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(main, 'paginate', counting)
+    return calls
+
+
+def write(sql, *params):
+    conn = sqlite3.connect('trackingsystem.db')
+    with conn:
+        conn.execute(sql, params)
+    conn.close()
+
+
+def add_paper(paper_id, title, status='Approved'):
+    write('''
+        INSERT INTO Paper (PaperID, PaperTitle, DatePublished, DateRequest, LinkToPaper, PaperType, Authors, Status)
+        VALUES (?, ?, '2024-01-01', '2024-01-02', 'http://a', 'Journal', 'Dr. Azman', ?)
+    ''', paper_id, title, status)
+
+
+def search(query):
+    with main.app.test_request_context('/', query_string={'query': query}):
+        papers, total, _, _, _ = main.get_public_search_results(None)
+    return [(paper['PaperID'], paper['PaperTitle']) for paper in papers], total
+
+
+def test_repeat_searches_are_served_from_the_cache(runs):
+    add_paper('P1', 'Graph theory')
+    assert search('graph') == search('GRAPH') == ([('P1', 'Graph theory')], 1)
+    assert len(runs) == 1
+
+
+def test_cached_pages_show_current_rows_and_drop_unapproved_ones(runs):
+    add_paper('P1', 'Graph theory')
+    add_paper('P2', 'Graph products')
+    search('graph')
+    write("UPDATE Paper SET PaperTitle = 'Graph theory, 2nd ed.' WHERE PaperID = 'P1'")
+    write("UPDATE Paper SET Status = 'Removed' WHERE PaperID = 'P2'")
+    assert search('graph')[0] == [('P1', 'Graph theory, 2nd ed.')]
+    assert len(runs) == 1
+
+
+def test_reviews_and_removals_in_this_process_show_at_once(client, runs):
+    add_paper('P1', 'Graph theory', status='Under Review')
+    add_paper('P2', 'Graph products')
+    assert search('graph')[0] == [('P2', 'Graph products')]
+
+    login(client, 'ADM-FCI-01', 'admin123')
+    client.post('/review/submit', data={'paper_id': 'P1', 'action': 'approve', 'feedback': ''})
+    assert sorted(search('graph')[0]) == [('P1', 'Graph theory'), ('P2', 'Graph products')]
+    client.post('/admin/remove_paper', data={'paper_id': 'P2'}, headers={'Referer': '/'})
+    assert search('graph') == ([('P1', 'Graph theory')], 1)
+    assert len(runs) == 3
+
+
+def test_approvals_by_other_processes_show_after_the_ttl(runs, monkeypatch):
+    search('graph')
+    add_paper('P1', 'Graph theory')
+    assert search('graph') == ([], 0)
+    monkeypatch.setitem(main.app.config, 'SEARCH_CACHE_TTL', 0)
+    assert search('graph') == ([('P1', 'Graph theory')], 1)
+
+
+def test_the_cache_is_bounded(runs, monkeypatch):
+    monkeypatch.setattr(main, 'SEARCH_CACHE_SIZE', 2)
+    for query in ['graph', 'theory', 'graph', 'sets']:
+        search(query)
+    assert [key[0] for key in main.search_cache] == ['"graph"*', '"sets"*']
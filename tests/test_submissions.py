@@ -0,0 +1,32 @@
+import sqlite3
+
+import database
+from conftest import login, submit_paper
+
+
+def paper_count():
+    with sqlite3.connect('trackingsystem.db') as conn:
+        return conn.execute("SELECT COUNT(*) FROM Paper").fetchone()[0]
+
+
+def test_lecturer_named_as_author_can_submit(client):
+    login(client, 'LEC-FCI-01', 'lec123')
+    response = submit_paper(client, 'Dr. Azman, Harvind')
+    assert response.status_code == 302
+    assert paper_count() == 1
+
+
+def test_namesake_of_the_resolved_author_cannot_submit(client):
+    # A second "Dr. Azman" shares the name, but the paper resolves to LEC-FCI-01
+    conn = sqlite3.connect('trackingsystem.db')
+    with conn:
+        conn.execute("INSERT INTO Lecturer (LecturerID, LecturerPassword, LecturerName, CoordinatorID, AdminID, FacultyID) "
+                     "VALUES ('LEC-FCI-99', 'lec123', 'Dr. Azman', 'COO-FCI-01', 'ADM-FCI-01', 'FCI')")
+    conn.close()
+    database.rebuild_author_lookup()
+
+    login(client, 'LEC-FCI-99', 'lec123')
+    response = submit_paper(client, 'Dr. Azman, Harvind')
+    assert 'where YOU are an author' in response.data.decode()
+    assert paper_count() == 0
+
@@ -0,0 +1,53 @@
+import sqlite3
+
+import pytest
+
+import database
+
+
+def snapshot():
+    conn = sqlite3.connect('trackingsystem.db')
+    try:
+        schema = conn.execute("SELECT type, name FROM sqlite_master ORDER BY name").fetchall()
+        users = conn.execute("SELECT COUNT(*) FROM Lecturer").fetchone()[0]
+        return schema, users, conn.execute("PRAGMA journal_mode").fetchone()[0]
+    finally:
+        conn.close()
+
+
+@pytest.mark.parametrize('arguments', [
+    {'papers': 10, 'lecturers_per_faculty': 0},
+    {'papers': 10, 'faculties': 0},
+    {'status_mix': ()},
+    {'status_mix': (('Approved', 0),)},
+    {'coauthor_weights': ()},
+    {'years': (2025, 2010)},
+    {'students_per_faculty': -1},
+])
+def test_bad_arguments_leave_the_database_untouched(empty_db, arguments):
+    before = snapshot()
+    with pytest.raises(ValueError):
+        database.generate_synthetic_data(**arguments)
+    assert snapshot() == before
+
+
+def generate_papers(directory, monkeypatch):
+    directory.mkdir()
+    monkeypatch.chdir(directory)
+    database.init_db()
+    counts = database.generate_synthetic_data(faculties=2, papers=40, bookmarks_per_user=2, seed=5)
+    conn = sqlite3.connect('trackingsystem.db')
+    try:
+        return counts, conn.execute("SELECT PaperID, PaperTitle, Authors, Status FROM Paper ORDER BY PaperID").fetchall()
+    finally:
+        conn.close()
+
+
+def test_generated_data_is_reproducible_and_uses_its_own_ids(tmp_path, monkeypatch):
+    counts, first = generate_papers(tmp_path / 'one', monkeypatch)
+    assert counts['Paper'] == len(first) == 40
+    assert all(row[0].startswith('SYN-') for row in first)
+    assert database.rebuild_paper_stats() == []
+
+    _, second = generate_papers(tmp_path / 'two', monkeypatch)
+    assert second == first
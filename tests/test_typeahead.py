@@ -0,0 +1,109 @@
+import random
+import time
+
+import database
+import main
+from conftest import login
+
+
+def install(pairs):
+    pairs = sorted(pairs, key=lambda pair: pair[0])
+    main.typeahead.update(keys=[key for key, _ in pairs], entries=[entry for _, entry in pairs],
+                          built=time.monotonic(), building=False, pending=None)
+
+
+def wait_for_index():
+    deadline = time.monotonic() + 10
+    while main.typeahead['keys'] is None or main.typeahead['building']:
+        assert time.monotonic() < deadline
+        time.sleep(0.02)
+
+
+def test_batched_changes_match_applying_them_one_by_one():
+    rng = random.Random(7)
+
+    def entry():
+        return rng.choice('abcd') + rng.choice('ab'), ('title', str(rng.randint(0, 4)), f"PAP-{rng.randint(0, 3)}")
+
+    for _ in range(300):
+        start = {entry() for _ in range(rng.randint(0, 25))}
+        install(start)
+        changes = [(rng.choice(['add', 'remove']),) + entry() for _ in range(rng.randint(0, 15))]
+
+        expected = set(start)
+        for action, key, value in changes:
+            (expected.add if action == 'add' else expected.discard)((key, value))
+        with main.typeahead_lock:
+            main.apply_typeahead_changes(changes)
+
+        assert main.typeahead['keys'] == sorted(main.typeahead['keys'])
+        assert sorted(zip(main.typeahead['keys'], main.typeahead['entries'])) == sorted(expected)
+
+
+def test_published_lists_are_replaced_not_modified():
+    install([('deep nets', ('title', 'Deep nets', 'PAP-1'))])
+    keys = main.typeahead['keys']
+    with main.typeahead_lock:
+        main.apply_typeahead_changes([('add', 'deeper', ('title', 'Deeper', 'PAP-2'))])
+    assert keys == ['deep nets']
+    assert main.typeahead['keys'] == ['deep nets', 'deeper']
+
+
+def test_overflowing_the_cap_drops_the_index(monkeypatch):
+    monkeypatch.setitem(main.app.config, 'TYPEAHEAD_MAX_ENTRIES', 2)
+    install([('a', ('title', 'A', 'PAP-1')), ('b', ('title', 'B', 'PAP-2'))])
+    with main.typeahead_lock:
+        main.apply_typeahead_changes([('add', 'c', ('title', 'C', 'PAP-3'))])
+    assert main.typeahead['keys'] is None
+
+
+def test_suggestions_put_a_few_authors_first():
+    install(main.typeahead_name_entries('Dr. Siti Aminah')
+            + main.typeahead_name_entries('Sitiawan Lee')
+            + [(main.typeahead_key(f"Siting study {n}"), ('title', f"Siting study {n}", f"PAP-{n}")) for n in range(10)])
+    suggestions = main.typeahead_suggestions('SIT')
+    assert [s['type'] for s in suggestions] == ['author', 'author'] + ['title'] * 6
+    assert {s['label'] for s in suggestions[:2]} == {'Dr. Siti Aminah', 'Sitiawan Lee'}
+    assert main.typeahead_suggestions('zz') == []
+
+
+def test_failed_build_can_be_retried(empty_db, monkeypatch):
+    build = main.build_typeahead
+    monkeypatch.setattr(main, 'build_typeahead', lambda conn, limit: 1 / 0)
+    main.ensure_typeahead()
+    deadline = time.monotonic() + 10
+    while main.typeahead['building']:
+        assert time.monotonic() < deadline
+        time.sleep(0.02)
+    assert main.typeahead['pending'] is None and main.typeahead['keys'] is None
+
+    monkeypatch.setattr(main, 'build_typeahead', build)
+    main.ensure_typeahead()
+    wait_for_index()
+
+
+def test_endpoint_follows_approvals_and_removals(client):
+    database.generate_synthetic_data(faculties=1, papers=30, status_mix=(('Approved', 1),))
+    conn = main.open_db_connection()
+    paper = conn.execute("SELECT PaperID, PaperTitle FROM Paper ORDER BY PaperID LIMIT 1").fetchone()
+    conn.execute('''
+        INSERT INTO PaperAuthor (PaperID, Position, UserID, AuthorName, NormalizedName)
+        VALUES (?, 99, NULL, 'Zyxwv Guest', 'zyxwv guest')
+    ''', (paper['PaperID'],))
+    conn.commit()
+    conn.close()
+
+    assert client.get('/api/typeahead?q=zyx').status_code == 401
+    login(client, 'ADM-FCI-01', 'admin123')
+    wait_for_index()
+
+    def labels(query):
+        return [s['label'] for s in client.get('/api/typeahead', query_string={'q': query}).get_json()['suggestions']]
+
+    assert labels('z') == []
+    assert labels('zyxwv') == ['Zyxwv Guest']
+    assert paper['PaperTitle'] in labels(paper['PaperTitle'])
+
+    client.post('/admin/remove_paper', data={'paper_id': paper['PaperID']}, headers={'Referer': '/admin/home'})
+    assert paper['PaperTitle'] not in labels(paper['PaperTitle'])
+    assert labels('guest') == []
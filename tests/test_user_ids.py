@@ -0,0 +1,67 @@
+import threading
+
+import database
+import main
+
+
+def reserve(role, faculty_id, count=1):
+    conn = main.open_db_connection()
+    try:
+        ids = main.reserve_user_ids(conn, role, faculty_id, count)
+        conn.commit()
+        return ids
+    finally:
+        conn.close()
+
+
+def test_blocks_are_consecutive_per_role_and_faculty(empty_db):
+    assert reserve('Student', 'FCI', 3) == ['STU-FCI-01', 'STU-FCI-02', 'STU-FCI-03']
+    assert reserve('Student', 'FCI', 2) == ['STU-FCI-04', 'STU-FCI-05']
+    assert reserve('Lecturer', 'FCI') == ['LEC-FCI-01']
+    assert reserve('Student', 'FCM') == ['STU-FCM-01']
+
+
+def test_rollback_hands_the_block_back(empty_db):
+    conn = main.open_db_connection()
+    try:
+        assert main.reserve_user_ids(conn, 'Lecturer', 'FCI', 4) == [f'LEC-FCI-0{n}' for n in range(1, 5)]
+        conn.rollback()
+    finally:
+        conn.close()
+    assert reserve('Lecturer', 'FCI') == ['LEC-FCI-01']
+
+
+def test_ids_widen_past_two_digits(empty_db):
+    ids = reserve('ProgrammeCoordinator', 'FCI', 100)
+    assert ids[98:] == ['COO-FCI-99', 'COO-FCI-100']
+    assert len(set(ids)) == 100
+
+
+def test_seeded_sequences_continue_after_existing_users(db):
+    database.seed_user_sequences()
+    conn = main.open_db_connection()
+    try:
+        highest = max(int(row[0].rsplit('-', 1)[1])
+                      for row in conn.execute("SELECT StudentID FROM Student WHERE StudentID LIKE 'STU-FCI-%'"))
+    finally:
+        conn.close()
+    assert reserve('Student', 'FCI') == [main.format_user_id('Student', 'FCI', highest + 1)]
+
+
+def test_concurrent_reservations_never_share_an_id(empty_db):
+    issued = []
+    lock = threading.Lock()
+
+    def worker():
+        for _ in range(5):
+            ids = reserve('Student', 'FCI', 3)
+            with lock:
+                issued.extend(ids)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(issued) == sorted(main.format_user_id('Student', 'FCI', n) for n in range(1, 121))